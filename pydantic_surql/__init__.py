@@ -1,21 +1,47 @@
+from typing import Any, Callable, Optional
 from pydantic import BaseModel
 from .parser import SurQLParser
-from .types import SurQLMetadata, SurQLTableConfig
+from .query.functions import SurQLFunctionCall
+from .types import SurQLMetadata, SurQLRelation, SurQLTableConfig
 
 Parser = SurQLParser()
 Metadata = SurQLMetadata()
 
-def surql_collection(name: str, config: SurQLTableConfig = SurQLTableConfig()):
+def surql_collection(name: str, config: SurQLTableConfig = SurQLTableConfig(), metadata: Optional[SurQLMetadata] = None):
     """
         A simple decorator to convert a pydantic model to a surQL SDL table definition
+        the definition is registered in the Metadata registry, or in a scoped registry if metadata is set
     """
     def inner(model: BaseModel):
-        table = Parser.from_model(name, model, config)
-        Metadata.tables += [table]
-        for index in table.config.indexes:
-            if hasattr(index, "analyzer") and index.analyzer is not None:
-                exist = any([a.name == index.analyzer.name for a in Metadata.analyzers])
-                if not exist:
-                    Metadata.analyzers += [index.analyzer]
+        (Metadata if metadata is None else metadata).register(Parser.from_model(name, model, config))
         return model
-    return inner
\ No newline at end of file
+    return inner
+
+def surql_relation(
+    name: str,
+    in_: type[BaseModel] | str | list[type[BaseModel] | str],
+    out: type[BaseModel] | str | list[type[BaseModel] | str],
+    config: SurQLTableConfig = SurQLTableConfig(),
+    enforced: bool = False,
+    metadata: Optional[SurQLMetadata] = None
+):
+    """
+        A simple decorator to convert a pydantic model to a surQL SDL relation (graph edge) table definition
+        in_ and out are @surql_collection models (or tables names), the model in / out fields are skipped
+    """
+    def tables(targets) -> list[str]:
+        targets = targets if isinstance(targets, list) else [targets]
+        return [e if isinstance(e, str) else e.__surql_table_name__ for e in targets]
+    relation = SurQLRelation(inTables=tables(in_), outTables=tables(out), enforced=enforced)
+    return surql_collection(name, config.model_copy(update={"relation": relation}), metadata)
+
+def surql_function(body: str, name: Optional[str] = None, metadata: Optional[SurQLMetadata] = None):
+    """
+        A simple decorator to declare a surQL function (DEFINE FUNCTION fn::name) from a python function signature
+        the arguments types are parsed from their annotations, the decorated function becomes a typed call helper
+    """
+    def inner(func: Callable[..., Any]) -> SurQLFunctionCall:
+        function = Parser.from_function(name or func.__name__, func, body)
+        (Metadata if metadata is None else metadata).register_function(function)
+        return SurQLFunctionCall(function, func)
+    return inner
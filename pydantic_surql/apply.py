@@ -0,0 +1,99 @@
+import asyncio
+import hashlib
+import re
+from typing import Callable, Optional, Protocol
+from pydantic import BaseModel
+
+from .transport import SurQLAsyncTransport
+from .types import SurQLMetadata
+from .types.table import SCOPE_IDENTIFIER, use_statement
+
+class SurQLApplyStore(Protocol):
+    """
+        A pluggable store of the schemas applied to each database (eg: a file, a redis hash, a database table)
+        get returns the digest of the last schema applied to a `namespace/database` key, None if none was applied
+    """
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, digest: str) -> None:
+        ...
+
+class SurQLMemoryApplyStore:
+    """
+        An in memory applied schemas store
+    """
+    def __init__(self):
+        self.digests: dict[str, str] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self.digests.get(key)
+
+    def set(self, key: str, digest: str) -> None:
+        self.digests[key] = digest
+
+class SurQLApplyReport(BaseModel):
+    """
+        The outcome of a schema fan-out, by `namespace/database` key
+    """
+    applied: list[str] = []
+    skipped: list[str] = []
+    failed: dict[str, str] = {}
+
+class SurQLApplier:
+    """
+        A schema fan-out applier, the metadata SDL is rendered once and applied to many databases (eg: one per tenant)
+        at most concurrency databases are migrated at once, each one with a single `USE NS x DB y; <SDL>` query,
+        the transport must run each query in its own session (eg: the HTTP /sql endpoint, a connection per query)
+        the databases already migrated to the same schema (by the store) are skipped, so an interrupted fan-out resumes where it stopped
+        progress is called after each database with the done and total counts, the key and the error (None on success)
+    """
+    def __init__(
+        self,
+        metadata: SurQLMetadata,
+        transport: SurQLAsyncTransport,
+        concurrency: int = 16,
+        store: Optional[SurQLApplyStore] = None,
+        progress: Optional[Callable[[int, int, str, Optional[Exception]], None]] = None
+    ):
+        if (concurrency < 1):
+            raise Exception("concurrency must be at least 1")
+        self.sdl = metadata.scoped().collect()
+        self.digest = hashlib.sha1(self.sdl.encode()).hexdigest()
+        self.transport = transport
+        self.concurrency = concurrency
+        self.store = store or SurQLMemoryApplyStore()
+        self.progress = progress
+
+    async def apply(self, targets: list[tuple[str, str]]) -> SurQLApplyReport:
+        """
+            apply the schema to (namespace, database) targets, a failed database doesn't stop the others
+        """
+        report = SurQLApplyReport()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+
+        async def apply_one(namespace: str, database: str):
+            nonlocal done
+            key = f"{namespace}/{database}"
+            error = None
+            try:
+                # the identifiers are inlined in the USE statement
+                if (re.match(SCOPE_IDENTIFIER, namespace) is None or re.match(SCOPE_IDENTIFIER, database) is None):
+                    raise Exception(f"invalid namespace or database identifier: {key}")
+                if (self.store.get(key) == self.digest):
+                    report.skipped.append(key)
+                else:
+                    async with semaphore:
+                        await self.transport.query(f"{use_statement(namespace, database)}\n\n{self.sdl}")
+                    self.store.set(key, self.digest)
+                    report.applied.append(key)
+            except Exception as e:
+                error = e
+                report.failed[key] = repr(e)
+            done += 1
+            if (self.progress is not None):
+                self.progress(done, len(targets), key, error)
+
+        await asyncio.gather(*[apply_one(namespace, database) for namespace, database in targets])
+        return report
@@ -1,15 +1,18 @@
+import threading
 from typing import TypedDict, Type
 from .types import RecursiveType, SurQLField
 
 class Cache():
     """
         A simple cache system maping a Type to a list[RecursiveType]
+        the writes are serialized by a lock, the reads are lock free
     """
     def __init__(self):
         """
             Initialize the cache
         """
         self.cache: TypedDict[Type, RecursiveType | SurQLField] = {}
+        self.lock = threading.Lock()
 
     def get(self, key: Type):
         """
@@ -21,17 +24,35 @@ class Cache():
         """
             Set a key in the cache
         """
-        self.cache[key] = value
+        with self.lock:
+            self.cache[key] = value
         return value
 
+    def setdefault(self, key: Type, value: TypedDict):
+        """
+            Set a key in the cache if missing, return the cached value
+            concurrent first uses of a key all get the value of the first writer
+        """
+        with self.lock:
+            return self.cache.setdefault(key, value)
+
     def has(self, key: Type):
         """
             Check if the cache has a key
         """
         return key in self.cache
 
+    def drop(self, keys: list[Type]):
+        """
+            Remove keys from the cache
+        """
+        with self.lock:
+            for key in keys:
+                self.cache.pop(key, None)
+
     def clear(self):
         """
             Clear the cache
         """
-        self.cache = {}
\ No newline at end of file
+        with self.lock:
+            self.cache = {}
\ No newline at end of file
@@ -0,0 +1,148 @@
+import argparse
+import importlib
+import os
+import sys
+import time
+from typing import Callable, Optional
+
+from . import Metadata, Parser
+from .discover import discover
+from .watch import SurQLWatcher
+
+"""
+    exit status when the generated SDL differs from the output files content
+"""
+EXIT_CHANGED = 3
+
+"""
+    file of the non table definitions (analyzers, enums, functions) in directory mode
+"""
+DEFINITIONS_FILE = "_definitions.surql"
+
+def module_name(path: str) -> str:
+    """
+        return the module name of a dotted module name or of a python file path (relative to the working directory)
+    """
+    if (not path.endswith(".py")):
+        return path
+    path = os.path.relpath(path)[:-len(".py")]
+    if (path.startswith("..")):
+        raise Exception(f"module file {path}.py is outside of the working directory")
+    name = path.replace(os.sep, ".")
+    return name[:-len(".__init__")] if name.endswith(".__init__") else name
+
+def import_modules(modules: list[str]) -> list[tuple[str, float, float, int]]:
+    """
+        import the models modules, return the (module, import seconds, parse seconds, registered tables) of each module
+        the import time excludes the time spent parsing the models
+    """
+    if (os.getcwd() not in sys.path):
+        sys.path.insert(0, os.getcwd())
+    res = []
+    for path in modules:
+        name = module_name(path)
+        tables, parsed, start = len(Metadata.tables), Parser.parseTime, time.perf_counter()
+        importlib.import_module(name)
+        elapsed, parse = time.perf_counter() - start, Parser.parseTime - parsed
+        res.append((name, elapsed - parse, parse, len(Metadata.tables) - tables))
+    return res
+
+def render(statements: dict[str, str], split: bool) -> dict[str, str]:
+    """
+        return the output files content by file name (a single file, or one file per table and a definitions file)
+    """
+    if (not split):
+        return {"": "\n\n".join(statements.values()) + "\n"}
+    res: dict[str, list[str]] = {}
+    for key, sdl in statements.items():
+        kind, _, name = key.partition(":")
+        res.setdefault(f"{name}.surql" if kind == "table" else DEFINITIONS_FILE, []).append(sdl)
+    return {name: "\n\n".join(sdls) + "\n" for name, sdls in res.items()}
+
+def write(path: str, content: str) -> bool:
+    """
+        write a file if its content changed, return True if it was written
+    """
+    if (os.path.isfile(path)):
+        with open(path, encoding="utf-8") as f:
+            if (f.read() == content):
+                return False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
+
+def parser() -> argparse.ArgumentParser:
+    """
+        return the command line arguments parser
+    """
+    res = argparse.ArgumentParser(
+        prog="pydantic-surql",
+        description="generate the SurQL SDL of the pydantic models of python modules",
+        epilog=f"exit status: 0 unchanged, {EXIT_CHANGED} when the output files changed",
+    )
+    res.add_argument("modules", nargs="*", help="modules to import (dotted names or .py files)")
+    res.add_argument("--discover", action="append", default=[], metavar="PATH", help="scan a source tree for the models modules, without importing the other modules")
+    res.add_argument("-j", "--jobs", type=int, default=None, help="discovery workers processes (default: cpu count)")
+    output = res.add_mutually_exclusive_group()
+    output.add_argument("-o", "--output", help="SDL output file (default: stdout)")
+    output.add_argument("-d", "--dir", help="SDL output directory, one file per table")
+    res.add_argument("-w", "--watch", action="store_true", help="watch the modules files and re-emit the changed statements")
+    res.add_argument("-q", "--quiet", action="store_true", help="don't print the timings")
+    return res
+
+def output(args: argparse.Namespace, log: Callable[..., None]) -> bool:
+    """
+        render the metadata SDL to the output, return True if an output file changed
+        in directory mode, the `.surql` files of the removed definitions are deleted (and count as changes)
+    """
+    start = time.perf_counter()
+    files = render(Metadata.statements(), args.dir is not None)
+    log(f"render {(time.perf_counter() - start) * 1000:.1f}ms ({len(Metadata.tables)} tables)")
+    if (args.output is None and args.dir is None):
+        if (not args.watch):
+            sys.stdout.write(files[""])
+        return False
+    if (args.dir is not None):
+        os.makedirs(args.dir, exist_ok=True)
+        written = [name for name, content in files.items() if write(os.path.join(args.dir, name), content)]
+        removed = [name for name in sorted(os.listdir(args.dir)) if name.endswith(".surql") and name not in files]
+        for name in removed:
+            os.remove(os.path.join(args.dir, name))
+    else:
+        written = [args.output] if write(args.output, files[""]) else []
+        removed = []
+    for name in written:
+        log(f"wrote {name}")
+    for name in removed:
+        log(f"removed {name}")
+    return len(written) + len(removed) > 0
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+        pydantic-surql command line entry point
+    """
+    cli = parser()
+    args = cli.parse_args(argv)
+    log = (lambda *e: None) if args.quiet else (lambda *e: print(*e, file=sys.stderr))
+    if (len(args.discover) > 0):
+        start = time.perf_counter()
+        modules = discover(args.discover, args.jobs)
+        log(f"discover {(time.perf_counter() - start) * 1000:.1f}ms ({len(modules)} modules)")
+        for module in modules:
+            if (module.root not in sys.path):
+                sys.path.insert(0, module.root)
+        args.modules += [module.module for module in modules]
+    if (len(args.modules) == 0):
+        cli.error("no modules to import, pass modules or --discover source trees")
+    for name, imported, parsed, tables in import_modules(args.modules):
+        log(f"{name}: import {imported * 1000:.1f}ms, parse {parsed * 1000:.1f}ms ({tables} tables)")
+    changed = output(args, log)
+    if (args.watch):
+        watcher = SurQLWatcher([module_name(path) for path in args.modules])
+        if (args.output is None and args.dir is None):
+            print("\n\n".join(watcher.statements.values()), flush=True)
+        def emit(statements: list[str]):
+            print("\n\n".join(statements), flush=True)
+            output(args, log)
+        watcher.run(emit, lambda e: log(f"reload failed: {e!r}"))
+    return EXIT_CHANGED if changed else 0
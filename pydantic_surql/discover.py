@@ -0,0 +1,126 @@
+import ast
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from pydantic import BaseModel
+
+"""
+    decorators registering definitions in the metadata
+"""
+DECORATORS = {"surql_collection", "surql_relation", "surql_function"}
+
+"""
+    positional index of the SurQLTableConfig argument, by decorator
+"""
+CONFIG_ARGS = {"surql_collection": 1, "surql_relation": 3}
+
+"""
+    directories never scanned
+"""
+SKIPPED_DIRS = {"__pycache__", "node_modules", "site-packages", "venv"}
+
+class SurQLDiscoveredDefinition(BaseModel):
+    """
+        A decorated class or function found in a source file
+        table is the table (or function) name if it is a literal, config the source of the SurQLTableConfig argument
+    """
+    name: str
+    decorator: str
+    line: int
+    table: Optional[str] = None
+    config: Optional[str] = None
+
+class SurQLDiscoveredModule(BaseModel):
+    """
+        A source file declaring definitions, root is the sys.path entry of its module
+    """
+    module: str
+    path: str
+    root: str
+    definitions: list[SurQLDiscoveredDefinition]
+
+def module_path(path: str) -> tuple[str, str]:
+    """
+        return the module name of a source file and its sys.path root (the directory of its top level package)
+    """
+    root, name = os.path.split(os.path.abspath(path))
+    parts = [] if name == "__init__.py" else [name[:-len(".py")]]
+    while (os.path.isfile(os.path.join(root, "__init__.py"))):
+        root, package = os.path.split(root)
+        parts.insert(0, package)
+    return ".".join(parts), root
+
+def decorator_name(node: ast.expr) -> Optional[str]:
+    """
+        return the name of a call decorator (`@surql_collection(...)` or `@pydantic_surql.surql_collection(...)`)
+    """
+    func = node.func if isinstance(node, ast.Call) else node
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+def scan(path: str) -> Optional[SurQLDiscoveredModule]:
+    """
+        return the definitions declared by a source file, None if it has none (or is not valid python)
+        the file is only parsed if it mentions a decorator
+    """
+    with open(path, "rb") as f:
+        source = f.read()
+    if (not any(e.encode() in source for e in DECORATORS)):
+        return None
+    try:
+        tree = ast.parse(source, filename=path)
+        text = source.decode("utf-8")
+    except (SyntaxError, ValueError, UnicodeDecodeError):
+        return None
+    definitions = []
+    for node in ast.walk(tree):
+        if (not isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))):
+            continue
+        for decorator in node.decorator_list:
+            name = decorator_name(decorator)
+            if (name not in DECORATORS or not isinstance(decorator, ast.Call)):
+                continue
+            args = decorator.args
+            keywords = {e.arg: e.value for e in decorator.keywords}
+            table = keywords.get("name", args[0] if len(args) > 0 and name != "surql_function" else None)
+            index = CONFIG_ARGS.get(name, len(args))
+            config = keywords.get("config", args[index] if index < len(args) else None)
+            definitions.append(SurQLDiscoveredDefinition(
+                name=node.name,
+                decorator=name,
+                line=node.lineno,
+                table=table.value if isinstance(table, ast.Constant) and isinstance(table.value, str) else None,
+                config=ast.get_source_segment(text, config) if config is not None else None,
+            ))
+    if (len(definitions) == 0):
+        return None
+    module, root = module_path(path)
+    return SurQLDiscoveredModule(module=module, path=path, root=root, definitions=sorted(definitions, key=lambda e: e.line))
+
+def source_files(paths: list[str]) -> list[str]:
+    """
+        return the python files of source trees (hidden and SKIPPED_DIRS directories are skipped)
+    """
+    res = []
+    for path in paths:
+        if (os.path.isfile(path)):
+            res.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted([e for e in dirs if not e.startswith(".") and e not in SKIPPED_DIRS])
+            res += [os.path.join(root, e) for e in sorted(files) if e.endswith(".py")]
+    return res
+
+def discover(paths: list[str], workers: Optional[int] = None) -> list[SurQLDiscoveredModule]:
+    """
+        scan source trees for the modules declaring @surql_collection / @surql_relation / @surql_function definitions
+        without importing them, the files are scanned by a pool of workers processes (in process if workers is 1)
+    """
+    files = source_files(paths)
+    if (workers == 1 or len(files) < 2):
+        return [e for e in map(scan, files) if e is not None]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [e for e in executor.map(scan, files, chunksize=32) if e is not None]
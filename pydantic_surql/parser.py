@@ -1,13 +1,21 @@
 from enum import Enum
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Any, Optional, Type, Union, get_origin, get_args
+import inspect
+import json
+import re
+import sys
+import threading
+import time
+from annotated_types import Ge, Gt, Le, Lt, MaxLen, MinLen, MultipleOf
+from typing import Any, Callable, Literal, Optional, Type, Union, get_origin, get_args
 from types import UnionType, NoneType, GenericAlias
 
-from pydantic_surql.types.field import SurQLFieldInfo
+from pydantic_core import PydanticUndefined
+from pydantic_surql.types.field import SurQLEnumEncoding, SurQLFieldInfo, SurQLRecursionPolicy, enum_values, to_surql_literal
 
 from .cache import Cache
-from .types import RecursiveType, SurQLAnyRecord, SurQLField, SurQLType, SurQLNullable, SurQLTable, SurQLTableConfig
+from .types import RecursiveType, SurQLAnyRecord, SurQLField, SurQLFunction, SurQLType, SurQLNullable, SurQLTable, SurQLTableConfig, vector_dimension
 
 def is_union(annotation: Type) -> bool:
     """
@@ -16,12 +24,86 @@ def is_union(annotation: Type) -> bool:
     origin = get_origin(annotation)
     return (origin == Union or origin == UnionType)
 
+def enum_assertion(values: list[Any]) -> str:
+    """
+        return the SurQL assertion of an enumeration of values
+    """
+    return f"$value in [{enum_values(values)}]"
+
+def enum_name(_type: Type[Enum]) -> str:
+    """
+        return the shared definition name of an enum (eg: CountryCode -> enum_country_code)
+        the name can be set by a `__surql_enum_name__` class attribute
+    """
+    name = getattr(_type, "__surql_enum_name__", None)
+    if (name is not None):
+        return name
+    return "enum_" + re.sub(r"(?<!^)(?=[A-Z])", "_", _type.__name__).lower()
+
 class SurQLParser:
     """
         A pydantic SurQL parser
     """
-    def __init__(self):
+    def __init__(
+        self,
+        enumThreshold: Optional[int] = None,
+        enumEncoding: SurQLEnumEncoding = SurQLEnumEncoding.PARAM,
+        recursionPolicy: SurQLRecursionPolicy = SurQLRecursionPolicy.RAISE,
+        recursionDepth: int = 1
+    ):
+        """
+            enums with more than enumThreshold values use enumEncoding instead of an inline assertion
+            recursive models are handled by recursionPolicy (a FLEXIBLE model is expanded recursionDepth times)
+        """
         self.cache = Cache()
+        self.enumThreshold = enumThreshold
+        self.enumEncoding = enumEncoding
+        self.recursionPolicy = recursionPolicy
+        self.recursionDepth = recursionDepth
+        # models being parsed and lowest stack index of the recursive references cut off, per thread
+        self.local = threading.local()
+        # cumulated from_model seconds, read by the command line timings
+        self.parseTime = 0.0
+
+    def parsing(self) -> list[Type]:
+        """
+            return the stack of the models being parsed by the current thread
+        """
+        if (not hasattr(self.local, "stack")):
+            self.local.stack = []
+            self.local.cut = sys.maxsize
+        return self.local.stack
+
+    def memoize(self, key: Type, compute: Callable[[], Any]) -> Any:
+        """
+            parse and cache a type, unless its definition depends on where it is used
+            (it holds a recursive reference to a model being parsed outside of it)
+        """
+        depth = len(self.parsing())
+        outer = self.local.cut
+        self.local.cut = sys.maxsize
+        try:
+            res = compute()
+            inner = self.local.cut
+        finally:
+            self.local.cut = min(outer, self.local.cut)
+        if (inner < depth):
+            return res
+        return self.cache.setdefault(key, res)
+
+    def from_cycle(self, _type: Type[BaseModel], stack: list[Type]) -> SurQLField:
+        """
+            return the definition of a recursive model reference according to the recursion policy
+        """
+        self.local.cut = min(self.local.cut, stack.index(_type))
+        if (self.recursionPolicy is SurQLRecursionPolicy.RECORD):
+            if hasattr(_type, '__surql_table_name__'):
+                return SurQLField.model_construct(name=None, types=[SurQLType.RECORD], recordLink=_type.__surql_table_name__)
+            return SurQLType.ANY_RECORD
+        if (self.recursionPolicy is SurQLRecursionPolicy.FLEXIBLE):
+            return SurQLField.model_construct(name=None, types=[], isFlexible=True)
+        cycle = " -> ".join([e.__name__ for e in stack[stack.index(_type):]] + [_type.__name__])
+        raise Exception(f"recursive model {cycle}, use a @surql_collection record link or a SurQLRecursionPolicy")
 
     @staticmethod
     def to_simple_type(_type: Type) -> SurQLType | None:
@@ -46,73 +128,90 @@ class SurQLParser:
             return SurQLType.ANY_RECORD
         return None
 
+    def from_items(self, _type: GenericAlias) -> RecursiveType:
+        """
+            Parse the items types of a list / set
+        """
+        res = []
+        for arg in get_args(_type):
+            simpleType = self.to_simple_type(arg)
+            if (simpleType is not None):
+                res.append(simpleType)
+            elif (is_union(arg)):
+                res += self.from_union(arg)
+            else:
+                res.append(self.from_type(arg))
+        return res
+
     def from_type(self, _type: Type) -> RecursiveType | SurQLField:
         """
             Parse a type:
-            TODO: check for objects recursive types (will raise: must be converted to record)
+            nested models are memoized unless they are part of a cycle
         """
+        if (isinstance(_type, type) and issubclass(_type, BaseModel) and hasattr(_type, '__is_surql_collection__')):
+            # was decorated with @surql_collection (checked first, a memoized object model can become a collection)
+            return SurQLField.model_construct(name=None, types=[SurQLType.RECORD], recordLink=_type.__surql_table_name__)
+
         if (self.cache.has(_type)):
             return self.cache.get(_type)
 
         # is a simple type
         simpleType = self.to_simple_type(_type)
         if (simpleType is not None):
-            return self.cache.set(_type, simpleType)
+            return self.cache.setdefault(_type, simpleType)
 
         # is a list
         if (isinstance(_type, GenericAlias) and _type.__origin__ == list):
-            args = get_args(_type)
-            res = []
-            for arg in args:
-                simpleType = self.to_simple_type(arg)
-                if (simpleType is not None):
-                    res.append(simpleType)
-                elif (is_union(arg)):
-                    res += self.from_union(arg)
-                else:
-                    res.append(self.from_type(arg))
-            return self.cache.set(_type, res)
+            return self.memoize(_type, lambda: self.from_items(_type))
 
         # is a set
         if (isinstance(_type, GenericAlias) and _type.__origin__ == set):
-            args = get_args(_type)
-            res = []
-            for arg in args:
-                simpleType = self.to_simple_type(arg)
-                if (simpleType is not None):
-                    res.append(simpleType)
-                elif (is_union(arg)):
-                    res += self.from_union(arg)
-                else:
-                    res.append(self.from_type(arg))
-            return self.cache.set(_type, [SurQLType.SET, res])
-
-        # is an enum
+            return self.memoize(_type, lambda: [SurQLType.SET, self.from_items(_type)])
+
+        # is a literal
+        if (get_origin(_type) is Literal):
+            return self.cache.setdefault(_type, SurQLField.model_construct(name=None, types=[SurQLType.ENUM], assertion=enum_assertion(get_args(_type))))
+
+        # is an enum, the assertion is built once per Enum class
         if issubclass(_type, Enum):
-            assertions = ",".join([f'"{item.value}"' if isinstance(item.value, str) else str(item.value) for item in _type])
-            return SurQLField(name=None, types=[SurQLType.ENUM], assertion=f"$value in [{assertions}]")
+            values = [item.value for item in _type]
+            large = self.enumThreshold is not None and len(values) > self.enumThreshold
+            return self.cache.setdefault(_type, SurQLField.model_construct(
+                name=None,
+                types=[SurQLType.ENUM],
+                assertion=enum_assertion(values),
+                enumName=enum_name(_type),
+                enumValues=values,
+                enumEncoding=self.enumEncoding if large else SurQLEnumEncoding.INLINE
+            ))
         # is a pydantic model
         if (issubclass(_type, BaseModel)):
-            if hasattr(_type, '__is_surql_collection__'):
-                # was decorated with @surql_collection
-                return SurQLField(name=None, types=[SurQLType.RECORD], recordLink=_type.__surql_table_name__)
-            extra = _type.model_config.get('extra')
-            if extra == 'allow':
-                return SurQLField(name=None, types=self.from_fields(_type), recordLink=None, isFlexible=True)
-            return SurQLField(name=None, types=self.from_fields(_type), recordLink=None)
+            stack = self.parsing()
+            limit = self.recursionDepth if self.recursionPolicy is SurQLRecursionPolicy.FLEXIBLE else 1
+            if (stack.count(_type) >= limit):
+                return self.from_cycle(_type, stack)
+            return self.memoize(_type, lambda: self.from_object(_type))
         raise Exception(f"Type {_type} is not supported")
 
+    def from_object(self, _type: Type[BaseModel]) -> SurQLField:
+        """
+            Parse a nested pydantic model to an object SurQLField
+        """
+        stack = self.parsing()
+        stack.append(_type)
+        try:
+            extra = _type.model_config.get('extra')
+            return SurQLField.model_construct(name=None, types=self.from_fields(_type), recordLink=None, isFlexible=extra == 'allow')
+        finally:
+            stack.pop()
+
     def from_union(self, type: UnionType) -> RecursiveType:
         """
             Parse a Union type
         """
-        types = []
         if (self.cache.has(type)):
-            types = self.cache.get(type)
-        else:
-            for e in get_args(type):
-                types.append(self.from_type(e))
-        return self.cache.set(type, types)
+            return self.cache.get(type)
+        return self.memoize(type, lambda: [self.from_type(e) for e in get_args(type)])
 
     def from_field_type(self, annotation: Type) -> RecursiveType:
         """
@@ -129,7 +228,77 @@ class SurQLParser:
             Parse a pydantic model field to a SurQLField
         """
         types = self.from_field_type(annotation)
-        return SurQLField(name=name, types=types)
+        return SurQLField.model_construct(name=name, types=types)
+
+    @staticmethod
+    def from_constraints(annotation: Type, metadata: list[Any], name: Optional[str] = None) -> tuple[list[str], Optional[int]]:
+        """
+            Translate pydantic fields constraints to SurQL assertions
+            the max length of an array / set is returned apart to be used as a bounded type (eg: array<string, 10>)
+            raise an exception if a bound can't be expressed as a SurQL literal
+        """
+        def literal(value: Any) -> str:
+            res = to_surql_literal(value)
+            if (res is None):
+                raise Exception(f"constraint bound {value!r} of field {name} can't be expressed as a SurQL literal")
+            return res
+
+        args = [e for e in get_args(annotation) if e is not NoneType] if is_union(annotation) else [annotation]
+        isArray = len(args) == 1 and (get_origin(args[0]) or args[0]) in (list, set)
+        length = "array::len($value)" if isArray else "string::len($value)"
+        constraints = []
+        maxItems = None
+        for e in metadata:
+            if isinstance(e, Ge):
+                constraints.append(f"$value >= {literal(e.ge)}")
+            elif isinstance(e, Gt):
+                constraints.append(f"$value > {literal(e.gt)}")
+            elif isinstance(e, Le):
+                constraints.append(f"$value <= {literal(e.le)}")
+            elif isinstance(e, Lt):
+                constraints.append(f"$value < {literal(e.lt)}")
+            elif isinstance(e, MultipleOf):
+                constraints.append(f"$value % {literal(e.multiple_of)} = 0")
+            elif isinstance(e, MinLen):
+                constraints.append(f"{length} >= {e.min_length}")
+            elif (isinstance(e, MaxLen) and isArray):
+                maxItems = e.max_length
+            elif isinstance(e, MaxLen):
+                constraints.append(f"{length} <= {e.max_length}")
+            elif (getattr(e, "pattern", None) is not None):
+                constraints.append(f"string::matches($value, {json.dumps(e.pattern)})")
+        return constraints, maxItems
+
+    def from_vector(self, name: Optional[str], annotation: Type, metadata: list[Any]) -> SurQLField | None:
+        """
+            Parse a fixed length list[float] pydantic model field to a vector SurQLField
+            return None if the field is not a vector
+        """
+        args = [e for e in get_args(annotation) if e is not NoneType] if is_union(annotation) else [annotation]
+        if (len(args) != 1):
+            return None
+        dimension = vector_dimension(args[0], metadata)
+        if (dimension is None):
+            return None
+        types = [SurQLField.model_construct(name=None, types=[SurQLType.VECTOR], dimension=dimension)]
+        if (args[0] is not annotation):
+            types.append(SurQLType.OPTIONAL)
+        return SurQLField.model_construct(name=name, types=types)
+
+    @classmethod
+    def with_enum_encoding(cls, types: RecursiveType, encoding: SurQLEnumEncoding) -> RecursiveType:
+        """
+            return a copy of types with their enums encoded with encoding (the cached enum types are not mutated)
+        """
+        res = []
+        for _type in types:
+            if isinstance(_type, list):
+                res.append(cls.with_enum_encoding(_type, encoding))
+            elif isinstance(_type, SurQLField) and _type.types == [SurQLType.ENUM] and _type.enumName is not None:
+                res.append(_type.model_copy(update={"enumEncoding": encoding}))
+            else:
+                res.append(_type)
+        return res
 
     def from_fields(self, model: BaseModel) -> list[SurQLField]:
         """
@@ -138,26 +307,71 @@ class SurQLParser:
         fields = []
         for field_name, field in model.model_fields.items():
             perms = None
+            default = to_surql_literal(field.default) if field.default is not PydanticUndefined else None
+            value = None
+            readonly = False
+            encoding = None
             if isinstance(field, SurQLFieldInfo):
                 perms = field.perms
+                default = field.defaultSDL or default
+                value = field.valueSDL
+                readonly = field.readonly
+                encoding = field.enumEncoding
             is_collection = getattr(model, '__is_surql_collection__', False)
+            is_relation = getattr(model, '__is_surql_relation__', False)
+            if (is_relation and (field.alias or field_name) in ('in', 'out')):
+                # relation tables in / out fields are defined by the table TYPE RELATION clause
+                continue
             if (field_name != 'id' or is_collection == False):
-                _field = None
-                _field = self.from_field(field_name, field.annotation)
+                _field = self.from_vector(field_name, field.annotation, field.metadata)
+                if (_field is None):
+                    # vectors length constraints are part of their type
+                    _field = self.from_field(field_name, field.annotation)
+                    constraints, maxItems = self.from_constraints(field.annotation, field.metadata, field_name)
+                    _field.constraints = constraints if len(constraints) > 0 else None
+                    _field.maxItems = maxItems
+                if (encoding is not None):
+                    _field.types = self.with_enum_encoding(_field.types, encoding)
                 _field.perms = perms
+                _field.default = default
+                _field.value = value
+                _field.readonly = readonly
+                fields.append(_field)
+        for field_name, field in model.model_computed_fields.items():
+            value = getattr(field.wrapped_property.fget, '__surql_value__', None)
+            if (value is not None):
+                # only the database computed fields are defined
+                _field = self.from_field(field_name, field.return_type)
+                _field.value = value
                 fields.append(_field)
         return fields
 
+    def from_function(self, name: str, func: Callable[..., Any], body: str) -> SurQLFunction:
+        """
+            Convert a python function signature to a SurQLFunction, the arguments types are parsed from their annotations
+        """
+        args = {}
+        for arg_name, param in inspect.signature(func).parameters.items():
+            if (param.annotation is inspect.Parameter.empty):
+                raise Exception(f"argument {arg_name} of fn::{name} must be annotated")
+            args[arg_name] = SurQLField.type_string(self.from_field_type(param.annotation))
+        return SurQLFunction(name=name, args=args, body=body)
+
     def from_model(self, name: str, model: BaseModel, config: SurQLTableConfig = SurQLTableConfig()) -> SurQLTable:
         """
             Convert a pydantic model to a SurQLTable
             can be used at runtime
         """
+        start = time.perf_counter()
         model.__is_surql_collection__ = True
         model.__surql_table_name__ = name
+        model.__is_surql_relation__ = config.relation is not None
         extra = model.model_config.get('extra')
         if extra == 'allow':
-            config.strict = False
+            config = config.model_copy(update={"strict": False})
         elif config.strict == False:
             model.model_config['extra'] = 'allow'
-        return SurQLTable(name=name, fields=self.from_fields(model), config=config)
\ No newline at end of file
+        table = SurQLTable(name=name, fields=self.from_fields(model), config=config)
+        model.__surql_table__ = table
+        self.parseTime += time.perf_counter() - start
+        return table
\ No newline at end of file
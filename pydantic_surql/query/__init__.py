@@ -0,0 +1,13 @@
+from .builder import *
+from .changefeed import *
+from .fetch import *
+from .functions import *
+from .live import *
+from .pagination import *
+from .partitions import *
+from .projection import *
+from .record_cache import *
+from .records import *
+from .relations import *
+from .resolver import *
+from .views import *
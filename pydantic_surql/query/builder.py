@@ -0,0 +1,268 @@
+from enum import Enum
+from typing import Any, Type
+from pydantic import BaseModel, TypeAdapter
+
+from ..cache import Cache
+from ..types import SurQLTable
+from .fetch import plan_fetch, record_links
+from .projection import projection_fields
+
+"""
+    SurQL comparison operators allowed in WHERE clauses
+"""
+OPERATORS: set[str] = {
+    "=", "!=", "==", "?=", "*=", "<", "<=", ">", ">=", "~", "!~", "?~", "*~",
+    "IN", "NOT IN", "INSIDE", "NOTINSIDE", "ALLINSIDE", "ANYINSIDE", "NONEINSIDE",
+    "CONTAINS", "CONTAINSNOT", "CONTAINSALL", "CONTAINSANY", "CONTAINSNONE",
+}
+
+"""
+    compiled query texts, keyed by query shape
+"""
+QUERY_CACHE = Cache()
+
+"""
+    list[model] validators, keyed by model
+"""
+DECODERS = Cache()
+
+class SurQLAction(Enum):
+    """
+        SurQL query actions enumeration
+    """
+    SELECT = "SELECT"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+
+def collection_table(model: Type[BaseModel]) -> SurQLTable:
+    """
+        return the SurQLTable definition of a @surql_collection model
+    """
+    table = getattr(model, "__surql_table__", None)
+    if (table is None):
+        raise Exception(f"{model} is not a surql collection, use @surql_collection or SurQLParser.from_model")
+    return table
+
+def to_param(value: Any) -> Any:
+    """
+        serialize a python value to a query parameter
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple, set)):
+        return [to_param(e) for e in value]
+    if hasattr(value, "tolist"):
+        # numpy arrays are converted in a single call
+        return value.tolist()
+    return value
+
+def decode(model: Type[BaseModel], rows: list[Any]) -> list[BaseModel]:
+    """
+        validate a list of query results into model instances in a single pass
+    """
+    adapter = DECODERS.get(model)
+    if (adapter is None):
+        adapter = DECODERS.set(model, TypeAdapter(list[model]))
+    return adapter.validate_python(rows)
+
+class SurQLQuery:
+    """
+        A typed SurQL query builder bound to a @surql_collection model
+        fields paths are validated against the table definition, values are always bound as $params
+        the query text is compiled once per query shape (the query without its values) and cached
+    """
+    def __init__(self, model: Type[BaseModel], action: SurQLAction):
+        self.model = model
+        self.table = collection_table(model)
+        self.action = action
+        self.projection: Type[BaseModel] | None = None
+        self._fields: tuple[str, ...] = ()
+        self._where: list[tuple[str, str]] = []
+        self._where_values: list[Any] = []
+        self._set: list[str] = []
+        self._set_values: list[Any] = []
+        self._order: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._start: int | None = None
+        self._fetch: tuple[str, ...] = ()
+
+    @classmethod
+    def select(cls, model: Type[BaseModel], *fields: str) -> "SurQLQuery":
+        """
+            start a SELECT query, defaults to all the fields
+        """
+        query = cls(model, SurQLAction.SELECT)
+        for path in fields:
+            query.table.resolve(path)
+        query._fields = fields
+        return query
+
+    @classmethod
+    def project(cls, model: Type[BaseModel], projection: Type[BaseModel]) -> "SurQLQuery":
+        """
+            start a SELECT query returning only the fields of a projection model
+            the results are decoded into the projection model
+        """
+        query = cls(model, SurQLAction.SELECT)
+        query._fields = projection_fields(query.table, projection)
+        query.projection = projection
+        return query
+
+    @classmethod
+    def update(cls, model: Type[BaseModel]) -> "SurQLQuery":
+        """
+            start an UPDATE query
+        """
+        return cls(model, SurQLAction.UPDATE)
+
+    @classmethod
+    def delete(cls, model: Type[BaseModel]) -> "SurQLQuery":
+        """
+            start a DELETE query
+        """
+        return cls(model, SurQLAction.DELETE)
+
+    def where(self, path: str, operator: str, value: Any) -> "SurQLQuery":
+        """
+            add a WHERE condition, conditions are joined by AND
+        """
+        operator = operator.upper()
+        if (operator not in OPERATORS):
+            raise Exception(f"operator {operator} is not supported")
+        self.table.resolve(path)
+        self._where.append((path, operator))
+        self._where_values.append(value)
+        return self
+
+    def set(self, path: str, value: Any) -> "SurQLQuery":
+        """
+            set a field value (UPDATE only)
+        """
+        if (self.action is not SurQLAction.UPDATE):
+            raise Exception("SET is only available on UPDATE queries")
+        self.table.resolve(path)
+        self._set.append(path)
+        self._set_values.append(value)
+        return self
+
+    def order_by(self, path: str, descending: bool = False) -> "SurQLQuery":
+        """
+            add an ORDER BY clause (SELECT only)
+        """
+        if (self.action is not SurQLAction.SELECT):
+            raise Exception("ORDER BY is only available on SELECT queries")
+        self.table.resolve(path)
+        self._order.append((path, descending))
+        return self
+
+    def limit(self, limit: int) -> "SurQLQuery":
+        """
+            limit the number of returned records (SELECT only)
+        """
+        if (self.action is not SurQLAction.SELECT):
+            raise Exception("LIMIT is only available on SELECT queries")
+        self._limit = limit
+        return self
+
+    def start(self, start: int) -> "SurQLQuery":
+        """
+            skip the first records (SELECT only)
+        """
+        if (self.action is not SurQLAction.SELECT):
+            raise Exception("START is only available on SELECT queries")
+        self._start = start
+        return self
+
+    def fetch(self, model: Type[BaseModel] | None = None, depth: int = 1) -> "SurQLQuery":
+        """
+            add a FETCH clause planned from the record links of a read model (defaults to the collection model)
+            nested record links are followed up to `depth` levels, the results are decoded into the read model
+        """
+        if (self.action is not SurQLAction.SELECT):
+            raise Exception("FETCH is only available on SELECT queries")
+        model = model or self.projection or self.model
+        for path, _ in record_links(model):
+            self.table.resolve(path)
+        self._fetch = plan_fetch(model, depth)
+        self.projection = model if model is not self.model else self.projection
+        return self
+
+    def shape(self) -> tuple:
+        """
+            return the query shape: everything but the bound values
+        """
+        return (
+            self.action,
+            self.table.name,
+            self._fields,
+            tuple(self._where),
+            tuple(self._set),
+            tuple(self._order),
+            self._limit is not None,
+            self._start is not None,
+            self._fetch,
+        )
+
+    def _compile(self) -> str:
+        """
+            return the query text
+        """
+        _def = []
+        if (self.action is SurQLAction.SELECT):
+            _def += ["SELECT", ", ".join(self._fields) if len(self._fields) > 0 else "*", "FROM", self.table.name]
+        elif (self.action is SurQLAction.UPDATE):
+            _def += ["UPDATE", self.table.name]
+            if (len(self._set) > 0):
+                _def += ["SET", ", ".join([f"{path} = $s{idx}" for idx, path in enumerate(self._set)])]
+        else:
+            _def += ["DELETE", self.table.name]
+        if (len(self._where) > 0):
+            _def += ["WHERE", " AND ".join([f"{path} {operator} $w{idx}" for idx, (path, operator) in enumerate(self._where)])]
+        if (len(self._order) > 0):
+            _def += ["ORDER BY", ", ".join([f"{path} {'DESC' if desc else 'ASC'}" for path, desc in self._order])]
+        if (self._limit is not None):
+            _def += ["LIMIT $limit"]
+        if (self._start is not None):
+            _def += ["START $start"]
+        if (len(self._fetch) > 0):
+            _def += ["FETCH", ", ".join(self._fetch)]
+        return " ".join(_def) + ";"
+
+    def compile(self) -> str:
+        """
+            return the query text, compiled once per query shape
+        """
+        shape = self.shape()
+        text = QUERY_CACHE.get(shape)
+        if (text is None):
+            text = QUERY_CACHE.set(shape, self._compile())
+        return text
+
+    def params(self) -> dict[str, Any]:
+        """
+            return the query parameters
+        """
+        params = {}
+        for idx, value in enumerate(self._set_values):
+            params[f"s{idx}"] = to_param(value)
+        for idx, value in enumerate(self._where_values):
+            params[f"w{idx}"] = to_param(value)
+        if (self._limit is not None):
+            params["limit"] = self._limit
+        if (self._start is not None):
+            params["start"] = self._start
+        return params
+
+    def build(self) -> tuple[str, dict[str, Any]]:
+        """
+            return the query text and its parameters
+        """
+        return self.compile(), self.params()
+
+    def decode(self, rows: list[Any]) -> list[BaseModel]:
+        """
+            decode the query results into the projection model (or the collection model)
+        """
+        return decode(self.projection or self.model, rows)
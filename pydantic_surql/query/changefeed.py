@@ -0,0 +1,165 @@
+import asyncio
+import time
+from enum import Enum
+from typing import Any, AsyncIterator, Iterator, Optional, Protocol, Type
+from pydantic import BaseModel
+
+from ..transport import SurQLAsyncTransport, SurQLTransport
+from .builder import collection_table, decode
+
+class SurQLChangeAction(Enum):
+    """
+        SurQL changefeed actions enumeration
+    """
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class SurQLChange(BaseModel):
+    """
+        A decoded changefeed entry, record is None for deletions
+    """
+    action: SurQLChangeAction
+    versionstamp: int
+    id: Any
+    record: Optional[Any] = None
+
+class SurQLCheckpointStore(Protocol):
+    """
+        A pluggable changefeed checkpoint store (eg: a file, a redis key, a database record)
+        get returns the next versionstamp to consume, None if nothing was consumed yet
+    """
+    def get(self, key: str) -> Optional[int]:
+        ...
+
+    def set(self, key: str, versionstamp: int) -> None:
+        ...
+
+class SurQLMemoryCheckpointStore:
+    """
+        An in memory changefeed checkpoint store
+    """
+    def __init__(self):
+        self.checkpoints: dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[int]:
+        return self.checkpoints.get(key)
+
+    def set(self, key: str, versionstamp: int) -> None:
+        self.checkpoints[key] = versionstamp
+
+class SurQLChangefeed:
+    """
+        A changefeed consumer of a changefeed enabled @surql_collection model
+        changes are polled in batches with `SHOW CHANGES FOR TABLE <t> SINCE <versionstamp> LIMIT <n>`,
+        the next batch is only polled when the current one is consumed (backpressure)
+        the checkpoint is stored once a batch is consumed, a batch is delivered at least once
+    """
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        transport: SurQLTransport | SurQLAsyncTransport,
+        store: Optional[SurQLCheckpointStore] = None,
+        batch_size: int = 100,
+        interval: float = 1.0,
+        since: int = 0,
+        follow: bool = True
+    ):
+        self.model = model
+        self.table = collection_table(model)
+        if (self.table.config.changeFeed is None):
+            raise Exception(f"table {self.table.name} has no changefeed, set SurQLTableConfig.changeFeed")
+        self.transport = transport
+        self.store = store or SurQLMemoryCheckpointStore()
+        self.batch_size = batch_size
+        self.interval = interval
+        self.since = since
+        self.follow = follow
+
+    def cursor(self) -> int:
+        """
+            return the next versionstamp to consume
+        """
+        checkpoint = self.store.get(self.table.name)
+        return self.since if checkpoint is None else checkpoint
+
+    def query(self) -> str:
+        """
+            return the SHOW CHANGES query of the next batch
+            the versionstamp is inlined, SHOW statements don't accept params
+        """
+        return f"SHOW CHANGES FOR TABLE {self.table.name} SINCE {int(self.cursor())} LIMIT {int(self.batch_size)};"
+
+    def decode(self, rows: list[dict[str, Any]]) -> list[SurQLChange]:
+        """
+            decode a batch of changefeed rows, the records of the batch are validated in a single call
+        """
+        entries = []
+        for row in rows:
+            for change in row.get("changes", []):
+                for action in SurQLChangeAction:
+                    if (action.value in change):
+                        entries.append((action, row["versionstamp"], change[action.value]))
+        records = iter(decode(self.model, [e[2] for e in entries if e[0] is not SurQLChangeAction.DELETE]))
+        return [
+            SurQLChange(
+                action=action,
+                versionstamp=versionstamp,
+                id=data.get("id"),
+                record=next(records) if action is not SurQLChangeAction.DELETE else None
+            )
+            for action, versionstamp, data in entries
+        ]
+
+    def _checkpoint(self, rows: list[dict[str, Any]]):
+        """
+            store the versionstamp following a consumed batch
+        """
+        self.store.set(self.table.name, max([row["versionstamp"] for row in rows]) + 1)
+
+    def batches(self) -> Iterator[list[SurQLChange]]:
+        """
+            yield decoded batches of changes
+        """
+        while True:
+            rows = self.transport.query(self.query())
+            if (len(rows) == 0):
+                if (not self.follow):
+                    return
+                time.sleep(self.interval)
+                continue
+            changes = self.decode(rows)
+            if (len(changes) > 0):
+                yield changes
+            self._checkpoint(rows)
+
+    def __iter__(self) -> Iterator[SurQLChange]:
+        """
+            yield decoded changes
+        """
+        for batch in self.batches():
+            yield from batch
+
+    async def abatches(self) -> AsyncIterator[list[SurQLChange]]:
+        """
+            yield decoded batches of changes
+        """
+        while True:
+            rows = await self.transport.query(self.query())
+            if (len(rows) == 0):
+                if (not self.follow):
+                    return
+                await asyncio.sleep(self.interval)
+                continue
+            changes = self.decode(rows)
+            if (len(changes) > 0):
+                yield changes
+            self._checkpoint(rows)
+
+    async def __aiter__(self) -> AsyncIterator[SurQLChange]:
+        """
+            yield decoded changes
+        """
+        async for batch in self.abatches():
+            for change in batch:
+                yield change
@@ -0,0 +1,58 @@
+from typing import Type, get_args
+from pydantic import BaseModel
+
+from ..cache import Cache
+
+"""
+    FETCH plans, keyed by (read model, depth)
+"""
+FETCH_CACHE = Cache()
+
+def _annotation_models(annotation: Type) -> list[Type[BaseModel]]:
+    """
+        return the pydantic models found in a field annotation (unions, lists and sets included)
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return [annotation]
+    res = []
+    for arg in get_args(annotation):
+        res += _annotation_models(arg)
+    return res
+
+def record_links(model: Type[BaseModel], prefix: str = "", _seen: set | None = None) -> list[tuple[str, Type[BaseModel]]]:
+    """
+        return the (path, collection model) record links of a model
+        nested objects are walked, record links are not followed
+    """
+    seen = _seen if _seen is not None else set()
+    if (model in seen):
+        return []
+    seen = seen | {model}
+    links = []
+    for field_name, field in model.model_fields.items():
+        path = f"{prefix}{field_name}"
+        for target in _annotation_models(field.annotation):
+            if hasattr(target, '__is_surql_collection__'):
+                links.append((path, target))
+            else:
+                links += record_links(target, f"{path}.", seen)
+    return links
+
+def plan_fetch(model: Type[BaseModel], depth: int = 1) -> tuple[str, ...]:
+    """
+        return the FETCH clause paths needed to decode a read model in a single query
+        nested record links are followed up to `depth` levels
+    """
+    key = (model, depth)
+    if (FETCH_CACHE.has(key)):
+        return FETCH_CACHE.get(key)
+    paths = []
+    def walk(_model: Type[BaseModel], prefix: str, level: int):
+        if (level >= depth):
+            return
+        for path, target in record_links(_model, prefix):
+            if (path not in paths):
+                paths.append(path)
+            walk(target, f"{path}.", level + 1)
+    walk(model, "", 0)
+    return FETCH_CACHE.set(key, tuple(paths))
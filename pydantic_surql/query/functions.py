@@ -0,0 +1,52 @@
+import functools
+import inspect
+from typing import Any, Callable
+from pydantic import TypeAdapter
+
+from ..transport import SurQLAsyncTransport, SurQLTransport
+from ..types import SurQLFunction
+from .builder import QUERY_CACHE, to_param
+
+class SurQLFunctionCall:
+    """
+        A typed client side helper of a SurQL function declared from a python function signature
+        calling it returns the `RETURN fn::name($a, ...)` query text and params
+    """
+    def __init__(self, function: SurQLFunction, func: Callable[..., Any]):
+        self.function = function
+        self.signature = inspect.signature(func)
+        returns = self.signature.return_annotation
+        self.adapter = TypeAdapter(returns) if returns is not inspect.Signature.empty else None
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> tuple[str, dict[str, Any]]:
+        """
+            return the call query text and params of the function arguments
+        """
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        shape = ("function", self.function.name)
+        text = QUERY_CACHE.get(shape)
+        if (text is None):
+            text = QUERY_CACHE.set(shape, f"RETURN {self.function.call(*[f'${name}' for name in self.function.args])};")
+        return text, {name: to_param(value) for name, value in bound.arguments.items()}
+
+    def decode(self, result: Any) -> Any:
+        """
+            validate a function result against the python return annotation
+        """
+        if (self.adapter is None):
+            return result
+        return self.adapter.validate_python(result)
+
+    def run(self, transport: SurQLTransport, *args: Any, **kwargs: Any) -> Any:
+        """
+            call the function in a single round trip and return its decoded result
+        """
+        return self.decode(transport.query(*self(*args, **kwargs)))
+
+    async def arun(self, transport: SurQLAsyncTransport, *args: Any, **kwargs: Any) -> Any:
+        """
+            call the function in a single round trip and return its decoded result
+        """
+        return self.decode(await transport.query(*self(*args, **kwargs)))
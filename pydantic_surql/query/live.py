@@ -0,0 +1,160 @@
+import asyncio
+from enum import Enum
+from typing import Any, AsyncIterator, Optional, Type
+from pydantic import BaseModel
+
+from ..transport import SurQLLiveTransport
+from .builder import QUERY_CACHE, collection_table, decode
+
+"""
+    end of a live notifications stream
+"""
+LIVE_END = object()
+
+class SurQLLiveAction(Enum):
+    """
+        SurQL live notifications actions enumeration
+    """
+    CREATE = "CREATE"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+
+class SurQLLiveEvent(BaseModel):
+    """
+        A decoded live notification
+        record is the decoded record (None for deletions and diffs), diff the JSON patch operations of a DIFF live query
+    """
+    action: SurQLLiveAction
+    id: Any
+    record: Optional[Any] = None
+    diff: Optional[list[Any]] = None
+
+def _record_id(notification: dict[str, Any]) -> Any:
+    """
+        return the record id of a notification (the `record` key, or the id of the result record)
+    """
+    if (notification.get("record") is not None):
+        return notification["record"]
+    result = notification["result"]
+    return result.get("id") if isinstance(result, dict) else None
+
+class SurQLLiveQuery:
+    """
+        A LIVE SELECT subscription on a @surql_collection model, as an async stream of decoded events
+        the notifications are read in the background into a bounded buffer (the transport is paused when it is full)
+        and the pending notifications are decoded in batches instead of one by one
+        with a coalesce window, the updates of a same record received within the window are merged
+    """
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        transport: SurQLLiveTransport,
+        diff: bool = False,
+        coalesce: Optional[float] = None,
+        buffer_size: int = 1000
+    ):
+        self.model = model
+        self.table = collection_table(model)
+        self.transport = transport
+        self.diff = diff
+        self.coalesce = coalesce
+        self.buffer_size = buffer_size
+
+    def query(self) -> str:
+        """
+            return the LIVE SELECT query text
+        """
+        shape = ("live", self.table.name, self.diff)
+        text = QUERY_CACHE.get(shape)
+        if (text is None):
+            text = QUERY_CACHE.set(shape, f"LIVE SELECT {'DIFF' if self.diff else '*'} FROM {self.table.name};")
+        return text
+
+    def merge(self, notifications: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+            merge the notifications of a same record, ordered by their last notification
+            a record created then deleted within the window is dropped
+        """
+        res: dict[Any, dict[str, Any]] = {}
+        for notification in notifications:
+            key = str(_record_id(notification))
+            previous = res.pop(key, None)
+            if (previous is None):
+                res[key] = notification
+            elif (notification["action"] == SurQLLiveAction.DELETE.value):
+                if (previous["action"] != SurQLLiveAction.CREATE.value):
+                    res[key] = notification
+            elif (self.diff):
+                res[key] = {**notification, "action": previous["action"], "result": previous["result"] + notification["result"]}
+            else:
+                action = SurQLLiveAction.CREATE.value if previous["action"] == SurQLLiveAction.CREATE.value else notification["action"]
+                res[key] = {**notification, "action": action}
+        return list(res.values())
+
+    def decode(self, notifications: list[dict[str, Any]]) -> list[SurQLLiveEvent]:
+        """
+            decode a batch of notifications, the records of the batch are validated in a single call
+        """
+        if (self.diff):
+            return [
+                SurQLLiveEvent(action=SurQLLiveAction(e["action"]), id=_record_id(e), diff=e["result"])
+                for e in notifications
+            ]
+        records = iter(decode(self.model, [e["result"] for e in notifications if e["action"] != SurQLLiveAction.DELETE.value]))
+        return [
+            SurQLLiveEvent(
+                action=SurQLLiveAction(e["action"]),
+                id=_record_id(e),
+                record=next(records) if e["action"] != SurQLLiveAction.DELETE.value else None
+            )
+            for e in notifications
+        ]
+
+    async def batches(self) -> AsyncIterator[list[SurQLLiveEvent]]:
+        """
+            yield decoded batches of the pending events
+        """
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=self.buffer_size)
+
+        async def reader():
+            try:
+                async for notification in self.transport.live(self.query()):
+                    await buffer.put(notification)
+            except Exception as e:
+                await buffer.put(e)
+            else:
+                await buffer.put(LIVE_END)
+
+        task = asyncio.ensure_future(reader())
+        try:
+            while True:
+                pending = [await buffer.get()]
+                if (self.coalesce is not None and pending[0] is not LIVE_END):
+                    await asyncio.sleep(self.coalesce)
+                while (not buffer.empty()):
+                    pending.append(buffer.get_nowait())
+                ended = False
+                notifications = []
+                for e in pending:
+                    if isinstance(e, Exception):
+                        raise e
+                    if (e is LIVE_END):
+                        ended = True
+                    else:
+                        notifications.append(e)
+                if (self.coalesce is not None):
+                    notifications = self.merge(notifications)
+                if (len(notifications) > 0):
+                    yield self.decode(notifications)
+                if (ended):
+                    return
+        finally:
+            task.cancel()
+
+    async def __aiter__(self) -> AsyncIterator[SurQLLiveEvent]:
+        """
+            yield decoded events
+        """
+        async for batch in self.batches():
+            for event in batch:
+                yield event
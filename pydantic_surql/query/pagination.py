@@ -0,0 +1,124 @@
+import asyncio
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Iterator, Type
+from pydantic import BaseModel
+
+from ..transport import SurQLAsyncTransport, SurQLTransport
+from ..types import SurQLIndex, SurQLUniqueIndex
+from .builder import QUERY_CACHE, collection_table, decode
+
+def _value_at(row: dict, path: str) -> Any:
+    """
+        return the value of a field path in a raw record
+    """
+    value = row
+    for name in path.split("."):
+        value = value.get(name) if isinstance(value, dict) else None
+    return value
+
+class SurQLPaginator:
+    """
+        A keyset (cursor) paginator over a @surql_collection model
+        pages are fetched with `WHERE <field> > $last ORDER BY <field> LIMIT $limit` instead of START,
+        ties on a non unique field are broken on the record id
+        the next page is prefetched while the current one is consumed
+    """
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        transport: SurQLTransport | SurQLAsyncTransport,
+        order_by: str = "id",
+        page_size: int = 100,
+        descending: bool = False
+    ):
+        self.model = model
+        self.table = collection_table(model)
+        self.table.resolve(order_by)
+        self.transport = transport
+        self.order_by = order_by
+        self.page_size = page_size
+        self.descending = descending
+        if (order_by != "id" and not any(type(index) in (SurQLIndex, SurQLUniqueIndex) and index.fields[0] == order_by for index in self.table.config.indexes)):
+            warnings.warn(f"{self.table.name}.{order_by} is not covered by an index, pagination will scan the table", stacklevel=2)
+
+    def _compile(self, first: bool) -> str:
+        """
+            return the page query text
+        """
+        op = "<" if self.descending else ">"
+        direction = "DESC" if self.descending else "ASC"
+        field = self.order_by
+        _def = ["SELECT * FROM", self.table.name]
+        if (not first):
+            if (field == "id"):
+                _def += [f"WHERE id {op} $last"]
+            else:
+                _def += [f"WHERE {field} {op} $last OR ({field} = $last AND id {op} $last_id)"]
+        if (field == "id"):
+            _def += [f"ORDER BY id {direction}"]
+        else:
+            _def += [f"ORDER BY {field} {direction}, id {direction}"]
+        _def += ["LIMIT $limit"]
+        return " ".join(_def) + ";"
+
+    def query(self, last: dict | None = None) -> tuple[str, dict[str, Any]]:
+        """
+            return the query text and parameters of the page following the `last` raw record
+        """
+        shape = ("keyset", self.table.name, self.order_by, self.descending, last is None)
+        text = QUERY_CACHE.get(shape)
+        if (text is None):
+            text = QUERY_CACHE.set(shape, self._compile(last is None))
+        params = {"limit": self.page_size}
+        if (last is not None):
+            params["last"] = _value_at(last, self.order_by)
+            if (self.order_by != "id"):
+                params["last_id"] = last["id"]
+        return text, params
+
+    def pages(self) -> Iterator[list[BaseModel]]:
+        """
+            yield decoded pages, the next page is fetched in a background thread
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.transport.query, *self.query())
+            while future is not None:
+                rows = future.result()
+                future = None
+                if (len(rows) == self.page_size):
+                    future = executor.submit(self.transport.query, *self.query(rows[-1]))
+                if (len(rows) > 0):
+                    yield decode(self.model, rows)
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        """
+            yield decoded records
+        """
+        for page in self.pages():
+            yield from page
+
+    async def apages(self) -> AsyncIterator[list[BaseModel]]:
+        """
+            yield decoded pages, the next page is fetched while the current one is consumed
+        """
+        task = asyncio.ensure_future(self.transport.query(*self.query()))
+        try:
+            while task is not None:
+                rows = await task
+                task = None
+                if (len(rows) == self.page_size):
+                    task = asyncio.ensure_future(self.transport.query(*self.query(rows[-1])))
+                if (len(rows) > 0):
+                    yield decode(self.model, rows)
+        finally:
+            if (task is not None):
+                task.cancel()
+
+    async def __aiter__(self) -> AsyncIterator[BaseModel]:
+        """
+            yield decoded records
+        """
+        async for page in self.apages():
+            for record in page:
+                yield record
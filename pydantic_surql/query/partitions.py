@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Any, Type
+from pydantic import BaseModel
+
+from .builder import QUERY_CACHE, collection_table
+from .records import serialize
+
+def _partitioning(model: Type[BaseModel]):
+    """
+        return the table and partitioning definition of a partitioned collection
+    """
+    table = collection_table(model)
+    if (table.config.partitioning is None):
+        raise Exception(f"table {table.name} is not partitioned")
+    return table, table.config.partitioning
+
+def route(instances: list[BaseModel]) -> dict[str, list[BaseModel]]:
+    """
+        group partitioned collection instances by partition table
+        raise an exception if an instance is outside of the declared partitions range
+    """
+    res: dict[str, list[BaseModel]] = {}
+    for instance in instances:
+        table, partitioning = _partitioning(type(instance))
+        value = instance
+        for name in partitioning.field.split("."):
+            value = getattr(value, name)
+        res.setdefault(table.partition(value), []).append(instance)
+    return res
+
+def insert_partitioned(instances: list[BaseModel]) -> list[tuple[str, dict[str, Any]]]:
+    """
+        return one bulk INSERT query per partition table
+    """
+    res = []
+    for partition, records in route(instances).items():
+        shape = ("insert", partition)
+        text = QUERY_CACHE.get(shape)
+        if (text is None):
+            text = QUERY_CACHE.set(shape, f"INSERT INTO {partition} $records;")
+        res.append((text, {"records": [serialize(record) for record in records]}))
+    return res
+
+def select_partitioned(model: Type[BaseModel], start: datetime, end: datetime) -> tuple[str, dict[str, Any]]:
+    """
+        return a SELECT query fanned out across the defined partitions overlapping [start, end)
+    """
+    table, partitioning = _partitioning(model)
+    partitions = tuple(table.partitions(start, end))
+    if (len(partitions) == 0):
+        raise Exception(f"no partition of {table.name} overlaps the requested range")
+    shape = ("partitions", table.name, partitions)
+    text = QUERY_CACHE.get(shape)
+    if (text is None):
+        field = partitioning.field
+        text = QUERY_CACHE.set(shape, f"SELECT * FROM {', '.join(partitions)} WHERE {field} >= $start AND {field} < $end;")
+    return text, {"start": start, "end": end}
+
+def retention(model: Type[BaseModel], before: datetime) -> str:
+    """
+        return the REMOVE TABLE statements of the declared partitions ending before `before`
+    """
+    table, partitioning = _partitioning(model)
+    expired = [
+        f"REMOVE TABLE {table.name}_{partitioning.suffix(bucket)};"
+        for bucket in partitioning.buckets()
+        if partitioning.next_bucket(bucket) <= before
+    ]
+    return "\n".join(expired)
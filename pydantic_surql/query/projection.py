@@ -0,0 +1,53 @@
+from typing import Type, get_args
+from pydantic import BaseModel
+
+from ..cache import Cache
+from ..parser import is_union
+from ..types import SurQLField, SurQLTable
+
+"""
+    projections fields paths, keyed by (table name, projection model)
+"""
+PROJECTION_CACHE = Cache()
+
+def _nested_model(annotation: Type) -> Type[BaseModel] | None:
+    """
+        return the nested (non collection) model of a projection field annotation, if any
+    """
+    args = [e for e in get_args(annotation) if e is not type(None)] if is_union(annotation) else [annotation]
+    if (len(args) != 1 or not isinstance(args[0], type)):
+        return None
+    if (issubclass(args[0], BaseModel) and not hasattr(args[0], '__is_surql_collection__')):
+        return args[0]
+    return None
+
+def _is_object(types: list) -> bool:
+    """
+        check if a field types definition is a nested object
+    """
+    return any(isinstance(t, SurQLField) and len(t.types) > 0 and all(isinstance(e, SurQLField) and e.name is not None for e in t.types) for t in types)
+
+def _projection_paths(table: SurQLTable, projection: Type[BaseModel], prefix: str) -> list[str]:
+    """
+        return the fields paths of a projection model, recursively
+    """
+    paths = []
+    for field_name, field in projection.model_fields.items():
+        path = f"{prefix}{field_name}"
+        types = table.resolve(path)
+        nested = _nested_model(field.annotation)
+        if (nested is not None and _is_object(types)):
+            paths += _projection_paths(table, nested, f"{path}.")
+        else:
+            paths.append(path)
+    return paths
+
+def projection_fields(table: SurQLTable, projection: Type[BaseModel]) -> tuple[str, ...]:
+    """
+        return the SELECT fields paths of a projection model (a subset of the collection model fields, possibly nested)
+        every path is validated against the table definition
+    """
+    key = (table.name, projection)
+    if (PROJECTION_CACHE.has(key)):
+        return PROJECTION_CACHE.get(key)
+    return PROJECTION_CACHE.set(key, tuple(_projection_paths(table, projection, "")))
@@ -0,0 +1,172 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional, Type
+from pydantic import BaseModel
+
+from ..transport import SurQLAsyncTransport, SurQLTransport
+from ..types import SurQLEvent
+from .builder import collection_table, decode
+from .changefeed import SurQLChange
+from .resolver import RESOLVE_QUERY
+
+"""
+    table written by the cache invalidation events
+"""
+INVALIDATION_TABLE = "surql_cache_invalidations"
+
+class SurQLRecordCache:
+    """
+        A read-through cache of decoded collection records, keyed by record id and by query text + params
+        entries expire after ttl seconds, the least recently used entries are evicted above max_size
+        a table is invalidated from its changefeed entries (apply) or from the rows of the invalidation events (invalidate)
+    """
+    def __init__(
+        self,
+        transport: SurQLTransport | SurQLAsyncTransport,
+        ttl: Optional[float] = 60.0,
+        max_size: int = 10_000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.transport = transport
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.entries: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self.tables: dict[str, set[Hashable]] = {}
+
+    @staticmethod
+    def query_key(text: str, params: Optional[dict[str, Any]]) -> Hashable:
+        """
+            return the cache key of a query (whitespace normalized text and sorted params)
+        """
+        return ("query", " ".join(text.split()), json.dumps(params or {}, sort_keys=True, default=str))
+
+    @staticmethod
+    def id_key(_id: Any) -> Hashable:
+        """
+            return the cache key of a record id
+        """
+        return ("id", str(_id))
+
+    def _get(self, key: Hashable) -> Any:
+        """
+            return a cached value, None if missing or expired
+        """
+        entry = self.entries.get(key)
+        if (entry is None):
+            return None
+        expires, value = entry
+        if (expires is not None and expires <= self.clock()):
+            self._drop(key)
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def _set(self, table: str, key: Hashable, value: Any):
+        """
+            cache a value of a table, evicting the least recently used entries
+        """
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        self.entries[key] = (expires, value)
+        self.entries.move_to_end(key)
+        self.tables.setdefault(table, set()).add(key)
+        while (len(self.entries) > self.max_size):
+            self._drop(next(iter(self.entries)))
+
+    def _drop(self, key: Hashable):
+        """
+            remove a cached value
+        """
+        self.entries.pop(key, None)
+        for keys in self.tables.values():
+            keys.discard(key)
+
+    def _store(self, table: str, key: Hashable, records: list[BaseModel]) -> list[BaseModel]:
+        """
+            cache decoded query records, and each record by id
+        """
+        self._set(table, key, records)
+        for record in records:
+            if (getattr(record, "id", None) is not None):
+                self._set(table, self.id_key(record.id), record)
+        return records
+
+    def get(self, model: Type[BaseModel], _id: Any) -> Optional[BaseModel]:
+        """
+            return a record by id, fetched on a cache miss
+        """
+        record = self._get(self.id_key(_id))
+        if (record is None):
+            records = decode(model, self.transport.query(RESOLVE_QUERY, {"ids": [_id]}))
+            if (len(records) == 0):
+                return None
+            record = records[0]
+            self._set(collection_table(model).name, self.id_key(_id), record)
+        return record
+
+    def query(self, model: Type[BaseModel], text: str, params: Optional[dict[str, Any]] = None) -> list[BaseModel]:
+        """
+            return the decoded records of a query, executed on a cache miss
+        """
+        key = self.query_key(text, params)
+        records = self._get(key)
+        if (records is None):
+            records = self._store(collection_table(model).name, key, decode(model, self.transport.query(text, params)))
+        return records
+
+    async def aget(self, model: Type[BaseModel], _id: Any) -> Optional[BaseModel]:
+        """
+            return a record by id, fetched on a cache miss
+        """
+        record = self._get(self.id_key(_id))
+        if (record is None):
+            records = decode(model, await self.transport.query(RESOLVE_QUERY, {"ids": [_id]}))
+            if (len(records) == 0):
+                return None
+            record = records[0]
+            self._set(collection_table(model).name, self.id_key(_id), record)
+        return record
+
+    async def aquery(self, model: Type[BaseModel], text: str, params: Optional[dict[str, Any]] = None) -> list[BaseModel]:
+        """
+            return the decoded records of a query, executed on a cache miss
+        """
+        key = self.query_key(text, params)
+        records = self._get(key)
+        if (records is None):
+            records = self._store(collection_table(model).name, key, decode(model, await self.transport.query(text, params)))
+        return records
+
+    def invalidate(self, table: str):
+        """
+            remove every cached record and query result of a table
+        """
+        for key in self.tables.pop(table, set()):
+            self.entries.pop(key, None)
+
+    def apply(self, model: Type[BaseModel], changes: Iterable[SurQLChange]):
+        """
+            invalidate a table from its changefeed entries
+        """
+        if (len(list(changes)) > 0):
+            self.invalidate(collection_table(model).name)
+
+    def clear(self):
+        """
+            remove every cached value
+        """
+        self.entries.clear()
+        self.tables.clear()
+
+    @staticmethod
+    def event(table: str) -> SurQLEvent:
+        """
+            return a DEFINE EVENT hook writing the table changes to the invalidation table
+            the invalidation rows (`{table: ...}`) can be streamed (changefeed / live query) to invalidate
+        """
+        return SurQLEvent(
+            name=f"{table}_cache_invalidation",
+            whenSDL="$event IN ['CREATE', 'UPDATE', 'DELETE']",
+            querySDL=f"CREATE {INVALIDATION_TABLE} CONTENT {{ table: '{table}', event: $event, at: time::now() }}"
+        )
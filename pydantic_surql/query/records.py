@@ -0,0 +1,68 @@
+from typing import Any, Type
+from pydantic import BaseModel
+
+from ..types import SurQLCompositeId
+from .builder import QUERY_CACHE, collection_table, to_param
+
+def record_id(instance: BaseModel) -> Any:
+    """
+        return the record id of a collection instance from the table record id strategy
+        None if the table has no strategy (the database generates the id)
+        a generated random id is assigned to the instance `id` field (if the model declares one),
+        so serializing the instance again (eg: a retried insert) keeps the same record id
+    """
+    strategy = collection_table(type(instance)).config.recordId
+    if (strategy is None):
+        return getattr(instance, "id", None)
+    _id = strategy.generate(instance)
+    if (not isinstance(strategy, SurQLCompositeId) and "id" in type(instance).model_fields and getattr(instance, "id") is None):
+        instance.id = _id
+    return _id
+
+def serialize(instance: BaseModel) -> dict[str, Any]:
+    """
+        serialize a collection instance to a record content, with its generated record id
+        the fields computed by the database (VALUE clause) are not sent,
+        nor the fields with a database DEFAULT clause that were not explicitly set (the database default applies)
+    """
+    content = to_param(instance)
+    _id = record_id(instance)
+    content.pop("id", None)
+    for field in collection_table(type(instance)).fields:
+        if (field.value is not None or (field.default is not None and field.name not in instance.model_fields_set)):
+            content.pop(field.name, None)
+    if (_id is not None):
+        content["id"] = to_param(_id)
+    return content
+
+def insert(model: Type[BaseModel], instances: list[BaseModel]) -> tuple[str, dict[str, Any]]:
+    """
+        return a bulk INSERT query of collection instances
+    """
+    table = collection_table(model)
+    shape = ("insert", table.name)
+    text = QUERY_CACHE.get(shape)
+    if (text is None):
+        text = QUERY_CACHE.set(shape, f"INSERT INTO {table.name} $records;")
+    return text, {"records": [serialize(instance) for instance in instances]}
+
+def id_range(model: Type[BaseModel], start: list[Any], end: list[Any], inclusive: bool = False) -> tuple[str, dict[str, Any]]:
+    """
+        return a SELECT query over a composite record ids range (eg: `table:[$tenant, $from]..[$tenant, $to]`)
+        the range is scanned on the record ids, no secondary index is needed
+    """
+    table = collection_table(model)
+    strategy = table.config.recordId
+    if (not isinstance(strategy, SurQLCompositeId)):
+        raise Exception(f"table {table.name} has no composite record id strategy")
+    if (len(start) > len(strategy.fields) or len(end) > len(strategy.fields)):
+        raise Exception(f"range bounds of {table.name} can't exceed {len(strategy.fields)} items")
+    shape = ("range", table.name, len(start), len(end), inclusive)
+    text = QUERY_CACHE.get(shape)
+    if (text is None):
+        lower = ", ".join([f"$from{idx}" for idx in range(len(start))])
+        upper = ", ".join([f"$to{idx}" for idx in range(len(end))])
+        text = QUERY_CACHE.set(shape, f"SELECT * FROM {table.name}:[{lower}]..{'=' if inclusive else ''}[{upper}];")
+    params = {f"from{idx}": to_param(value) for idx, value in enumerate(start)}
+    params.update({f"to{idx}": to_param(value) for idx, value in enumerate(end)})
+    return text, params
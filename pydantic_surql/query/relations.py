@@ -0,0 +1,43 @@
+from typing import Any, Iterator, Type
+from pydantic import BaseModel
+
+from .builder import QUERY_CACHE, collection_table, to_param
+
+def _edge_fields(model: Type[BaseModel]) -> tuple[str, str]:
+    """
+        return the python names of the in / out fields of a relation model
+    """
+    names = {(field.alias or field_name): field_name for field_name, field in model.model_fields.items()}
+    if ("in" not in names or "out" not in names):
+        raise Exception(f"relation {model} must define `in` and `out` fields (eg: `in_: Writer | str = Field(alias='in')`)")
+    return names["in"], names["out"]
+
+def _record(value: Any) -> Any:
+    """
+        return the record id of a relation end
+    """
+    if isinstance(value, BaseModel):
+        return to_param(getattr(value, "id"))
+    return to_param(value)
+
+def relate(model: Type[BaseModel], edges: list[BaseModel], chunk_size: int = 1000) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+        yield batched RELATE queries (one query of up to chunk_size statements per chunk)
+        the query text is compiled once per chunk size
+    """
+    table = collection_table(model)
+    if (table.config.relation is None):
+        raise Exception(f"table {table.name} is not a relation table, use @surql_relation")
+    _in, _out = _edge_fields(model)
+    for offset in range(0, len(edges), chunk_size):
+        chunk = edges[offset:offset + chunk_size]
+        shape = ("relate", table.name, len(chunk))
+        text = QUERY_CACHE.get(shape)
+        if (text is None):
+            text = QUERY_CACHE.set(shape, "\n".join([f"RELATE $in{idx}->{table.name}->$out{idx} CONTENT $c{idx};" for idx in range(len(chunk))]))
+        params = {}
+        for idx, edge in enumerate(chunk):
+            params[f"in{idx}"] = _record(getattr(edge, _in))
+            params[f"out{idx}"] = _record(getattr(edge, _out))
+            params[f"c{idx}"] = edge.model_dump(exclude={_in, _out, "id"})
+        yield text, params
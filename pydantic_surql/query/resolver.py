@@ -0,0 +1,72 @@
+from typing import Any, Callable, Type
+from pydantic import BaseModel
+
+from ..transport import SurQLTransport
+from .builder import decode
+from .fetch import record_links
+
+RESOLVE_QUERY = "SELECT * FROM $ids;"
+
+def _map_path(value: Any, path: list[str], fn: Callable[[Any], Any]) -> Any:
+    """
+        return a copy of value with fn applied on the values at path (arrays are mapped)
+    """
+    if isinstance(value, list):
+        return [_map_path(e, path, fn) for e in value]
+    if (len(path) == 0):
+        return fn(value)
+    if (not isinstance(value, dict) or path[0] not in value):
+        return value
+    return {**value, path[0]: _map_path(value[path[0]], path[1:], fn)}
+
+def _is_id(value: Any) -> bool:
+    """
+        check if a record link value is an unresolved record id
+    """
+    return value is not None and not isinstance(value, (dict, BaseModel))
+
+class SurQLRecordResolver:
+    """
+        A batched record links resolver (the client side alternative to FETCH)
+        every referenced id of a batch is deduplicated and fetched with one query per target table,
+        the identity map makes sure a shared record is decoded once (use one resolver per request)
+    """
+    def __init__(self, transport: SurQLTransport):
+        self.transport = transport
+        self.identity: dict[str, BaseModel] = {}
+
+    def _fetch(self, model: Type[BaseModel], ids: list[Any], depth: int):
+        """
+            fetch and decode the records not already in the identity map
+        """
+        missing = [_id for _id in ids if str(_id) not in self.identity]
+        if (len(missing) == 0):
+            return
+        rows = self.transport.query(RESOLVE_QUERY, {"ids": missing})
+        for row, instance in zip(rows, self.resolve(model, rows, depth)):
+            self.identity[str(row["id"])] = instance
+
+    def resolve(self, model: Type[BaseModel], items: list[BaseModel | dict], depth: int = 1) -> list[BaseModel]:
+        """
+            resolve the record links of a batch of records (or instances) and decode them into model
+            nested record links are resolved up to `depth` levels
+        """
+        rows = [e.model_dump() if isinstance(e, BaseModel) else e for e in items]
+        if (depth <= 0):
+            return decode(model, rows)
+        links = record_links(model)
+        ids: dict[Type[BaseModel], dict[str, Any]] = {}
+        for path, target in links:
+            bucket = ids.setdefault(target, {})
+            def collect(value, bucket=bucket):
+                if (_is_id(value)):
+                    bucket.setdefault(str(value), value)
+                return value
+            for row in rows:
+                _map_path(row, path.split("."), collect)
+        for target, bucket in ids.items():
+            self._fetch(target, list(bucket.values()), depth - 1)
+        for path, _ in links:
+            attach = lambda value: self.identity.get(str(value), value) if _is_id(value) else value
+            rows = [_map_path(row, path.split("."), attach) for row in rows]
+        return decode(model, rows)
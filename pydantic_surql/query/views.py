@@ -0,0 +1,139 @@
+import re
+from datetime import datetime
+from typing import Any, Optional, Type, get_args
+from pydantic import BaseModel, create_model
+
+from ..types import SurQLType, SurQLView, to_surql_literal
+from .builder import OPERATORS, collection_table
+
+"""
+    python types of the view output columns, by SurQL type
+"""
+PYTHON_TYPES: dict[SurQLType, Type] = {
+    SurQLType.STRING: str,
+    SurQLType.NUMBER: float,
+    SurQLType.DATE: datetime,
+    SurQLType.BOOLEAN: bool,
+}
+
+DURATION = re.compile(r"^(\d+(ns|us|µs|ms|s|m|h|d|w|y))+$")
+
+class SurQLViewBuilder:
+    """
+        A typed pre-aggregated view (DEFINE TABLE ... AS SELECT) builder
+        the fields references are checked against the source collection fields definitions
+
+        view = SurQLViewBuilder(Order).group("customer").bucket("created_at", "1d", "day").count("orders").sum("total", "revenue")
+        config = SurQLTableConfig(asView=view.build())
+        OrderStats = view.model("OrderStats")
+    """
+    def __init__(self, model: Type[BaseModel]):
+        self.model_t = model
+        self.table = collection_table(model)
+        self._select: list[str] = []
+        self._where: list[str] = []
+        self._group: list[str] = []
+        self._columns: dict[str, Any] = {}
+
+    def _alias(self, alias: str) -> str:
+        """
+            check an output column name
+        """
+        if (re.fullmatch(r"[A-Za-z_]\w*", alias) is None):
+            raise Exception(f"invalid view column name {alias}")
+        if (alias in self._columns):
+            raise Exception(f"view column {alias} is already defined")
+        return alias
+
+    def _types(self, path: str, expected: Optional[SurQLType] = None) -> list[Any]:
+        """
+            return the types of a source field path, checking its type if expected is set
+        """
+        types = self.table.resolve(path)
+        if (expected is not None and expected not in types and SurQLType.ANY not in types):
+            raise Exception(f"field {path} of table {self.table.name} is not a {expected.value} field")
+        return types
+
+    def group(self, path: str, alias: Optional[str] = None) -> "SurQLViewBuilder":
+        """
+            group the view rows by a source field
+        """
+        types = self._types(path)
+        alias = self._alias(alias or path.replace(".", "_"))
+        self._select.append(path if alias == path else f"{path} AS {alias}")
+        self._group.append(alias)
+        basic = [e for e in types if e is not SurQLType.OPTIONAL]
+        _type = PYTHON_TYPES.get(basic[0], Any) if len(basic) == 1 else Any
+        self._columns[alias] = Optional[_type] if SurQLType.OPTIONAL in types else _type
+        return self
+
+    def bucket(self, path: str, interval: str, alias: str) -> "SurQLViewBuilder":
+        """
+            group the view rows by time buckets of a datetime source field (eg: `1d`, `1h`)
+        """
+        self._types(path, SurQLType.DATE)
+        if (DURATION.fullmatch(interval) is None):
+            raise Exception(f"invalid bucket interval {interval}")
+        alias = self._alias(alias)
+        self._select.append(f"time::floor({path}, {interval}) AS {alias}")
+        self._group.append(alias)
+        self._columns[alias] = datetime
+        return self
+
+    def count(self, alias: str = "count") -> "SurQLViewBuilder":
+        """
+            count the rows of each group
+        """
+        self._select.append(f"count() AS {self._alias(alias)}")
+        self._columns[alias] = int
+        return self
+
+    def sum(self, path: str, alias: str) -> "SurQLViewBuilder":
+        """
+            sum a number source field over each group
+        """
+        self._types(path, SurQLType.NUMBER)
+        self._select.append(f"math::sum({path}) AS {self._alias(alias)}")
+        self._columns[alias] = float
+        return self
+
+    def mean(self, path: str, alias: str) -> "SurQLViewBuilder":
+        """
+            average a number source field over each group
+        """
+        self._types(path, SurQLType.NUMBER)
+        self._select.append(f"math::mean({path}) AS {self._alias(alias)}")
+        self._columns[alias] = float
+        return self
+
+    def where(self, path: str, op: str, value: Any) -> "SurQLViewBuilder":
+        """
+            filter the source rows, the value is inlined as a SurQL literal (views can't use params)
+        """
+        if (op.upper() not in OPERATORS):
+            raise Exception(f"unknown operator {op}")
+        self._types(path)
+        literal = to_surql_literal(value)
+        if (literal is None):
+            raise Exception(f"value {value} of {path} can't be inlined in a view definition")
+        self._where.append(f"{path} {op.upper()} {literal}")
+        return self
+
+    def build(self) -> SurQLView:
+        """
+            return the SurQLView definition
+        """
+        if (len(self._select) == 0):
+            raise Exception("a view must select at least one column")
+        return SurQLView(select=self._select, from_t=[self.table.name], where=self._where, group_by=self._group)
+
+    def model(self, name: str) -> Type[BaseModel]:
+        """
+            return a pydantic read model of the view output rows
+        """
+        # NONE values are omitted from the rows, optional columns default to None
+        columns = {
+            alias: (_type, None if (_type is Any or type(None) in get_args(_type)) else ...)
+            for alias, _type in self._columns.items()
+        }
+        return create_model(name, id=(Optional[Any], None), **columns)
@@ -0,0 +1,26 @@
+from typing import Any, AsyncIterator, Protocol
+
+class SurQLTransport(Protocol):
+    """
+        A pluggable synchronous transport (eg: a surrealdb client wrapper)
+        query returns the records of the last statement
+    """
+    def query(self, query: str, params: dict[str, Any] | None = None) -> list[Any]:
+        ...
+
+class SurQLAsyncTransport(Protocol):
+    """
+        A pluggable asynchronous transport (eg: a surrealdb async client wrapper)
+        query returns the records of the last statement
+    """
+    async def query(self, query: str, params: dict[str, Any] | None = None) -> list[Any]:
+        ...
+
+class SurQLLiveTransport(Protocol):
+    """
+        A pluggable live queries transport (eg: a surrealdb websocket client wrapper)
+        live yields the notifications of a LIVE SELECT (`{"action": "CREATE" | "UPDATE" | "DELETE", "result": ...}`),
+        closing the iterator kills the live query
+    """
+    def live(self, query: str, params: dict[str, Any] | None = None) -> AsyncIterator[dict[str, Any]]:
+        ...
@@ -2,4 +2,8 @@ from .field import *
 from .table import *
 from .indexes import *
 from .event import *
-from .permissions import *
\ No newline at end of file
+from .function import *
+from .partition import *
+from .permissions import *
+from .record_id import *
+from .vector import *
\ No newline at end of file
@@ -1,7 +1,11 @@
-from typing import List, Type, Union, Sequence
+import json
+import threading
+from datetime import datetime
+from weakref import WeakKeyDictionary
+from typing import Any, Callable, List, Type, Union, Sequence
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from pydantic.fields import FieldInfo
 from typing_extensions import TypeAliasType
 
@@ -34,6 +38,29 @@ class SurQLType(Enum):
     ANY_RECORD = "record()"
     OPTIONAL = "option<%s>"
     NULL = "null"
+    VECTOR = "array<float, %s>"
+
+class SurQLEnumEncoding(Enum):
+    """
+        SurQL enum assertions encodings enumeration
+        INLINE: `$value in [...]` in every field definition
+        PARAM: a shared `DEFINE PARAM $enum_x` referenced by the fields
+        TABLE: a lookup table `enum_x` checked with a record link assertion
+    """
+    INLINE = "inline"
+    PARAM = "param"
+    TABLE = "table"
+
+class SurQLRecursionPolicy(Enum):
+    """
+        SurQL recursive models policies enumeration
+        RAISE: a recursive model raises an exception
+        RECORD: the recursive reference is converted to a record link (record<table> for collections, record() otherwise)
+        FLEXIBLE: the recursive model is expanded up to the parser recursionDepth, then cut off as a FLEXIBLE object
+    """
+    RAISE = "raise"
+    RECORD = "record"
+    FLEXIBLE = "flexible"
 
 BASIC_TYPES: list[SurQLType] = [
     SurQLType.STRING,
@@ -50,6 +77,37 @@ COMPLEX_TYPES = [
     SurQLType.RECORD,
 ]
 
+def to_surql_literal(value: Any) -> Optional[str]:
+    """
+        return the SurQL literal of a python default value, None if it can't be expressed as a literal
+    """
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return f'd"{value.isoformat()}"'
+    if (value is None or not isinstance(value, (str, int, float, bool, list, dict))):
+        return None
+    try:
+        # non finite floats (inf, nan) have no SurQL literal
+        return json.dumps(value, allow_nan=False)
+    except (TypeError, ValueError):
+        return None
+
+def enum_values(values: list[Any]) -> str:
+    """
+        return the SurQL list items of an enumeration of values
+    """
+    return ",".join([f'"{value}"' if isinstance(value, str) else str(value) for value in values])
+
+"""
+    sub fields definitions templates of the object types, by object type definition (see SurQLField._object_template)
+    an object type shared by many fields / tables is rendered once, its definition must not be mutated once rendered
+"""
+TEMPLATE_PATH = "__surql_template_path__"
+TEMPLATE_TABLE = "__surql_template_table__"
+OBJECT_TEMPLATES: "WeakKeyDictionary[SurQLField, tuple[str, ...]]" = WeakKeyDictionary()
+TEMPLATES_LOCK = threading.Lock()
+
 RecursiveType = TypeAliasType('RecursiveType', Sequence[Union[SurQLType, 'SurQLField', 'RecursiveType']])
 
 class SurQLField(BaseModel):
@@ -63,6 +121,129 @@ class SurQLField(BaseModel):
     isFlexible: bool = False
     perms: Optional[SurQLPermissions] = None
     assertion: Optional[str] = None
+    dimension: Optional[int] = None
+    default: Optional[str] = None
+    value: Optional[str] = None
+    readonly: bool = False
+    constraints: Optional[list[str]] = None
+    maxItems: Optional[int] = None
+    enumName: Optional[str] = None
+    enumValues: Optional[list[Any]] = None
+    enumEncoding: SurQLEnumEncoding = SurQLEnumEncoding.INLINE
+
+    def enum_assertion(self) -> str:
+        """
+            return the assertion of an enum type definition, according to its encoding
+        """
+        if (self.enumEncoding is SurQLEnumEncoding.PARAM):
+            return f"$value INSIDE ${self.enumName}"
+        if (self.enumEncoding is SurQLEnumEncoding.TABLE):
+            return f'record::exists(type::thing("{self.enumName}", $value))'
+        return self.assertion
+
+    def enum_SDL(self) -> Optional[str]:
+        """
+            return the shared definition of an enum type (DEFINE PARAM or lookup table), None if inlined
+        """
+        if (self.enumEncoding is SurQLEnumEncoding.PARAM):
+            return f"DEFINE PARAM ${self.enumName} VALUE [{enum_values(self.enumValues)}];"
+        if (self.enumEncoding is SurQLEnumEncoding.TABLE):
+            records = ",".join([f"{{id: {enum_values([e])}}}" for e in self.enumValues])
+            return f"DEFINE TABLE {self.enumName} SCHEMAFULL;\nINSERT IGNORE INTO {self.enumName} [{records}];"
+        return None
+
+    @classmethod
+    def enums(cls, types: RecursiveType) -> list["SurQLField"]:
+        """
+            return the enum types definitions with a shared encoding (PARAM / TABLE), recursively
+        """
+        res = []
+        for _type in types:
+            if isinstance(_type, list):
+                res += cls.enums(_type)
+            elif isinstance(_type, cls):
+                if (_type.types == [SurQLType.ENUM]):
+                    if (_type.enumEncoding is not SurQLEnumEncoding.INLINE):
+                        res.append(_type)
+                else:
+                    res += cls.enums(_type.types)
+        return res
+
+    @classmethod
+    def type_string(cls, types: RecursiveType) -> str:
+        """
+            return the SurQL type of a field types definition, without its sub fields (eg: `option<string|number>`)
+        """
+        res = []
+        isOptional = False
+        for _type in types:
+            if (_type in BASIC_TYPES):
+                res += [_type.value]
+            elif isinstance(_type, list):
+                items = _type[1] if _type[0] == SurQLType.SET else _type
+                kind = SurQLType.SET.value if _type[0] == SurQLType.SET else SurQLType.ARRAY.value
+                res += [f"{kind}<{cls.type_string(items)}>"]
+            elif (isinstance(_type, cls)):
+                if (_type.types == [SurQLType.RECORD]):
+                    res += [SurQLType.RECORD.value % _type.recordLink]
+                elif (_type.types == [SurQLType.VECTOR]):
+                    res += [SurQLType.VECTOR.value % _type.dimension]
+                elif (_type.types == [SurQLType.ENUM]):
+                    res += [SurQLType.STRING.value, SurQLType.NUMBER.value]
+                else:
+                    res += [SurQLType.OBJECT.value]
+            elif (_type is SurQLType.OPTIONAL):
+                isOptional = True
+            else:
+                raise Exception(f"Unknown type: {_type}, SDL generation not supported")
+        if (isOptional):
+            return SurQLType.OPTIONAL.value % "|".join(res)
+        return "|".join(res)
+
+    @classmethod
+    def permissions(cls, types: RecursiveType) -> list[SurQLPermissions]:
+        """
+            return the permissions of the fields definitions, recursively
+        """
+        res = []
+        for _type in types:
+            if isinstance(_type, list):
+                res += cls.permissions(_type)
+            elif isinstance(_type, cls):
+                if (_type.perms is not None):
+                    res.append(_type.perms)
+                res += cls.permissions(_type.types)
+        return res
+
+    @classmethod
+    def map_permissions(cls, types: RecursiveType, func: Callable[[SurQLPermissions], SurQLPermissions]) -> RecursiveType:
+        """
+            return a copy of the fields definitions with their permissions mapped by func, recursively
+        """
+        res = []
+        for _type in types:
+            if isinstance(_type, list):
+                res.append(cls.map_permissions(_type, func))
+            elif isinstance(_type, cls) and (len(cls.permissions([_type])) > 0):
+                res.append(_type.model_copy(update={
+                    "perms": func(_type.perms) if _type.perms is not None else None,
+                    "types": cls.map_permissions(_type.types, func),
+                }))
+            else:
+                res.append(_type)
+        return res
+
+    @classmethod
+    def _assert_string(cls, assertions: list[str], constraints: list[str], isOptional: bool) -> Optional[str]:
+        """
+            return a SDL ASSERT clause: enum assertions are joined by OR, constraints by AND
+        """
+        if (len(constraints) == 0):
+            return f"ASSERT ({' OR '.join(assertions)})" if len(assertions) > 0 else None
+        _def = " AND ".join(([f"({' OR '.join(assertions)})"] if len(assertions) > 0 else []) + constraints)
+        if (isOptional):
+            _def = f"$value = NONE OR ({_def})"
+        return f"ASSERT {_def}"
 
     @classmethod
     def _f_string(
@@ -72,19 +253,48 @@ class SurQLField(BaseModel):
         types: str,
         isFlexible: bool,
         assertions: Optional[list[str]] = None,
-        perms: Optional[SurQLPermissions] = None
+        perms: Optional[SurQLPermissions] = None,
+        source: Optional["SurQLField"] = None,
+        isOptional: bool = False
     ):
         """
             return a SDL field definition string
+            source is the field definition holding the DEFAULT / READONLY / VALUE / constraints options
         """
         return " ".join(e for e in [
             f"DEFINE FIELD {field} ON TABLE {table} {'FLEXIBLE ' if isFlexible else ''}TYPE {types}",
-            f"ASSERT ({' OR '.join(assertions)})" if assertions is not None and len(assertions) > 0 else None,
+            f"DEFAULT {source.default}" if source is not None and source.default is not None else None,
+            "READONLY" if source is not None and source.readonly else None,
+            f"VALUE {source.value}" if source is not None and source.value is not None else None,
+            cls._assert_string(assertions or [], (source.constraints or []) if source is not None else [], isOptional),
             perms.SDL() if perms is not None else None
         ] if e != None) + ";"
 
     @classmethod
-    def _surqlFromTypes(cls, table_name: str, field_name: str, types: List[Type], perms: Optional[SurQLPermissions] = None) -> list[str]:
+    def _object_template(cls, _type: "SurQLField") -> tuple[str, ...]:
+        """
+            return the sub fields definitions of an object type, rendered once with placeholder path and table names
+        """
+        template = OBJECT_TEMPLATES.get(_type)
+        if (template is None):
+            lines = []
+            for _field in _type.types:
+                _perms = getattr(_field, "perms", None)
+                lines += cls._surqlFromTypes(TEMPLATE_TABLE, f"{TEMPLATE_PATH}.{_field.name}", _field.types, _perms, _field)
+            template = tuple(lines)
+            with TEMPLATES_LOCK:
+                OBJECT_TEMPLATES[_type] = template
+        return template
+
+    @classmethod
+    def _surqlFromTypes(
+        cls,
+        table_name: str,
+        field_name: str,
+        types: List[Type],
+        perms: Optional[SurQLPermissions] = None,
+        source: Optional["SurQLField"] = None
+    ) -> list[str]:
         """
             return SDLS fields definitions recursively
             TODO: remove duplicates (eg: when a field is defined as int | float)
@@ -95,43 +305,76 @@ class SurQLField(BaseModel):
         assertions = []
         isOptional = False
         isFlexible = False
+        maxItems = source.maxItems if source is not None else None
         for _type in types:
             if (_type in BASIC_TYPES):
                 res += [_type.value]
             # if (_type is SurQLType.ENUM):
             #     res += []
             elif isinstance(_type, list):
+                items = _type[1] if _type[0] == SurQLType.SET else _type
+                kind = SurQLType.SET.value if _type[0] == SurQLType.SET else SurQLType.ARRAY.value
+                if (maxItems is not None):
+                    inner = "|".join([e.value for e in items]) if all(e in BASIC_TYPES for e in items) else SurQLType.ANY.value
+                    res += [f"{kind}<{inner}, {maxItems}>"]
+                else:
+                    res += [kind]
                 if (_type[0] == SurQLType.SET):
-                    res += [SurQLType.SET.value]
                     nextFields += cls._surqlFromTypes(table_name, f"{field_name}.*", _type[1])
                 else:
-                    res += [SurQLType.ARRAY.value]
                     _perms = getattr(_type, "perms", None)
                     nextFields += cls._surqlFromTypes(table_name, f"{field_name}.*", _type, _perms)
             elif (isinstance(_type, cls)):
                 if (_type.types == [SurQLType.RECORD]):
                     res += [SurQLType.RECORD.value % _type.recordLink]
+                elif (_type.types == [SurQLType.VECTOR]):
+                    res += [SurQLType.VECTOR.value % _type.dimension]
                 elif (_type.types == [SurQLType.ENUM]):
                     res += [SurQLType.STRING.value, SurQLType.NUMBER.value]
-                    assertions += [_type.assertion]
+                    assertions += [_type.enum_assertion()]
                 else:
                     res += [SurQLType.OBJECT.value]
                     isFlexible = _type.isFlexible
-                    for _field in _type.types:
-                        _perms = getattr(_field, "perms", None)
-                        nextFields += cls._surqlFromTypes(table_name, f"{field_name}.{_field.name}", _field.types, _perms)
+                    nextFields += [
+                        line.replace(TEMPLATE_PATH, field_name).replace(TEMPLATE_TABLE, table_name)
+                        for line in cls._object_template(_type)
+                    ]
             elif (_type is SurQLType.OPTIONAL):
                 isOptional = True
             else:
                 raise Exception(f"Unknown type: {_type}, SDL generation not supported")
         if (isOptional):
-            return [cls._f_string(field_name, table_name, SurQLType.OPTIONAL.value % "|".join(res), isFlexible, assertions, perms)] + nextFields
-        return [cls._f_string(field_name, table_name, "|".join(res), isFlexible, assertions, perms)] + nextFields
+            return [cls._f_string(field_name, table_name, SurQLType.OPTIONAL.value % "|".join(res), isFlexible, assertions, perms, source, isOptional)] + nextFields
+        return [cls._f_string(field_name, table_name, "|".join(res), isFlexible, assertions, perms, source, isOptional)] + nextFields
 
 
+    @classmethod
+    def child_types(cls, types: RecursiveType, name: str) -> RecursiveType | None:
+        """
+            return the types of the `name` sub field of a field types definition
+            `*` selects the items of an array / set, None is returned if the sub field is not defined
+        """
+        res = []
+        for _type in types:
+            if (_type is SurQLType.ANY):
+                res += [SurQLType.ANY]
+            elif isinstance(_type, list):
+                items = _type[1] if (len(_type) > 0 and _type[0] == SurQLType.SET) else _type
+                if (name == "*"):
+                    res += items
+                else:
+                    res += cls.child_types(items, name) or []
+            elif (isinstance(_type, cls) and all(isinstance(e, cls) and e.name is not None for e in _type.types)):
+                match = [e for e in _type.types if e.name == name]
+                for _field in match:
+                    res += _field.types
+                if (len(match) == 0 and _type.isFlexible):
+                    res += [SurQLType.ANY]
+        return res if len(res) > 0 else None
+
     def SDL(self, table_name: str) -> List[str]:
         """return a SDL field definition"""
-        fieldTypes = SurQLField._surqlFromTypes(table_name, self.name, self.types, self.perms)
+        fieldTypes = SurQLField._surqlFromTypes(table_name, self.name, self.types, self.perms, self)
         return "\n".join(fieldTypes)
 
 
@@ -144,14 +387,50 @@ class SurQLFieldInfo(FieldInfo):
         A pydantic SurQL field info definition
     """
     perms: Optional[SurQLPermissions] = None
+    defaultSDL: Optional[str] = None
+    valueSDL: Optional[str] = None
+    readonly: bool = False
+    enumEncoding: Optional[SurQLEnumEncoding] = None
 
-    def __init__(self, perms: Optional[SurQLPermissions], **kwargs):
+    def __init__(
+        self,
+        perms: Optional[SurQLPermissions],
+        defaultSDL: Optional[str] = None,
+        valueSDL: Optional[str] = None,
+        readonly: bool = False,
+        enumEncoding: Optional[SurQLEnumEncoding] = None,
+        **kwargs
+    ):
         super().__init__(**kwargs)
         self.perms = perms
+        self.defaultSDL = defaultSDL
+        self.valueSDL = valueSDL
+        self.readonly = readonly
+        self.enumEncoding = enumEncoding
 
-def SurQLFieldConfig(permissions: Optional[SurQLPermissions] = None, **kwargs) -> SurQLFieldInfo:
+def SurQLFieldConfig(
+    permissions: Optional[SurQLPermissions] = None,
+    defaultSDL: Optional[str] = None,
+    valueSDL: Optional[str] = None,
+    readonly: bool = False,
+    enumEncoding: Optional[SurQLEnumEncoding] = None,
+    **kwargs
+) -> SurQLFieldInfo:
     """
         A pydantic SurQL field config definition
+        defaultSDL / valueSDL are SurQL expressions (DEFAULT / VALUE clauses), a literal pydantic default maps to DEFAULT
+        enumEncoding overrides the parser enum encoding of the field enum types
         TODO: find a way to map Field arguments for proper type hints (see: https://stackoverflow.com/questions/1409295/set-function-signature-in-python)
     """
-    return SurQLFieldInfo(permissions, **kwargs)
\ No newline at end of file
+    return SurQLFieldInfo(permissions, defaultSDL, valueSDL, readonly, enumEncoding, **kwargs)
+
+def SurQLComputedField(valueSDL: str, **kwargs) -> Callable[[Any], Any]:
+    """
+        A pydantic computed_field computed by the database (VALUE clause)
+        the field is defined on the table and skipped when serializing instances
+    """
+    def inner(func: Any):
+        getter = func.fget if isinstance(func, property) else func
+        getter.__surql_value__ = valueSDL
+        return computed_field(func, **kwargs)
+    return inner
@@ -0,0 +1,99 @@
+import hashlib
+import re
+import textwrap
+from pydantic import BaseModel, Field
+
+PREDICATE_KEYWORDS = {
+    "AND", "OR", "NOT", "IS", "IN", "INSIDE", "NOTINSIDE", "CONTAINS", "CONTAINSNOT", "CONTAINSALL",
+    "CONTAINSANY", "CONTAINSNONE", "ALLINSIDE", "ANYINSIDE", "NONEINSIDE", "TRUE", "FALSE", "NONE", "NULL"
+}
+"""
+    statements keywords, a predicate using them (eg: a sub query) has its own scopes and is not hoisted
+"""
+STATEMENT_KEYWORDS = {
+    "SELECT", "VALUE", "FROM", "WHERE", "GROUP", "ORDER", "LIMIT", "START", "FETCH", "SPLIT", "OMIT", "AS", "ONLY",
+    "LET", "RETURN", "IF", "THEN", "ELSE", "END", "CREATE", "UPDATE", "UPSERT", "DELETE", "RELATE", "INSERT"
+}
+"""
+    params passed through to a function from its caller, a predicate using other params (eg: `$value`, `$before`) is not hoisted
+"""
+CALLER_PARAMS = {"auth", "session", "token", "access"}
+"""
+    graph edges tokens, a predicate traversing the graph is not hoisted
+"""
+GRAPH_EDGES = {"->", "<-"}
+FUNCTION_CALLS = re.compile(r"fn::(\w+(?:::\w+)*)\s*\(")
+PREDICATE_TOKENS = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|\$[A-Za-z_][\w.]*|\d[\w.]*|[A-Za-z_]\w*(?:::\w+)*|.)""", re.S)
+
+class SurQLFunction(BaseModel):
+    """
+        A pydantic SurQL function definition (eg: `DEFINE FUNCTION fn::name($a: string) { ... };`)
+        args maps the arguments names (without `$`) to their SurQL types
+        TODO: check name is not a reserved keyword
+    """
+    name: str = Field(min_length=1, pattern=r"^[A-Za-z_][\w:]*$")
+    args: dict[str, str] = {}
+    body: str = Field(min_length=1)
+
+    def dependencies(self) -> list[str]:
+        """
+            return the names of the functions called by the function body
+        """
+        return [e for e in dict.fromkeys(FUNCTION_CALLS.findall(self.body)) if e != self.name]
+
+    def call(self, *args: str) -> str:
+        """
+            return a SurQL call expression of the function
+        """
+        assert len(args) == len(self.args), f"fn::{self.name} expects {len(self.args)} arguments"
+        return f"fn::{self.name}({', '.join(args)})"
+
+    def SDL(self) -> str:
+        """
+            return a SDL function definition
+        """
+        args = ", ".join([f"${name}: {_type}" for name, _type in self.args.items()])
+        body = "\n".join([f"    {line}" for line in textwrap.dedent(self.body).strip().splitlines()])
+        return f"DEFINE FUNCTION fn::{self.name}({args}) {{\n{body}\n}};"
+
+def is_hoistable(predicate: str) -> bool:
+    """
+        check if a predicate is a plain expression that can be moved to a function:
+        no sub query or statement, no graph traversal and no params other than CALLER_PARAMS
+    """
+    tokens = PREDICATE_TOKENS.findall(predicate)
+    return (
+        all(token.upper() not in STATEMENT_KEYWORDS for token in tokens)
+        and all(token[1:].split(".")[0] in CALLER_PARAMS for token in tokens if token.startswith("$"))
+        and all("".join(tokens[idx:idx + 2]) not in GRAPH_EDGES for idx in range(len(tokens)))
+    )
+
+def document_predicate(predicate: str) -> str:
+    """
+        rewrite the document fields of a predicate as `$doc` fields (eg: `user = $auth.id` -> `$doc.user = $auth.id`)
+        params, strings, keywords, functions and record ids are kept
+    """
+    tokens = PREDICATE_TOKENS.findall(predicate)
+    res = []
+    for idx, token in enumerate(tokens):
+        following = "".join(tokens[idx + 1:idx + 3]).lstrip()
+        is_ident = re.fullmatch(r"[A-Za-z_]\w*", token) is not None
+        is_path = len(res) > 0 and res[-1].endswith((".", ":"))
+        if (
+            is_ident and not is_path
+            and token.upper() not in PREDICATE_KEYWORDS
+            and token.upper() not in STATEMENT_KEYWORDS
+            and not following.startswith("(")
+            and not following.startswith(":")
+        ):
+            res.append(f"$doc.{token}")
+        else:
+            res.append(token)
+    return "".join(res)
+
+def permission_function(predicate: str) -> SurQLFunction:
+    """
+        return the shared function of a permission predicate, named after the predicate hash
+    """
+    digest = hashlib.sha1(predicate.encode()).hexdigest()[:8]
+    return SurQLFunction(name=f"perm_{digest}", args={"doc": "object"}, body=f"RETURN {document_predicate(predicate)};")
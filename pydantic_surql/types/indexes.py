@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import LiteralString
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 import re
 
 class SurQLTokenizers(Enum):
@@ -33,6 +33,35 @@ SNOWBALL_LANG: LiteralString = "|".join([
 ])
 RE = re.compile(fr"^snowball\(({SNOWBALL_LANG})\)|ascii|lowercase|uppercase|edgengram\(\d+,\d+\)$")
 
+class SurQLVectorAlgorithm(Enum):
+    """
+        SurQL vector indexes algorithms enumeration
+    """
+    MTREE = "MTREE"
+    HNSW = "HNSW"
+
+class SurQLVectorDistance(Enum):
+    """
+        SurQL vector indexes distances enumeration
+    """
+    CHEBYSHEV = "CHEBYSHEV"
+    COSINE = "COSINE"
+    EUCLIDEAN = "EUCLIDEAN"
+    HAMMING = "HAMMING"
+    JACCARD = "JACCARD"
+    MANHATTAN = "MANHATTAN"
+    PEARSON = "PEARSON"
+
+class SurQLVectorType(Enum):
+    """
+        SurQL vector indexes elements types enumeration
+    """
+    F64 = "F64"
+    F32 = "F32"
+    I64 = "I64"
+    I32 = "I32"
+    I16 = "I16"
+
 class SurQLAnalyzer(BaseModel):
     """
         A pydantic SurQL analyzer definition
@@ -121,4 +150,40 @@ class SurQLSearchIndex(SurQLIndex):
             self.analyzer.name,
             f"BM25({self.bm25[0]},{self.bm25[1]})" if self.bm25 else None,
             "HIGHLIGHTS" if self.highlights else None,
-        ]
\ No newline at end of file
+        ]
+
+class SurQLVectorIndex(SurQLIndex):
+    """
+        A pydantic SurQL vector (MTREE / HNSW) index definition
+        capacity is a MTREE parameter, efc and m are HNSW parameters
+    """
+    dimension: int = Field(gt=0)
+    algorithm: SurQLVectorAlgorithm = SurQLVectorAlgorithm.HNSW
+    distance: SurQLVectorDistance = SurQLVectorDistance.EUCLIDEAN
+    vectorType: SurQLVectorType | None = None
+    capacity: int | None = Field(default=None, gt=0)
+    efc: int | None = Field(default=None, gt=0)
+    m: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode='after')
+    def validate_vector_index(self):
+        assert len(self.fields) == 1, "vector index %s must be defined on a single field" % self.name
+        if (self.algorithm is SurQLVectorAlgorithm.MTREE):
+            assert self.efc is None and self.m is None, "efc and m are HNSW parameters"
+        else:
+            assert self.capacity is None, "capacity is a MTREE parameter"
+        return self
+
+    def baseSDL(self, table_name: str) -> list[str]:
+        """
+            return a SDL vector index definition list of terms
+        """
+        return super().baseSDL(table_name) + [
+            self.algorithm.value,
+            f"DIMENSION {self.dimension}",
+            f"DIST {self.distance.value}",
+            f"TYPE {self.vectorType.value}" if self.vectorType is not None else None,
+            f"CAPACITY {self.capacity}" if self.capacity is not None else None,
+            f"EFC {self.efc}" if self.efc is not None else None,
+            f"M {self.m}" if self.m is not None else None,
+        ]
@@ -0,0 +1,72 @@
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel, Field, model_validator
+
+class SurQLPartitionInterval(Enum):
+    """
+        SurQL time partitions intervals enumeration (value is the table suffix format)
+    """
+    DAY = "%Y_%m_%d"
+    MONTH = "%Y_%m"
+    YEAR = "%Y"
+
+class SurQLPartitioning(BaseModel):
+    """
+        A pydantic SurQL time partitioning definition
+        a collection is expanded into a family of time bucketed tables (eg: events_2026_10, events_2026_11, ...)
+        the partitions overlapping [start, end) are defined in the SDL
+    """
+    field: str = Field(min_length=1, description="datetime field used to route the records")
+    interval: SurQLPartitionInterval = Field(default=SurQLPartitionInterval.MONTH)
+    start: datetime
+    end: datetime
+
+    @model_validator(mode='after')
+    def validate_partitioning(self):
+        assert self.start < self.end, "partitioning start must be before end"
+        return self
+
+    def bucket(self, value: datetime) -> datetime:
+        """
+            return the start of the partition containing value
+        """
+        if (self.interval is SurQLPartitionInterval.DAY):
+            return datetime(value.year, value.month, value.day, tzinfo=value.tzinfo)
+        if (self.interval is SurQLPartitionInterval.MONTH):
+            return datetime(value.year, value.month, 1, tzinfo=value.tzinfo)
+        return datetime(value.year, 1, 1, tzinfo=value.tzinfo)
+
+    def next_bucket(self, bucket: datetime) -> datetime:
+        """
+            return the start of the partition following bucket
+        """
+        if (self.interval is SurQLPartitionInterval.DAY):
+            return datetime.fromordinal(bucket.toordinal() + 1).replace(tzinfo=bucket.tzinfo)
+        if (self.interval is SurQLPartitionInterval.MONTH):
+            return bucket.replace(year=bucket.year + bucket.month // 12, month=bucket.month % 12 + 1)
+        return bucket.replace(year=bucket.year + 1)
+
+    def contains(self, value: datetime) -> bool:
+        """
+            check if value is in the declared range [start, end)
+        """
+        return self.start <= value < self.end
+
+    def buckets(self, start: datetime | None = None, end: datetime | None = None) -> list[datetime]:
+        """
+            return the partitions starts overlapping [start, end), clamped to the declared range
+        """
+        start = self.start if start is None else max(start, self.start)
+        end = self.end if end is None else min(end, self.end)
+        res = []
+        bucket = self.bucket(start)
+        while bucket < end:
+            res.append(bucket)
+            bucket = self.next_bucket(bucket)
+        return res
+
+    def suffix(self, bucket: datetime) -> str:
+        """
+            return the table suffix of a partition
+        """
+        return bucket.strftime(self.interval.value)
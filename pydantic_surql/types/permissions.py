@@ -17,6 +17,39 @@ class SurQLPermissions(BaseModel):
         _def = '\n'.join([f"        {e}" for e in definitions])
         return f"FOR {term}\n{_def}"
 
+    def terms(self) -> list[list[str]]:
+        """
+            return the defined permission terms definitions
+        """
+        return [e for e in [self.select, self.create, self.update, self.delete] if e is not None]
+
+    @staticmethod
+    def predicate(definitions: list[str]) -> str | None:
+        """
+            return the predicate of a `WHERE ...` permission term, None for FULL / NONE terms
+        """
+        _def = " ".join([e.strip() for e in definitions])
+        if (not _def.upper().startswith("WHERE ")):
+            return None
+        return _def[6:].strip()
+
+    def hoist(self, calls: dict[str, str]) -> "SurQLPermissions":
+        """
+            return a copy of the permissions where the hoisted predicates are replaced by their function call
+            calls maps the predicates to their call expression
+        """
+        def _hoist(definitions: list[str] | None) -> list[str] | None:
+            if (definitions is None):
+                return None
+            call = calls.get(self.predicate(definitions))
+            return [f"WHERE {call}"] if call is not None else definitions
+        return self.model_copy(update={
+            "select": _hoist(self.select),
+            "create": _hoist(self.create),
+            "update": _hoist(self.update),
+            "delete": _hoist(self.delete),
+        })
+
     def SDL(self):
         _def = [
             "PERMISSIONS",
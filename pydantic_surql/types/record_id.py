@@ -0,0 +1,90 @@
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Annotated, Any, Literal, Union
+from pydantic import BaseModel, Field
+
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+def ulid() -> str:
+    """
+        return a new ULID (48 bits milliseconds timestamp + 80 random bits, crockford base32)
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    return "".join(CROCKFORD[(value >> shift) & 0x1F] for shift in range(125, -1, -5))
+
+def uuid7() -> str:
+    """
+        return a new UUIDv7 (48 bits milliseconds timestamp, version 7, RFC 4122 variant, random bits)
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return str(uuid.UUID(int=value))
+
+def _value_at(instance: BaseModel, path: str) -> Any:
+    """
+        return the value of a field path of an instance
+    """
+    value = instance
+    for name in path.split("."):
+        value = getattr(value, name)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+class SurQLRecordId(BaseModel, ABC):
+    """
+        A pydantic SurQL record id strategy definition
+        random strategies keep the id already set on an instance, a model without an `id` field gets a new id on each call
+    """
+    @abstractmethod
+    def generate(self, instance: BaseModel) -> Any:
+        """
+            return the record id of an instance
+        """
+
+class SurQLCompositeId(SurQLRecordId):
+    """
+        A composite (array) record id built from the model fields (eg: `table:[tenant, ts]`)
+        records sharing a prefix are range scannable without a secondary index
+    """
+    strategy: Literal["composite"] = "composite"
+    fields: list[str] = Field(min_length=1)
+
+    def generate(self, instance: BaseModel) -> list[Any]:
+        """
+            return the array record id of an instance
+        """
+        return [_value_at(instance, field) for field in self.fields]
+
+class SurQLUlidId(SurQLRecordId):
+    """
+        A ULID record id (time ordered, range scannable)
+    """
+    strategy: Literal["ulid"] = "ulid"
+
+    def generate(self, instance: BaseModel) -> str:
+        """
+            return the ULID record id of an instance
+        """
+        return getattr(instance, "id", None) or ulid()
+
+class SurQLUuid7Id(SurQLRecordId):
+    """
+        A UUIDv7 record id (time ordered, range scannable)
+    """
+    strategy: Literal["uuid7"] = "uuid7"
+
+    def generate(self, instance: BaseModel) -> str:
+        """
+            return the UUIDv7 record id of an instance
+        """
+        return getattr(instance, "id", None) or uuid7()
+
+"""
+    the record id strategies, discriminated by their strategy name
+"""
+SurQLRecordIdStrategy = Annotated[Union[SurQLCompositeId, SurQLUlidId, SurQLUuid7Id], Field(discriminator="strategy")]
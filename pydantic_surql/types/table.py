@@ -1,9 +1,14 @@
-from pydantic import BaseModel, Field, field_validator
+import threading
+from datetime import datetime
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 
 from .event import SurQLEvent
-from .field import SurQLField
-from .indexes import SurQLAnalyzer, SurQLIndex
+from .field import RecursiveType, SurQLField, SurQLType
+from .function import SurQLFunction, is_hoistable, permission_function
+from .indexes import SurQLAnalyzer, SurQLIndex, SurQLVectorIndex
+from .partition import SurQLPartitioning
 from .permissions import SurQLPermissions
+from .record_id import SurQLCompositeId, SurQLRecordIdStrategy
 
 class SurQLView(BaseModel):
     """
@@ -25,11 +30,33 @@ class SurQLView(BaseModel):
             ','.join(self.from_t),
         ]
         if (len(self.where) > 0):
-            _def += ["WHERE", ','.join(self.where)]
+            _def += ["WHERE", ' AND '.join(self.where)]
         if (len(self.group_by) > 0):
             _def += ["GROUP BY", ','.join(self.group_by)]
         return " ".join(_def)
 
+class SurQLRelation(BaseModel):
+    """
+        A pydantic SurQL relation (graph edge) table definition
+    """
+    inTables: list[str] = Field(min_length=1, description="tables allowed as relation origin")
+    outTables: list[str] = Field(min_length=1, description="tables allowed as relation destination")
+    enforced: bool = Field(default=False, description="check that the related records exist")
+
+    def SDL(self) -> str:
+        """
+            return a SDL relation type definition
+        """
+        _def = [
+            "TYPE RELATION IN",
+            "|".join(self.inTables),
+            "OUT",
+            "|".join(self.outTables),
+        ]
+        if (self.enforced):
+            _def += ["ENFORCED"]
+        return " ".join(_def)
+
 class SurQLTableConfig(BaseModel):
     """
         A pydantic SurQL table configuration definition
@@ -44,6 +71,9 @@ class SurQLTableConfig(BaseModel):
     indexes: list[SurQLIndex] = Field(default=[], description="table indexes definitions")
     events: list[SurQLEvent] = Field(default=[], description="table events definitions")
     permissions: SurQLPermissions | None = Field(default=None, description="table permissions definitions")
+    recordId: SurQLRecordIdStrategy | None = Field(default=None, description="record id strategy, generated when serializing instances")
+    partitioning: SurQLPartitioning | None = Field(default=None, description="time partitioning definition")
+    relation: SurQLRelation | None = Field(default=None, description="relation (graph edge) table definition")
 
     @field_validator("indexes")
     @classmethod
@@ -55,6 +85,11 @@ class SurQLTableConfig(BaseModel):
         return v
 
 
+"""
+    placeholder table name of the partitions SDL template
+"""
+PARTITION_PLACEHOLDER = "__surql_partition__"
+
 class SurQLTable(BaseModel):
     """
         A pydantic SurQL table definition
@@ -63,6 +98,124 @@ class SurQLTable(BaseModel):
     name: str = Field(min_length=1)
     fields: list[SurQLField]
     config: SurQLTableConfig = SurQLTableConfig()
+    _template: str | None = PrivateAttr(default=None)
+    _root: tuple[str, RecursiveType] | None = PrivateAttr(default=None)
+    _resolved: dict[tuple[str, str], RecursiveType] = PrivateAttr(default_factory=dict)
+
+    def resolve(self, path: str) -> RecursiveType:
+        """
+            return the types of a field path (eg: `details.address`, `tags.*`)
+            raise an exception if the path is not defined on the table
+            the resolved paths are memoized per table (the table definition must not be mutated once resolved)
+        """
+        key = (self.name, path)
+        types = self._resolved.get(key)
+        if (types is not None):
+            return types
+        if (self._root is None or self._root[0] != self.name):
+            _id = SurQLField.model_construct(name="id", types=[
+                SurQLField.model_construct(name=None, types=[SurQLType.RECORD], recordLink=self.name)
+            ])
+            self._root = (self.name, [SurQLField.model_construct(name=None, types=[_id, *self.fields], isFlexible=not self.config.strict)])
+        types = self._root[1]
+        for name in path.split("."):
+            types = SurQLField.child_types(types, name)
+            if (types is None):
+                raise Exception(f"field {path} is not defined on table {self.name}")
+        self._resolved[key] = types
+        return types
+
+    @model_validator(mode='after')
+    def validate_record_id(self):
+        """
+            check that the record id strategy fields are defined on the table
+        """
+        if isinstance(self.config.recordId, SurQLCompositeId):
+            for path in self.config.recordId.fields:
+                self.resolve(path)
+        return self
+
+    @model_validator(mode='after')
+    def validate_partitioning(self):
+        """
+            check that the partitioning field is a datetime field of the table
+        """
+        if (self.config.partitioning is not None):
+            assert SurQLType.DATE in self.resolve(self.config.partitioning.field), "partitioning field must be a datetime"
+        return self
+
+    @model_validator(mode='after')
+    def validate_vector_indexes(self):
+        """
+            check that the vector indexes dimension matches their field array<float, N> type
+        """
+        for index in self.config.indexes:
+            if (not isinstance(index, SurQLVectorIndex)):
+                continue
+            types = self.resolve(index.fields[0])
+            if (SurQLType.ANY in types):
+                continue
+            dimensions = [e.dimension for e in types if isinstance(e, SurQLField) and e.dimension is not None]
+            assert len(dimensions) > 0, f"vector index {index.name} field {index.fields[0]} is not a vector (array<float, N>)"
+            assert index.dimension in dimensions, f"vector index {index.name} dimension {index.dimension} doesn't match its field dimension {dimensions[0]}"
+        return self
+
+    def partition(self, value: datetime) -> str:
+        """
+            return the name of the partition table containing value
+            raise an exception if value is outside of the declared range (its partition is not defined)
+        """
+        partitioning = self.config.partitioning
+        if (partitioning is None):
+            raise Exception(f"table {self.name} is not partitioned")
+        if (not partitioning.contains(value)):
+            raise Exception(f"{value} is outside of the {self.name} partitions range [{partitioning.start}, {partitioning.end})")
+        return f"{self.name}_{partitioning.suffix(partitioning.bucket(value))}"
+
+    def partitions(self, start: datetime | None = None, end: datetime | None = None) -> list[str]:
+        """
+            return the names of the partition tables overlapping [start, end), clamped to the declared range
+        """
+        partitioning = self.config.partitioning
+        if (partitioning is None):
+            raise Exception(f"table {self.name} is not partitioned")
+        return [f"{self.name}_{partitioning.suffix(bucket)}" for bucket in partitioning.buckets(start, end)]
+
+    def enums(self) -> list[SurQLField]:
+        """
+            return the enum types of the table fields with a shared definition (DEFINE PARAM / lookup table)
+        """
+        return SurQLField.enums(self.fields)
+
+    def permissions(self) -> list[SurQLPermissions]:
+        """
+            return the table and fields permissions definitions
+        """
+        res = [self.config.permissions] if self.config.permissions is not None else []
+        return res + SurQLField.permissions(self.fields)
+
+    def hoist_permissions(self, calls: dict[str, str]) -> "SurQLTable":
+        """
+            return a copy of the table where the hoisted permission predicates are replaced by their function call
+        """
+        config = self.config
+        if (config.permissions is not None):
+            config = config.model_copy(update={"permissions": config.permissions.hoist(calls)})
+        fields = SurQLField.map_permissions(self.fields, lambda perms: perms.hoist(calls))
+        table = self.model_copy(update={"config": config, "fields": fields})
+        table._template = None
+        table._root = None
+        table._resolved = {}
+        return table
+
+    def _partition_template(self) -> str:
+        """
+            return the SDL of a partition, rendered once with a placeholder table name
+        """
+        if (self._template is None):
+            config = self.config.model_copy(update={"partitioning": None})
+            self._template = self.model_copy(update={"name": PARTITION_PLACEHOLDER, "config": config}).SDL()
+        return self._template
 
     def _table_def(self):
         """return a SDL schemafull table definition"""
@@ -76,6 +229,7 @@ class SurQLTable(BaseModel):
             _def += [
                 "DROP" if self.config.drop else None,
                 "SCHEMAFULL" if self.config.strict else "SCHEMALESS",
+                self.config.relation.SDL() if self.config.relation is not None else None,
                 f"CHANGEFEED {self.config.changeFeed}" if self.config.changeFeed is not None else None,
             ]
             _def = [e for e in _def if e is not None]
@@ -85,6 +239,9 @@ class SurQLTable(BaseModel):
 
     def SDL(self):
         """return a SDL table definition with all the fields SDL definitions"""
+        if (self.config.partitioning is not None):
+            template = self._partition_template()
+            return "\n\n".join([template.replace(PARTITION_PLACEHOLDER, name) for name in self.partitions()])
         res = [self._table_def()]
         if (self.config.asView is None):
             for field in self.fields:
@@ -95,12 +252,40 @@ class SurQLTable(BaseModel):
                 res.append(event.SDL(self.name))
         return "\n".join(res)
 
+class SurQLRegistrationError(Exception):
+    """
+        raised when a definition name is registered twice in a metadata registry
+    """
+
+"""
+    namespaces and databases names allowed in USE statements
+"""
+SCOPE_IDENTIFIER = r"^[A-Za-z0-9_]+$"
+
+def use_statement(namespace: str | None, database: str | None) -> str | None:
+    """
+        return the USE statement of a namespace and / or database, None if both are None
+    """
+    _def = ["USE"]
+    if (namespace is not None):
+        _def += ["NS", namespace]
+    if (database is not None):
+        _def += ["DB", database]
+    return " ".join(_def) + ";" if len(_def) > 1 else None
+
 class SurQLMetadata(BaseModel):
     """
         A simple mapper to store all the SurQL tables definitions generated from pydantic models through the decorator @surql_collection
+        a registry scoped to a namespace / database emits its definitions in a USE block
+        the register methods are thread safe, they swap new lists (immutable snapshots) so a concurrent collect never sees a partial write
     """
     tables: list[SurQLTable] = []
     analyzers: list[SurQLAnalyzer] = []
+    functions: list[SurQLFunction] = []
+    hoistPermissions: bool = Field(default=False, description="define the permission predicates used more than once as shared functions")
+    namespace: str | None = Field(default=None, pattern=SCOPE_IDENTIFIER, description="namespace of the definitions (USE NS)")
+    database: str | None = Field(default=None, pattern=SCOPE_IDENTIFIER, description="database of the definitions (USE DB)")
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
 
     @field_validator("tables")
     @classmethod
@@ -111,20 +296,147 @@ class SurQLMetadata(BaseModel):
         assert len(v) == len(set([table.name for table in v])), "tables names must be unique"
         return v
 
+    @field_validator("functions")
+    @classmethod
+    def functions_validator(cls, v):
+        """
+            validate functions
+        """
+        assert len(v) == len(set([function.name for function in v])), "functions names must be unique"
+        return v
+
+    def register(self, table: SurQLTable):
+        """
+            register a table definition and its analyzers
+        """
+        with self._lock:
+            if any(e.name == table.name for e in self.tables):
+                raise SurQLRegistrationError(f"table {table.name} is already registered")
+            analyzers = [index.analyzer for index in table.config.indexes if getattr(index, "analyzer", None) is not None]
+            names = set([a.name for a in self.analyzers])
+            news = []
+            for analyzer in analyzers:
+                if (analyzer.name not in names):
+                    names.add(analyzer.name)
+                    news.append(analyzer)
+            self.analyzers = [*self.analyzers, *news]
+            self.tables = [*self.tables, table]
+
+    def register_function(self, function: SurQLFunction):
+        """
+            register a function definition
+        """
+        with self._lock:
+            if any(e.name == function.name for e in self.functions):
+                raise SurQLRegistrationError(f"function fn::{function.name} is already registered")
+            self.functions = [*self.functions, function]
+
+    def unregister(self, tables: list[str] = [], functions: list[str] = []):
+        """
+            remove tables and functions definitions, the analyzers only used by the removed tables are removed
+        """
+        with self._lock:
+            self.tables = [e for e in self.tables if e.name not in tables]
+            self.functions = [e for e in self.functions if e.name not in functions]
+            names = set([
+                index.analyzer.name for table in self.tables for index in table.config.indexes
+                if getattr(index, "analyzer", None) is not None
+            ])
+            self.analyzers = [e for e in self.analyzers if e.name in names]
+
     def clear(self):
         """
             clear all the tables definitions
         """
-        self.tables = []
-        self.analyzers = []
+        with self._lock:
+            self.tables = []
+            self.analyzers = []
+            self.functions = []
 
-    def collect(self):
+    def ordered_functions(self) -> list[SurQLFunction]:
         """
-            return a SDL string with all the tables definitions
+            return the functions definitions in dependency order (the called functions first)
+            the calls to functions not defined through the metadata are ignored
         """
-        res = []
+        functions = {function.name: function for function in self.functions}
+        res: list[SurQLFunction] = []
+        visiting: set[str] = set()
+        def visit(function: SurQLFunction):
+            if (function in res):
+                return
+            if (function.name in visiting):
+                raise Exception(f"fn::{function.name} has a cyclic dependency")
+            visiting.add(function.name)
+            for name in function.dependencies():
+                if (name in functions):
+                    visit(functions[name])
+            visiting.discard(function.name)
+            res.append(function)
+        for function in self.functions:
+            visit(function)
+        return res
+
+    def permission_functions(self) -> dict[str, SurQLFunction]:
+        """
+            return the shared functions of the permission predicates used more than once, by predicate
+            the predicates with sub queries are kept inline
+        """
+        counts: dict[str, int] = {}
+        for table in self.tables:
+            for perms in table.permissions():
+                for definitions in perms.terms():
+                    predicate = perms.predicate(definitions)
+                    if (predicate is not None and is_hoistable(predicate)):
+                        counts[predicate] = counts.get(predicate, 0) + 1
+        return {predicate: permission_function(predicate) for predicate, count in counts.items() if count > 1}
+
+    def statements(self) -> dict[str, str]:
+        """
+            return the SDL statements of the definitions in collect order, keyed by definition (eg: `table:books`)
+        """
+        res: dict[str, str] = {}
         for analyzer in self.analyzers:
-            res.append(analyzer.SDL())
+            res[f"analyzer:{analyzer.name}"] = analyzer.SDL()
+        enums: dict[str, list] = {}
         for table in self.tables:
-            res.append(table.SDL())
-        return "\n\n".join(res)
\ No newline at end of file
+            for enum in table.enums():
+                values = enums.setdefault(enum.enumName, enum.enumValues)
+                if (values != enum.enumValues):
+                    raise Exception(
+                        f"two enums are named {enum.enumName} with different values, "
+                        "rename one or set its `__surql_enum_name__` class attribute"
+                    )
+                res.setdefault(f"enum:{enum.enumName}:{enum.enumEncoding.value}", enum.enum_SDL())
+        for function in self.ordered_functions():
+            res[f"function:{function.name}"] = function.SDL()
+        tables = self.tables
+        if (self.hoistPermissions):
+            functions = self.permission_functions()
+            for function in functions.values():
+                res[f"function:{function.name}"] = function.SDL()
+            calls = {predicate: function.call("$this") for predicate, function in functions.items()}
+            tables = [table.hoist_permissions(calls) for table in tables]
+        for table in tables:
+            res[f"table:{table.name}"] = table.SDL()
+        return res
+
+    def scoped(self, namespace: str | None = None, database: str | None = None) -> "SurQLMetadata":
+        """
+            return a registry of the same definitions scoped to a namespace / database
+        """
+        return SurQLMetadata(
+            tables=self.tables,
+            analyzers=self.analyzers,
+            functions=self.functions,
+            hoistPermissions=self.hoistPermissions,
+            namespace=namespace,
+            database=database
+        )
+
+    def collect(self):
+        """
+            return a SDL string with all the tables definitions, in a USE block if the registry is scoped
+        """
+        sdl = "\n\n".join(self.statements().values())
+        use = use_statement(self.namespace, self.database)
+        return sdl if use is None else f"{use}\n\n{sdl}"
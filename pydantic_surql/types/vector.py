@@ -0,0 +1,41 @@
+from typing import Annotated, Any, Optional
+from annotated_types import MaxLen, MinLen
+from pydantic import BeforeValidator, Field
+
+def _from_array(value: Any) -> Any:
+    """
+        convert a numpy array (or any object exposing tolist) to a python list in one call
+    """
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return value
+
+def SurQLVector(dimension: int):
+    """
+        A fixed dimension embedding type (list[float] of `dimension` items, mapped to array<float, dimension>)
+        numpy arrays are accepted and converted in bulk
+    """
+    return Annotated[list[float], Field(min_length=dimension, max_length=dimension), BeforeValidator(_from_array)]
+
+def vector_dimension(annotation: Any, metadata: list[Any]) -> Optional[int]:
+    """
+        return the dimension of a fixed length list[float] field, None if the field is not a vector
+    """
+    if (annotation != list[float]):
+        return None
+    min_len = [e.min_length for e in metadata if isinstance(e, MinLen)]
+    max_len = [e.max_length for e in metadata if isinstance(e, MaxLen)]
+    if (len(min_len) == 1 and min_len == max_len):
+        return min_len[0]
+    return None
+
+def encode_vectors(vectors: Any) -> list[list[float]]:
+    """
+        encode a batch of embeddings (2D numpy array or array-like) to query parameters
+        the conversion happens in a single numpy call instead of per element
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("encode_vectors requires numpy, install it with `pip install pydantic-surql[numpy]`")
+    return numpy.asarray(vectors, dtype=numpy.float64).tolist()
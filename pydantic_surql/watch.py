@@ -0,0 +1,203 @@
+import importlib
+import inspect
+import os
+import sys
+import time
+from enum import Enum
+from types import ModuleType
+from typing import Any, Callable, Optional, get_args
+from pydantic import BaseModel
+
+from . import Metadata, Parser
+from .query.functions import SurQLFunctionCall
+
+"""
+    REMOVE statements of the definitions removed from the metadata, by definition kind
+"""
+REMOVALS: dict[str, Callable[[list[str]], str]] = {
+    "analyzer": lambda e: f"REMOVE ANALYZER {e[0]};",
+    "enum": lambda e: f"REMOVE PARAM ${e[0]};" if e[1] == "param" else f"REMOVE TABLE {e[0]};",
+    "function": lambda e: f"REMOVE FUNCTION fn::{e[0]};",
+    "table": lambda e: f"REMOVE TABLE {e[0]};",
+}
+
+def is_collection(_type: type) -> bool:
+    """
+        check if a class is decorated by @surql_collection (not inherited from a decorated class)
+    """
+    return "__surql_table__" in vars(_type)
+
+def type_classes(_type: Any, res: set[type]) -> set[type]:
+    """
+        collect the models and enums referenced by a type annotation (the linked collections are not walked)
+    """
+    for arg in get_args(_type):
+        type_classes(arg, res)
+    if (isinstance(_type, type) and issubclass(_type, (BaseModel, Enum)) and _type not in res):
+        res.add(_type)
+        if (issubclass(_type, BaseModel) and not is_collection(_type)):
+            model_classes(_type, res)
+    return res
+
+def model_classes(model: type[BaseModel], res: set[type]) -> set[type]:
+    """
+        collect the models and enums referenced by the fields of a model
+    """
+    for field in model.model_fields.values():
+        type_classes(field.annotation, res)
+    return res
+
+def function_classes(function: SurQLFunctionCall) -> set[type]:
+    """
+        collect the models and enums referenced by the arguments of a function
+    """
+    res: set[type] = set()
+    for param in function.signature.parameters.values():
+        if (param.annotation is not inspect.Parameter.empty):
+            type_classes(param.annotation, res)
+    return res
+
+def references(_type: Any, classes: set[type]) -> bool:
+    """
+        check if a type (a parser cache key) references one of the classes
+    """
+    return (isinstance(_type, type) and _type in classes) or any(references(arg, classes) for arg in get_args(_type))
+
+def mtime(module: ModuleType) -> Optional[int]:
+    """
+        return the modification time of a module file, None if it has no file
+    """
+    path = getattr(module, "__file__", None)
+    return os.stat(path).st_mtime_ns if path is not None and os.path.isfile(path) else None
+
+class SurQLWatcher:
+    """
+        A development watcher of models modules, reloading the changed files and re-emitting the changed SDL statements
+        the watcher tracks the models, enums, tables and functions defined by each module (and the modules of their nested models),
+        when a file changes only its module and the modules depending on its classes (embedding or linking them) are reloaded,
+        their parser cache entries and metadata definitions are dropped first
+    """
+    def __init__(self, modules: list[str], interval: float = 0.5):
+        self.roots = modules
+        self.interval = interval
+        self.mtimes: dict[str, Optional[int]] = {}
+        for name in modules:
+            importlib.import_module(name)
+        self.track()
+        self.statements = Metadata.statements()
+
+    def track(self):
+        """
+            index the classes, tables and functions of the watched modules and of the modules of their nested models
+        """
+        self.classes: dict[str, set[type]] = {}
+        self.dependencies: dict[Any, set[type]] = {}
+        self.tables: dict[str, str] = {}
+        self.functions: dict[str, str] = {}
+        pending = list(self.roots)
+        while (len(pending) > 0):
+            name = pending.pop()
+            if (name in self.classes or name not in sys.modules):
+                continue
+            module = sys.modules[name]
+            self.classes[name] = set()
+            self.mtimes.setdefault(name, mtime(module))
+            for value in list(vars(module).values()):
+                if (isinstance(value, SurQLFunctionCall) and value.__module__ == name):
+                    self.functions[value.function.name] = name
+                    self.dependencies[value] = function_classes(value)
+                elif (isinstance(value, type) and issubclass(value, (BaseModel, Enum)) and value.__module__ == name):
+                    self.classes[name].add(value)
+                    self.dependencies[value] = model_classes(value, set()) if issubclass(value, BaseModel) else set()
+                    if (is_collection(value)):
+                        self.tables[value.__surql_table_name__] = name
+            pending += [e.__module__ for e in set().union(*self.dependencies.values())]
+
+    def affected(self, changed: list[str]) -> list[str]:
+        """
+            return the modules to reload when modules changed, the depended upon modules first
+            a module is reloaded if one of its classes or functions references a class of a reloaded module
+        """
+        modules = set(changed)
+        while True:
+            stale = set().union(*[self.classes.get(name, set()) for name in modules])
+            news = set([unit.__module__ for unit, deps in self.dependencies.items() if len(deps & stale) > 0]) - modules
+            if (len(news) == 0):
+                break
+            modules |= news
+        requires = {
+            name: set([e.__module__ for unit, deps in self.dependencies.items() if unit.__module__ == name for e in deps]) - {name}
+            for name in modules
+        }
+        res: list[str] = []
+        while (len(res) < len(modules)):
+            ready = [name for name in modules if name not in res and len((requires[name] & modules) - set(res)) == 0]
+            # import cycles are reloaded in the tracking order
+            res += ready if len(ready) > 0 else [next(name for name in self.classes if name in modules and name not in res)]
+        return res
+
+    def invalidate(self, modules: list[str]):
+        """
+            drop the parser cache entries and the metadata definitions of the modules classes and functions
+        """
+        stale = set().union(*[self.classes.get(name, set()) for name in modules])
+        Parser.cache.drop([key for key in list(Parser.cache.cache) if references(key, stale)])
+        Metadata.unregister(
+            tables=[table for table, name in self.tables.items() if name in modules],
+            functions=[function for function, name in self.functions.items() if name in modules]
+        )
+
+    def diff(self) -> list[str]:
+        """
+            return the SDL statements changed since the last diff, and the REMOVE statements of the removed definitions
+        """
+        statements = Metadata.statements()
+        res = [sdl for key, sdl in statements.items() if self.statements.get(key) != sdl]
+        res += [REMOVALS[key.split(":")[0]](key.split(":")[1:]) for key in self.statements if key not in statements]
+        self.statements = statements
+        return res
+
+    def reload(self, changed: list[str]) -> list[str]:
+        """
+            reload changed modules and the modules depending on them, return the changed SDL statements
+        """
+        modules = self.affected(changed)
+        self.invalidate(modules)
+        try:
+            for name in modules:
+                importlib.reload(sys.modules[name])
+        finally:
+            self.track()
+        return self.diff()
+
+    def poll(self) -> list[str]:
+        """
+            reload the modules whose file changed, return the changed SDL statements
+        """
+        changed = []
+        for name in list(self.classes):
+            current = mtime(sys.modules[name])
+            if (current != self.mtimes.get(name)):
+                self.mtimes[name] = current
+                changed.append(name)
+        if (len(changed) == 0):
+            return []
+        importlib.invalidate_caches()
+        return self.reload(changed)
+
+    def run(self, emit: Callable[[list[str]], None], error: Callable[[Exception], None] = lambda e: None):
+        """
+            poll the modules files until interrupted, emit the changed SDL statements
+            a module failing to reload is reported to error, the watch goes on
+        """
+        try:
+            while True:
+                try:
+                    statements = self.poll()
+                    if (len(statements) > 0):
+                        emit(statements)
+                except Exception as e:
+                    error(e)
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Any
+from pydantic import BaseModel
+from pydantic_surql import Metadata, surql_collection
+from pydantic_surql.apply import SurQLApplier, SurQLMemoryApplyStore
+from pydantic_surql.types import SurQLMetadata
+from .conftest import FakeAsyncTransport
+
+Tenant = SurQLMetadata()
+
+@surql_collection("apply_invoices", metadata=Tenant)
+class ApplyInvoice(BaseModel):
+    total: float
+
+class TestApply:
+    def test_scoped_registry(self):
+        """
+            test the scoped registries definitions and USE blocks
+        """
+        assert all(e.name != "apply_invoices" for e in Metadata.tables)
+        table = Tenant.tables[0].SDL()
+        assert Tenant.collect() == table
+        assert Tenant.scoped("acme", "shop").collect() == f"USE NS acme DB shop;\n\n{table}"
+        assert Tenant.scoped(database="shop").collect() == f"USE DB shop;\n\n{table}"
+        try:
+            Tenant.scoped("acme", "shop; REMOVE TABLE users")
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
+
+    def test_fan_out(self):
+        """
+            test the schema is applied with a bounded concurrency, and an interrupted fan-out resumes
+        """
+        targets = [("tenants", f"t{i}") for i in range(20)]
+        failing = {"t3", "t7"}
+
+        def respond(query: str, params: dict[str, Any] | None) -> list[Any]:
+            if (any(f"DB {e};" in query for e in failing)):
+                raise Exception("connection refused")
+            return []
+
+        transport = FakeAsyncTransport(respond, delay=0.001)
+        store = SurQLMemoryApplyStore()
+        progress = []
+        applier = SurQLApplier(Tenant, transport, concurrency=4, store=store, progress=lambda *e: progress.append(e))
+        report = asyncio.run(applier.apply(targets))
+        assert transport.peak == 4
+        assert sorted(report.failed) == ["tenants/t3", "tenants/t7"]
+        assert len(report.applied) == 18 and report.skipped == []
+        assert [e[0] for e in progress] == list(range(1, 21)) and all(e[1] == 20 for e in progress)
+        assert (f"USE NS tenants DB t0;\n\n{Tenant.collect()}", None) in transport.queries
+
+        failing.clear()
+        report = asyncio.run(SurQLApplier(Tenant, transport, store=store).apply(targets))
+        assert sorted(report.applied) == ["tenants/t3", "tenants/t7"]
+        assert len(report.skipped) == 18
+        assert len(transport.queries) == 22
+
+    def test_invalid_target(self):
+        """
+            test an invalid target identifier fails alone, before its query is sent
+        """
+        transport = FakeAsyncTransport(lambda query, params: [])
+        progress = []
+        applier = SurQLApplier(Tenant, transport, progress=lambda *e: progress.append(e))
+        report = asyncio.run(applier.apply([("ns", "db1"), ("ns", "bad-db"), ("ns", "db2")]))
+        assert sorted(report.applied) == ["ns/db1", "ns/db2"]
+        assert list(report.failed) == ["ns/bad-db"]
+        assert len(transport.queries) == 2 and all("bad-db" not in e[0] for e in transport.queries)
+        assert [e[2] for e in progress if e[3] is not None] == ["ns/bad-db"]
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLChangeAction, SurQLChangefeed, SurQLMemoryCheckpointStore
+from pydantic_surql.types import SurQLTableConfig
+from .conftest import FakeAsyncTransport, FakeTransport
+
+Parser = SurQLParser()
+
+class FeedItem(BaseModel):
+    id: str
+    name: str
+
+class NoFeedItem(BaseModel):
+    name: str
+
+Parser.from_model("feed_items", FeedItem, SurQLTableConfig(changeFeed="1d"))
+Parser.from_model("no_feed_items", NoFeedItem)
+
+CHANGES = [
+    {"versionstamp": 1, "changes": [{"update": {"id": "feed_items:1", "name": "a"}}]},
+    {"versionstamp": 2, "changes": [{"update": {"id": "feed_items:2", "name": "b"}}, {"update": {"id": "feed_items:1", "name": "c"}}]},
+    {"versionstamp": 3, "changes": [{"delete": {"id": "feed_items:2"}}]},
+]
+
+def show_changes(query: str, params: dict[str, Any] | None) -> list[Any]:
+    since = int(query.split("SINCE ")[1].split(" ")[0])
+    limit = int(query.split("LIMIT ")[1].rstrip(";"))
+    return [e for e in CHANGES if e["versionstamp"] >= since][:limit]
+
+class TestChangefeed:
+    def test_batches(self):
+        """
+            test changes are polled and decoded in batches
+        """
+        transport = FakeTransport(show_changes)
+        feed = SurQLChangefeed(FeedItem, transport, batch_size=2, follow=False)
+        batches = list(feed.batches())
+        assert [len(e) for e in batches] == [3, 1]
+        assert [(e.action, e.versionstamp, e.id) for e in batches[0] + batches[1]] == [
+            (SurQLChangeAction.UPDATE, 1, "feed_items:1"),
+            (SurQLChangeAction.UPDATE, 2, "feed_items:2"),
+            (SurQLChangeAction.UPDATE, 2, "feed_items:1"),
+            (SurQLChangeAction.DELETE, 3, "feed_items:2"),
+        ]
+        assert batches[0][2].record == FeedItem(id="feed_items:1", name="c")
+        assert batches[1][0].record is None
+        assert [e[0] for e in transport.queries] == [
+            "SHOW CHANGES FOR TABLE feed_items SINCE 0 LIMIT 2;",
+            "SHOW CHANGES FOR TABLE feed_items SINCE 3 LIMIT 2;",
+            "SHOW CHANGES FOR TABLE feed_items SINCE 4 LIMIT 2;",
+        ]
+
+    def test_resume(self):
+        """
+            test the consumer resumes from the stored checkpoint, an unconsumed batch is not checkpointed
+        """
+        store = SurQLMemoryCheckpointStore()
+        changes = iter(SurQLChangefeed(FeedItem, FakeTransport(show_changes), store, batch_size=1, follow=False))
+        assert next(changes).versionstamp == 1
+        assert next(changes).versionstamp == 2
+        assert store.get("feed_items") == 2
+        resumed = list(SurQLChangefeed(FeedItem, FakeTransport(show_changes), store, follow=False))
+        assert [e.versionstamp for e in resumed] == [2, 2, 3]
+        assert store.get("feed_items") == 4
+
+    def test_async_iteration(self):
+        """
+            test the async iterator
+        """
+        async def collect():
+            return [e async for e in SurQLChangefeed(FeedItem, FakeAsyncTransport(show_changes), follow=False)]
+        assert [e.id for e in asyncio.run(collect())] == ["feed_items:1", "feed_items:2", "feed_items:1", "feed_items:2"]
+
+    def test_no_changefeed(self):
+        """
+            test a collection without changefeed is rejected
+        """
+        try:
+            SurQLChangefeed(NoFeedItem, FakeTransport(show_changes))
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
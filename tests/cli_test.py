@@ -0,0 +1,95 @@
+import os
+from pydantic_surql import Metadata
+from pydantic_surql.cli import EXIT_CHANGED, main, module_name
+
+MODELS = '''
+from pydantic import BaseModel
+from pydantic_surql import surql_collection
+
+@surql_collection("cli_writers")
+class CliWriter(BaseModel):
+    name: str
+
+@surql_collection("cli_books")
+class CliBook(BaseModel):
+    title: str
+    writer: CliWriter
+'''
+
+REMOVED_MODELS = '''
+from pydantic import BaseModel
+from pydantic_surql import surql_collection, surql_function
+
+@surql_function("cli_double")
+def cli_double(value: int) -> str:
+    return "RETURN $value * 2;"
+
+@surql_collection("cli_alpha")
+class CliAlpha(BaseModel):
+    name: str
+
+@surql_collection("cli_beta")
+class CliBeta(BaseModel):
+    name: str
+'''
+
+class TestCli:
+    def test_module_name(self):
+        """
+            test the modules names of files paths
+        """
+        assert module_name("app.models") == "app.models"
+        assert module_name(os.path.join("app", "models.py")) == "app.models"
+        assert module_name(os.path.join("app", "__init__.py")) == "app"
+
+    def test_directory_output(self, tmp_path, monkeypatch, capsys):
+        """
+            test one file per table is written, and only the changed files are rewritten
+        """
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cli_models.py").write_text(MODELS)
+        assert main(["cli_models.py", "-d", "schema"]) == EXIT_CHANGED
+        books = tmp_path / "schema" / "cli_books.surql"
+        table = [e for e in Metadata.tables if e.name == "cli_books"][0]
+        assert books.read_text() == table.SDL() + "\n"
+        assert (tmp_path / "schema" / "cli_writers.surql").exists()
+        err = capsys.readouterr().err
+        assert "cli_models: import" in err and "(2 tables)" in err
+        assert main(["cli_models.py", "-d", "schema", "-q"]) == 0
+        books.write_text("outdated")
+        assert main(["cli_models", "-d", "schema", "-q"]) == EXIT_CHANGED
+        assert capsys.readouterr().err == ""
+        assert books.read_text() == table.SDL() + "\n"
+
+    def test_removed_definitions(self, tmp_path, monkeypatch, capsys):
+        """
+            test the files of the removed tables (and the emptied definitions file) are deleted and count as changes
+        """
+        monkeypatch.chdir(tmp_path)
+        for attr in ["tables", "analyzers", "functions"]:
+            monkeypatch.setattr(Metadata, attr, [])
+        (tmp_path / "cli_removed_models.py").write_text(REMOVED_MODELS)
+        assert main(["cli_removed_models", "-d", "schema", "-q"]) == EXIT_CHANGED
+        schema = tmp_path / "schema"
+        assert (schema / "cli_beta.surql").exists() and "fn::cli_double" in (schema / "_definitions.surql").read_text()
+        (schema / "notes.txt").write_text("kept")
+        Metadata.unregister(tables=["cli_beta"])
+        assert main(["cli_removed_models", "-d", "schema"]) == EXIT_CHANGED
+        assert "removed cli_beta.surql" in capsys.readouterr().err
+        assert not (schema / "cli_beta.surql").exists() and (schema / "cli_alpha.surql").exists()
+        assert main(["cli_removed_models", "-d", "schema", "-q"]) == 0
+        Metadata.unregister(functions=["cli_double"])
+        assert main(["cli_removed_models", "-d", "schema", "-q"]) == EXIT_CHANGED
+        assert not (schema / "_definitions.surql").exists() and (schema / "notes.txt").exists()
+
+    def test_file_output(self, tmp_path, monkeypatch, capsys):
+        """
+            test the single file and stdout outputs
+        """
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "cli_models.py").write_text(MODELS)
+        assert main(["cli_models", "-q"]) == 0
+        assert capsys.readouterr().out == Metadata.collect() + "\n"
+        assert main(["cli_models", "-o", "schema.surql", "-q"]) == EXIT_CHANGED
+        assert (tmp_path / "schema.surql").read_text() == Metadata.collect() + "\n"
+        assert main(["cli_models", "-o", "schema.surql", "-q"]) == 0
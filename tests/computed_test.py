@@ -0,0 +1,76 @@
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import serialize
+from pydantic_surql.types import SurQLFieldConfig, SurQLComputedField
+
+Parser = SurQLParser()
+
+class Level(Enum):
+    LOW = "low"
+    HIGH = "high"
+
+class Details(BaseModel):
+    counter: int = 0
+
+class Account(BaseModel):
+    name: str
+    level: Level = Level.LOW
+    created_at: datetime = SurQLFieldConfig(defaultSDL="time::now()", readonly=True, default_factory=datetime.now)
+    updated_at: datetime = SurQLFieldConfig(valueSDL="time::now()", default_factory=datetime.now)
+    details: Details
+
+    @SurQLComputedField(valueSDL="string::lowercase(name)")
+    @property
+    def normalized_name(self) -> str:
+        return self.name.lower()
+
+class Limits(BaseModel):
+    floor: float = 0.5
+    ceiling: float = float("inf")
+    ratios: list[float] = [1.0, float("nan")]
+
+table = Parser.from_model("accounts", Account)
+
+class TestComputedFields:
+    def test_computed_sdl(self):
+        """
+            test DEFAULT / READONLY / VALUE clauses SDL generation
+        """
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE accounts SCHEMAFULL;",
+            "DEFINE FIELD name ON TABLE accounts TYPE string;",
+            "DEFINE FIELD level ON TABLE accounts TYPE string|number DEFAULT \"low\" ASSERT ($value in [\"low\",\"high\"]);",
+            "DEFINE FIELD created_at ON TABLE accounts TYPE datetime DEFAULT time::now() READONLY;",
+            "DEFINE FIELD updated_at ON TABLE accounts TYPE datetime VALUE time::now();",
+            "DEFINE FIELD details ON TABLE accounts TYPE object;",
+            "DEFINE FIELD details.counter ON TABLE accounts TYPE number DEFAULT 0;",
+            "DEFINE FIELD normalized_name ON TABLE accounts TYPE string VALUE string::lowercase(name);",
+        ])
+
+    def test_non_finite_defaults(self):
+        """
+            test non finite float defaults are not rendered as DEFAULT clauses
+        """
+        assert Parser.from_model("limits", Limits).SDL() == "\n".join([
+            "DEFINE TABLE limits SCHEMAFULL;",
+            "DEFINE FIELD floor ON TABLE limits TYPE number DEFAULT 0.5;",
+            "DEFINE FIELD ceiling ON TABLE limits TYPE number;",
+            "DEFINE FIELD ratios ON TABLE limits TYPE array;",
+            "DEFINE FIELD ratios.* ON TABLE limits TYPE number;",
+        ])
+
+    def test_computed_not_sent(self):
+        """
+            test that database computed fields are not serialized
+        """
+        account = Account(name="Alice", details=Details())
+        assert account.normalized_name == "alice"
+        content = serialize(account)
+        assert "normalized_name" not in content
+        assert "updated_at" not in content
+        assert "created_at" not in content and "level" not in content
+        assert content["name"] == "Alice"
+        content = serialize(Account(name="Bob", level=Level.HIGH, created_at=datetime(2026, 1, 1), details=Details()))
+        assert content["created_at"] == datetime(2026, 1, 1) and content["level"] == Level.HIGH
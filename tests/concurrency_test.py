@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pydantic import BaseModel, create_model
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.types import SurQLAnalyzer, SurQLFunction, SurQLMetadata, SurQLRegistrationError, SurQLSearchIndex, SurQLTableConfig, SurQLTokenizers
+
+THREADS = 8
+TABLES = 50
+
+class ConcurrentStatus(Enum):
+    ON = "on"
+    OFF = "off"
+
+class ConcurrentAddress(BaseModel):
+    city: str
+
+analyzer = SurQLAnalyzer(name="concurrent_analyzer", tokenizers=[SurQLTokenizers.BLANK])
+
+class TestConcurrency:
+    def test_concurrent_registration(self):
+        """
+            test no table is lost or duplicated when registering from several threads
+        """
+        parser = SurQLParser()
+        metadata = SurQLMetadata()
+
+        def register(thread: int):
+            for idx in range(TABLES):
+                model = create_model(f"Concurrent{thread}_{idx}", status=(ConcurrentStatus, ...), address=(ConcurrentAddress, ...))
+                index = SurQLSearchIndex(name="city_idx", fields=["address.city"], analyzer=analyzer)
+                metadata.register(parser.from_model(f"concurrent_{thread}_{idx}", model, SurQLTableConfig(indexes=[index])))
+                if (idx % 10 == 0):
+                    metadata.collect()
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            list(executor.map(register, range(THREADS)))
+        names = [table.name for table in metadata.tables]
+        assert len(names) == THREADS * TABLES
+        assert len(set(names)) == len(names)
+        assert [a.name for a in metadata.analyzers] == ["concurrent_analyzer"]
+        enums = set([id(table.fields[0].types[0]) for table in metadata.tables])
+        assert len(enums) == 1
+
+    def test_duplicate_registration(self):
+        """
+            test a table name can't be registered twice
+        """
+        metadata = SurQLMetadata()
+        table = SurQLParser().from_model("concurrent_duplicate", ConcurrentAddress)
+        metadata.register(table)
+        try:
+            metadata.register(table)
+            assert False, "should raise an exception"
+        except SurQLRegistrationError:
+            pass
+        metadata.register_function(SurQLFunction(name="duplicate", body="RETURN 1;"))
+        try:
+            metadata.register_function(SurQLFunction(name="duplicate", body="RETURN 2;"))
+            assert False, "should raise an exception"
+        except SurQLRegistrationError:
+            pass
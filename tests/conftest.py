@@ -0,0 +1,34 @@
+import asyncio
+from typing import Any, Callable
+
+class FakeTransport:
+    """
+        A recording transport shared by the tests
+        respond returns the rows of a query (a constant, or a function of the query text and params)
+    """
+    def __init__(self, respond: Callable[[str, dict[str, Any] | None], Any] | Any = None):
+        self.respond = respond if callable(respond) else (lambda query, params: respond)
+        self.queries: list[tuple[str, dict[str, Any] | None]] = []
+
+    def query(self, query: str, params: dict[str, Any] | None = None) -> Any:
+        self.queries.append((query, params))
+        return self.respond(query, params)
+
+class FakeAsyncTransport(FakeTransport):
+    """
+        A recording async transport, each query takes delay seconds and the peak of concurrent queries is recorded
+    """
+    def __init__(self, respond: Callable[[str, dict[str, Any] | None], Any] | Any = None, delay: float = 0.0):
+        super().__init__(respond)
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+
+    async def query(self, query: str, params: dict[str, Any] | None = None) -> Any:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            return FakeTransport.query(self, query, params)
+        finally:
+            self.running -= 1
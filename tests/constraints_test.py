@@ -0,0 +1,77 @@
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+from pydantic_surql.parser import SurQLParser
+
+Parser = SurQLParser()
+T_NAME = "constrained"
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+class Constrained(BaseModel):
+    age: int = Field(ge=0, lt=150)
+    ratio: float = Field(gt=0, le=1)
+    even: int = Field(multiple_of=2)
+    code: str = Field(min_length=2, max_length=4, pattern="^[A-Z]+$")
+    tags: list[str] = Field(min_length=1, max_length=10)
+    kind: Literal["a", "b", 1]
+    color: Color
+    opt_color: Optional[Color] = Field(default=None, min_length=3)
+    nickname: Optional[str] = Field(default=None, max_length=8)
+
+class Bounded(BaseModel):
+    at: datetime = Field(ge=datetime(2026, 1, 1, 12, 30))
+
+class Unbounded(BaseModel):
+    value: float = Field(ge=Decimal("1.5"))
+
+class Infinite(BaseModel):
+    value: float = Field(lt=float("inf"))
+
+class TestConstraints:
+    def test_constraints_sdl(self):
+        """
+            test pydantic constraints translation to ASSERT clauses and bounded types
+        """
+        table = Parser.from_model(T_NAME, Constrained)
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE %s SCHEMAFULL;" % T_NAME,
+            "DEFINE FIELD age ON TABLE %s TYPE number ASSERT $value >= 0 AND $value < 150;" % T_NAME,
+            "DEFINE FIELD ratio ON TABLE %s TYPE number ASSERT $value > 0 AND $value <= 1;" % T_NAME,
+            "DEFINE FIELD even ON TABLE %s TYPE number ASSERT $value %% 2 = 0;" % T_NAME,
+            "DEFINE FIELD code ON TABLE %s TYPE string ASSERT string::len($value) >= 2 AND string::len($value) <= 4 AND string::matches($value, \"^[A-Z]+$\");" % T_NAME,
+            "DEFINE FIELD tags ON TABLE %s TYPE array<string, 10> ASSERT array::len($value) >= 1;" % T_NAME,
+            "DEFINE FIELD tags.* ON TABLE %s TYPE string;" % T_NAME,
+            "DEFINE FIELD kind ON TABLE %s TYPE string|number ASSERT ($value in [\"a\",\"b\",1]);" % T_NAME,
+            "DEFINE FIELD color ON TABLE %s TYPE string|number ASSERT ($value in [\"red\",\"blue\"]);" % T_NAME,
+            "DEFINE FIELD opt_color ON TABLE %s TYPE option<string|number> ASSERT $value = NONE OR (($value in [\"red\",\"blue\"]) AND string::len($value) >= 3);" % T_NAME,
+            "DEFINE FIELD nickname ON TABLE %s TYPE option<string> ASSERT $value = NONE OR (string::len($value) <= 8);" % T_NAME,
+        ])
+
+    def test_datetime_bounds(self):
+        """
+            test datetime bounds are rendered as datetime literals, and unexpressible bounds raise an error naming the field
+        """
+        table = Parser.from_model("bounded", Bounded)
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE bounded SCHEMAFULL;",
+            "DEFINE FIELD at ON TABLE bounded TYPE datetime ASSERT $value >= d\"2026-01-01T12:30:00\";",
+        ])
+        try:
+            Parser.from_model("unbounded", Unbounded)
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception as e:
+            assert "field value" in str(e)
+        try:
+            Parser.from_model("infinite", Infinite)
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception as e:
+            assert "field value" in str(e)
@@ -0,0 +1,79 @@
+import sys
+from pydantic_surql import Metadata
+from pydantic_surql.cli import EXIT_CHANGED, main
+from pydantic_surql.discover import discover, module_path
+
+BOOKS = '''
+from pydantic import BaseModel
+from pydantic_surql import surql_collection, surql_relation
+from pydantic_surql.types import SurQLTableConfig
+
+@surql_collection("discover_authors")
+class DiscoverAuthor(BaseModel):
+    name: str
+
+@surql_collection("discover_books", SurQLTableConfig(changeFeed="1d"))
+class DiscoverBook(BaseModel):
+    title: str
+
+@surql_relation("discover_wrote", DiscoverAuthor, DiscoverBook, config=SurQLTableConfig(drop=True))
+class DiscoverWrote(BaseModel):
+    pass
+'''
+
+WEB = '''
+import discover_heavy_framework
+from pydantic_surql import Metadata
+
+def surql_collection_handler():
+    return Metadata.collect()
+'''
+
+def tree(tmp_path):
+    """
+        write a source tree with a models module, an unrelated module, a broken module and a skipped directory
+    """
+    for path, content in [
+        ("app/__init__.py", ""),
+        ("app/models/__init__.py", ""),
+        ("app/models/books.py", BOOKS),
+        ("app/web.py", WEB),
+        ("app/broken.py", "@surql_collection(\n"),
+        ("app/.venv/lib.py", BOOKS),
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return tmp_path / "app"
+
+class TestDiscover:
+    def test_discover(self, tmp_path):
+        """
+            test the decorated definitions are found without importing the modules
+        """
+        app = tree(tmp_path)
+        assert module_path(str(app / "models" / "books.py")) == ("app.models.books", str(tmp_path))
+        modules = discover([str(app)], workers=1)
+        assert [e.module for e in modules] == ["app.models.books"]
+        assert [(e.name, e.decorator, e.table, e.config) for e in modules[0].definitions] == [
+            ("DiscoverAuthor", "surql_collection", "discover_authors", None),
+            ("DiscoverBook", "surql_collection", "discover_books", 'SurQLTableConfig(changeFeed="1d")'),
+            ("DiscoverWrote", "surql_relation", "discover_wrote", "SurQLTableConfig(drop=True)"),
+        ]
+        assert discover([str(app)], workers=2) == modules
+        assert "app.models.books" not in sys.modules
+
+    def test_cli_discover(self, tmp_path, monkeypatch):
+        """
+            test the command imports only the discovered modules
+        """
+        app = tree(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        try:
+            assert main(["--discover", str(app), "-o", "schema.surql", "-q"]) == EXIT_CHANGED
+            schema = (tmp_path / "schema.surql").read_text()
+            assert "DEFINE TABLE discover_books SCHEMAFULL CHANGEFEED 1d;" in schema
+            assert "app.models.books" in sys.modules and "app.web" not in sys.modules
+        finally:
+            Metadata.unregister(tables=["discover_authors", "discover_books", "discover_wrote"])
+            for name in ["app", "app.models", "app.models.books"]:
+                sys.modules.pop(name, None)
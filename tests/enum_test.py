@@ -0,0 +1,105 @@
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.types import SurQLEnumEncoding, SurQLFieldConfig, SurQLMetadata
+
+class CountryCode(Enum):
+    FR = "fr"
+    DE = "de"
+    IT = "it"
+
+class Size(Enum):
+    S = 1
+    M = 2
+
+class Address(BaseModel):
+    country: CountryCode
+    size: Size
+
+class Shipment(BaseModel):
+    country: CountryCode
+    origins: list[CountryCode]
+    maybe: Optional[CountryCode] = None
+    pinned: CountryCode = SurQLFieldConfig(enumEncoding=SurQLEnumEncoding.TABLE)
+    address: Address
+
+class TestEnums:
+    def test_inline_enums(self):
+        """
+            test enums are inlined without threshold
+        """
+        table = SurQLParser().from_model("shipments", Shipment)
+        assert table.fields[0].SDL("shipments") == 'DEFINE FIELD country ON TABLE shipments TYPE string|number ASSERT ($value in ["fr","de","it"]);'
+
+    def test_param_enums(self):
+        """
+            test large enums are encoded as a shared DEFINE PARAM
+        """
+        table = SurQLParser(enumThreshold=2).from_model("shipments", Shipment)
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE shipments SCHEMAFULL;",
+            "DEFINE FIELD country ON TABLE shipments TYPE string|number ASSERT ($value INSIDE $enum_country_code);",
+            "DEFINE FIELD origins ON TABLE shipments TYPE array;",
+            "DEFINE FIELD origins.* ON TABLE shipments TYPE string|number ASSERT ($value INSIDE $enum_country_code);",
+            "DEFINE FIELD maybe ON TABLE shipments TYPE option<string|number> ASSERT ($value INSIDE $enum_country_code);",
+            'DEFINE FIELD pinned ON TABLE shipments TYPE string|number ASSERT (record::exists(type::thing("enum_country_code", $value)));',
+            "DEFINE FIELD address ON TABLE shipments TYPE object;",
+            "DEFINE FIELD address.country ON TABLE shipments TYPE string|number ASSERT ($value INSIDE $enum_country_code);",
+            "DEFINE FIELD address.size ON TABLE shipments TYPE string|number ASSERT ($value in [1,2]);",
+        ])
+
+    def test_collect_enums(self):
+        """
+            test the shared enum definitions are collected once, before the tables
+        """
+        metadata = SurQLMetadata()
+        metadata.tables = [SurQLParser(enumThreshold=2).from_model("shipments", Shipment)]
+        assert metadata.collect().split("\n\n")[:3] == [
+            'DEFINE PARAM $enum_country_code VALUE ["fr","de","it"];',
+            'DEFINE TABLE enum_country_code SCHEMAFULL;\nINSERT IGNORE INTO enum_country_code [{id: "fr"},{id: "de"},{id: "it"}];',
+            "DEFINE TABLE shipments SCHEMAFULL;\n" + metadata.tables[0].SDL().split("\n", 1)[1],
+        ]
+
+    def test_enum_cache(self):
+        """
+            test the enum type definition is built once per Enum class
+        """
+        parser = SurQLParser()
+        assert parser.from_type(CountryCode) is parser.from_type(CountryCode)
+
+    def test_enum_name_clash(self):
+        """
+            test two enums with the same name and different values are detected, and can be renamed
+        """
+        def orders_status():
+            class Status(Enum):
+                PAID = "paid"
+                SHIPPED = "shipped"
+            return Status
+
+        def users_status():
+            class Status(Enum):
+                ACTIVE = "active"
+                BANNED = "banned"
+            return Status
+
+        OrderStatus, UserStatus = orders_status(), users_status()
+        parser = SurQLParser(enumThreshold=1)
+        Order = type("Order", (BaseModel,), {"__annotations__": {"status": OrderStatus}})
+        User = type("User", (BaseModel,), {"__annotations__": {"status": UserStatus}})
+        metadata = SurQLMetadata(tables=[parser.from_model("clash_orders", Order), parser.from_model("clash_users", User)])
+        try:
+            metadata.collect()
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception as e:
+            assert "enum_status" in str(e)
+        UserStatus.__surql_enum_name__ = "enum_user_status"
+        parser = SurQLParser(enumThreshold=1)
+        metadata = SurQLMetadata(tables=[parser.from_model("clash_orders", Order), parser.from_model("clash_users", User)])
+        assert metadata.collect().split("\n\n")[:2] == [
+            'DEFINE PARAM $enum_status VALUE ["paid","shipped"];',
+            'DEFINE PARAM $enum_user_status VALUE ["active","banned"];',
+        ]
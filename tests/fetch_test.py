@@ -0,0 +1,80 @@
+from typing import Optional
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLQuery, plan_fetch
+
+Parser = SurQLParser()
+
+class FetchPublisher(BaseModel):
+    name: str
+
+class FetchWriter(BaseModel):
+    name: str
+    publisher: FetchPublisher | str
+
+class Meta(BaseModel):
+    editor: Optional[FetchWriter] = None
+
+class FetchBook(BaseModel):
+    title: str
+    writer: FetchWriter
+    co_writers: list[FetchWriter]
+    meta: Meta
+
+class FetchBookRead(BaseModel):
+    title: str
+    writer: FetchWriter
+
+Parser.from_model("fetch_publishers", FetchPublisher)
+Parser.from_model("fetch_writers", FetchWriter)
+Parser.from_model("fetch_books", FetchBook)
+
+class TestFetch:
+    def test_plan_depth(self):
+        """
+            test the FETCH plan follows nested record links up to the depth
+        """
+        assert plan_fetch(FetchBook) == ("writer", "co_writers", "meta.editor")
+        assert plan_fetch(FetchBook, depth=2) == (
+            "writer",
+            "writer.publisher",
+            "co_writers",
+            "co_writers.publisher",
+            "meta.editor",
+            "meta.editor.publisher",
+        )
+
+    def test_fetch_query(self):
+        """
+            test the FETCH clause generation from a read model
+        """
+        text, params = SurQLQuery.select(FetchBook).where("title", "=", "a").limit(1).fetch(FetchBookRead, depth=2).build()
+        assert text == "SELECT * FROM fetch_books WHERE title = $w0 LIMIT $limit FETCH writer, writer.publisher;"
+        assert params == {"w0": "a", "limit": 1}
+
+    def test_fetch_decode(self):
+        """
+            test the fetched graph is decoded into nested instances
+        """
+        query = SurQLQuery.select(FetchBook).fetch(FetchBookRead, depth=2)
+        res = query.decode([{
+            "id": "fetch_books:1",
+            "title": "a",
+            "writer": {"id": "fetch_writers:1", "name": "w", "publisher": {"id": "fetch_publishers:1", "name": "p"}}
+        }])
+        assert isinstance(res[0], FetchBookRead)
+        assert isinstance(res[0].writer.publisher, FetchPublisher)
+
+    def test_fetch_unknown_link(self):
+        """
+            test that a read model link missing from the collection is rejected
+        """
+        class BadRead(BaseModel):
+            reviewer: FetchWriter
+        try:
+            SurQLQuery.select(FetchBook).fetch(BadRead)
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
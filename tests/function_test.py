@@ -0,0 +1,72 @@
+from typing import Optional
+from pydantic import BaseModel
+from pydantic_surql import surql_collection, surql_function, Metadata
+from pydantic_surql.types import SurQLFunction, SurQLMetadata
+from .conftest import FakeTransport
+
+@surql_collection("function_orders")
+class FunctionOrder(BaseModel):
+    total: float
+
+@surql_function("RETURN $order.total * (1 - $discount);")
+def discounted(order: FunctionOrder, discount: float = 0.0) -> float:
+    ...
+
+@surql_function("""
+    LET $totals = (SELECT VALUE fn::discounted(id, $discount) FROM function_orders WHERE id INSIDE $orders);
+    RETURN math::sum($totals);
+""", name="orders_total")
+def orders_total(orders: list[FunctionOrder], discount: float, tag: Optional[str] = None) -> float:
+    ...
+
+class TestFunctions:
+    def test_function_sdl(self):
+        """
+            test functions SDL generation from python signatures
+        """
+        assert discounted.function.SDL() == "\n".join([
+            "DEFINE FUNCTION fn::discounted($order: record<function_orders>, $discount: number) {",
+            "    RETURN $order.total * (1 - $discount);",
+            "};",
+        ])
+        assert orders_total.function.SDL() == "\n".join([
+            "DEFINE FUNCTION fn::orders_total($orders: array<record<function_orders>>, $discount: number, $tag: option<string>) {",
+            "    LET $totals = (SELECT VALUE fn::discounted(id, $discount) FROM function_orders WHERE id INSIDE $orders);",
+            "    RETURN math::sum($totals);",
+            "};",
+        ])
+
+    def test_dependency_order(self):
+        """
+            test the functions are collected in dependency order, before the tables
+        """
+        metadata = SurQLMetadata(functions=[orders_total.function, discounted.function], tables=[
+            e for e in Metadata.tables if e.name == "function_orders"
+        ])
+        assert metadata.collect().split("\n\n") == [
+            discounted.function.SDL(),
+            orders_total.function.SDL(),
+            metadata.tables[0].SDL(),
+        ]
+        cyclic = SurQLMetadata(functions=[
+            SurQLFunction(name="a", body="RETURN fn::b();"),
+            SurQLFunction(name="b", body="RETURN fn::a();"),
+        ])
+        try:
+            cyclic.collect()
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
+
+    def test_function_call(self):
+        """
+            test the typed call helper
+        """
+        text, params = orders_total(["function_orders:1"], 0.5)
+        assert text == "RETURN fn::orders_total($orders, $discount, $tag);"
+        assert params == {"orders": ["function_orders:1"], "discount": 0.5, "tag": None}
+        transport = FakeTransport("12.5")
+        assert discounted.run(transport, "function_orders:1") == 12.5
+        assert transport.queries == [("RETURN fn::discounted($order, $discount);", {"order": "function_orders:1", "discount": 0.0})]
@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLLiveAction, SurQLLiveQuery
+
+Parser = SurQLParser()
+
+class LiveTick(BaseModel):
+    id: str
+    price: float
+
+Parser.from_model("live_ticks", LiveTick)
+
+NOTIFICATIONS = [
+    {"action": "CREATE", "result": {"id": "live_ticks:1", "price": 1}},
+    {"action": "UPDATE", "result": {"id": "live_ticks:1", "price": 2}},
+    {"action": "CREATE", "result": {"id": "live_ticks:2", "price": 3}},
+    {"action": "UPDATE", "result": {"id": "live_ticks:1", "price": 4}},
+    {"action": "CREATE", "result": {"id": "live_ticks:3", "price": 5}},
+    {"action": "DELETE", "result": {"id": "live_ticks:3", "price": 5}},
+]
+
+class FakeLiveTransport:
+    def __init__(self, notifications: list[dict[str, Any]]):
+        self.notifications = notifications
+        self.queries: list[str] = []
+
+    async def live(self, query: str, params: dict[str, Any] | None = None):
+        self.queries.append(query)
+        for notification in self.notifications:
+            yield notification
+
+def collect(live: SurQLLiveQuery) -> list[Any]:
+    async def inner():
+        return [e async for e in live.batches()]
+    return asyncio.run(inner())
+
+class TestLive:
+    def test_live_stream(self):
+        """
+            test live notifications are decoded in batches
+        """
+        transport = FakeLiveTransport(NOTIFICATIONS)
+        batches = collect(SurQLLiveQuery(LiveTick, transport))
+        events = [e for batch in batches for e in batch]
+        assert transport.queries == ["LIVE SELECT * FROM live_ticks;"]
+        assert [e.action for e in events] == [SurQLLiveAction(e["action"]) for e in NOTIFICATIONS]
+        assert events[3].record == LiveTick(id="live_ticks:1", price=4)
+        assert events[5].record is None and events[5].id == "live_ticks:3"
+
+    def test_coalescing(self):
+        """
+            test the updates of a same record within the window are merged
+        """
+        events = [e for batch in collect(SurQLLiveQuery(LiveTick, FakeLiveTransport(NOTIFICATIONS), coalesce=0.01)) for e in batch]
+        assert [(e.action, e.record) for e in events] == [
+            (SurQLLiveAction.CREATE, LiveTick(id="live_ticks:2", price=3)),
+            (SurQLLiveAction.CREATE, LiveTick(id="live_ticks:1", price=4)),
+        ]
+
+    def test_diff_coalescing(self):
+        """
+            test the diffs of a same record within the window are concatenated
+        """
+        transport = FakeLiveTransport([
+            {"action": "UPDATE", "record": "live_ticks:1", "result": [{"op": "replace", "path": "/price", "value": 1}]},
+            {"action": "UPDATE", "record": "live_ticks:1", "result": [{"op": "replace", "path": "/price", "value": 2}]},
+        ])
+        events = [e for batch in collect(SurQLLiveQuery(LiveTick, transport, diff=True, coalesce=0.01)) for e in batch]
+        assert transport.queries == ["LIVE SELECT DIFF FROM live_ticks;"]
+        assert len(events) == 1 and events[0].id == "live_ticks:1" and [e["value"] for e in events[0].diff] == [1, 2]
+
+    def test_bounded_buffer(self):
+        """
+            test the events are delivered through a buffer smaller than the stream
+        """
+        events = [e for batch in collect(SurQLLiveQuery(LiveTick, FakeLiveTransport(NOTIFICATIONS), buffer_size=2)) for e in batch]
+        assert len(events) == len(NOTIFICATIONS)
@@ -0,0 +1,74 @@
+import asyncio
+import warnings
+from typing import Any
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLPaginator
+from pydantic_surql.types import SurQLIndex, SurQLTableConfig
+from .conftest import FakeAsyncTransport, FakeTransport
+
+Parser = SurQLParser()
+
+class PageEvent(BaseModel):
+    id: str
+    score: int
+    label: str
+
+Parser.from_model("page_events", PageEvent, SurQLTableConfig(indexes=[SurQLIndex(name="score_idx", fields=["score"])]))
+
+ROWS = [{"id": "page_events:%03d" % i, "score": i % 4, "label": str(i)} for i in range(10)]
+
+def page(query: str, params: dict[str, Any]) -> list[Any]:
+    key = (lambda r: r["id"]) if "ORDER BY id" in query else (lambda r: (r["score"], r["id"]))
+    rows = sorted(ROWS, key=key)
+    if ("last" in params):
+        last = params["last"] if "last_id" not in params else (params["last"], params["last_id"])
+        rows = [r for r in rows if key(r) > last]
+    return rows[:params["limit"]]
+
+class TestPagination:
+    def test_id_queries(self):
+        """
+            test the keyset queries on record ids
+        """
+        paginator = SurQLPaginator(PageEvent, FakeTransport(page), page_size=4)
+        assert paginator.query() == ("SELECT * FROM page_events ORDER BY id ASC LIMIT $limit;", {"limit": 4})
+        assert paginator.query(ROWS[3]) == ("SELECT * FROM page_events WHERE id > $last ORDER BY id ASC LIMIT $limit;", {"limit": 4, "last": "page_events:003"})
+
+    def test_field_queries(self):
+        """
+            test the keyset queries on an indexed field
+        """
+        paginator = SurQLPaginator(PageEvent, FakeTransport(page), order_by="score", page_size=4, descending=True)
+        text, params = paginator.query(ROWS[3])
+        assert text == "SELECT * FROM page_events WHERE score < $last OR (score = $last AND id < $last_id) ORDER BY score DESC, id DESC LIMIT $limit;"
+        assert params == {"limit": 4, "last": 3, "last_id": "page_events:003"}
+
+    def test_sync_iteration(self):
+        """
+            test that all the records are returned once, in order
+        """
+        transport = FakeTransport(page)
+        res = list(SurQLPaginator(PageEvent, transport, order_by="score", page_size=4))
+        assert [(e.score, e.id) for e in res] == sorted([(r["score"], r["id"]) for r in ROWS])
+        assert all(isinstance(e, PageEvent) for e in res)
+        assert len(transport.queries) == 3
+
+    def test_async_iteration(self):
+        """
+            test the async generator
+        """
+        async def collect():
+            return [e async for e in SurQLPaginator(PageEvent, FakeAsyncTransport(page), page_size=5)]
+        res = asyncio.run(collect())
+        assert [e.id for e in res] == [r["id"] for r in ROWS]
+
+    def test_unindexed_warning(self):
+        """
+            test the warning when the ordering field is not indexed
+        """
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            SurQLPaginator(PageEvent, FakeTransport(page), order_by="label")
+            SurQLPaginator(PageEvent, FakeTransport(page), order_by="score")
+        assert len(caught) == 1
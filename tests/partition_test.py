@@ -0,0 +1,104 @@
+from datetime import datetime
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import route, insert_partitioned, select_partitioned, retention
+from pydantic_surql.types import SurQLTableConfig, SurQLIndex, SurQLPartitioning, SurQLPartitionInterval
+
+Parser = SurQLParser()
+
+class LogEvent(BaseModel):
+    ts: datetime
+    message: str
+
+partitioning = SurQLPartitioning(field="ts", start=datetime(2026, 11, 1), end=datetime(2027, 2, 1))
+config = SurQLTableConfig(partitioning=partitioning, indexes=[SurQLIndex(name="ts_idx", fields=["ts"])])
+table = Parser.from_model("events", LogEvent, config)
+
+class TestPartitions:
+    def test_partitions(self):
+        """
+            test the partitions names generation
+        """
+        assert table.partitions() == ["events_2026_11", "events_2026_12", "events_2027_01"]
+        assert table.partition(datetime(2026, 12, 24, 18)) == "events_2026_12"
+
+    def test_intervals(self):
+        """
+            test the day / year partitions
+        """
+        days = SurQLPartitioning(field="ts", interval=SurQLPartitionInterval.DAY, start=datetime(2026, 12, 31), end=datetime(2027, 1, 2))
+        assert [days.suffix(e) for e in days.buckets()] == ["2026_12_31", "2027_01_01"]
+        years = SurQLPartitioning(field="ts", interval=SurQLPartitionInterval.YEAR, start=datetime(2026, 6, 1), end=datetime(2027, 6, 1))
+        assert [years.suffix(e) for e in years.buckets()] == ["2026", "2027"]
+
+    def test_sdl(self):
+        """
+            test that each partition shares the template definitions
+        """
+        assert table.SDL() == "\n\n".join([
+            "\n".join([
+                "DEFINE TABLE %s SCHEMAFULL;" % name,
+                "DEFINE FIELD ts ON TABLE %s TYPE datetime;" % name,
+                "DEFINE FIELD message ON TABLE %s TYPE string;" % name,
+                "DEFINE INDEX ts_idx ON TABLE %s FIELDS ts;" % name,
+            ]) for name in ["events_2026_11", "events_2026_12", "events_2027_01"]
+        ])
+
+    def test_routing(self):
+        """
+            test the inserts routing
+        """
+        events = [
+            LogEvent(ts=datetime(2026, 11, 2), message="a"),
+            LogEvent(ts=datetime(2026, 12, 2), message="b"),
+            LogEvent(ts=datetime(2026, 11, 3), message="c"),
+        ]
+        assert {k: [e.message for e in v] for k, v in route(events).items()} == {"events_2026_11": ["a", "c"], "events_2026_12": ["b"]}
+        queries = insert_partitioned(events)
+        assert [q[0] for q in queries] == ["INSERT INTO events_2026_11 $records;", "INSERT INTO events_2026_12 $records;"]
+        assert len(queries[0][1]["records"]) == 2
+        for ts in [datetime(2026, 10, 31), datetime(2027, 2, 1)]:
+            try:
+                route([LogEvent(ts=ts, message="out")])
+                assert False, "should raise an exception"
+            except AssertionError as e:
+                raise e
+            except Exception:
+                pass
+
+    def test_fan_out(self):
+        """
+            test the range queries fan out
+        """
+        start, end = datetime(2026, 11, 15), datetime(2026, 12, 15)
+        text, params = select_partitioned(LogEvent, start, end)
+        assert text == "SELECT * FROM events_2026_11, events_2026_12 WHERE ts >= $start AND ts < $end;"
+        assert params == {"start": start, "end": end}
+        text, _ = select_partitioned(LogEvent, datetime(2020, 1, 1), datetime(2030, 1, 1))
+        assert text == "SELECT * FROM events_2026_11, events_2026_12, events_2027_01 WHERE ts >= $start AND ts < $end;"
+        try:
+            select_partitioned(LogEvent, datetime(2030, 1, 1), datetime(2031, 1, 1))
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
+
+    def test_retention(self):
+        """
+            test the retention statements
+        """
+        assert retention(LogEvent, datetime(2026, 12, 15)) == "REMOVE TABLE events_2026_11;"
+        assert retention(LogEvent, datetime(2027, 1, 1)) == "REMOVE TABLE events_2026_11;\nREMOVE TABLE events_2026_12;"
+
+    def test_partitioning_field(self):
+        """
+            test that the partitioning field must be a datetime
+        """
+        try:
+            Parser.from_model("bad_events", LogEvent, SurQLTableConfig(partitioning=SurQLPartitioning(field="message", start=datetime(2026, 1, 1), end=datetime(2026, 2, 1))))
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
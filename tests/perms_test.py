@@ -5,7 +5,8 @@ from pydantic import BaseModel
 from pydantic_surql.parser import SurQLParser
 from pydantic_surql.types.field import SurQLFieldConfig, SurQLNullable
 from pydantic_surql.types.permissions import SurQLPermissions
-from pydantic_surql.types.table import SurQLTableConfig
+from pydantic_surql.types.function import is_hoistable, permission_function
+from pydantic_surql.types.table import SurQLMetadata, SurQLTableConfig
 
 
 perms = SurQLPermissions.model_construct(
@@ -71,12 +72,12 @@ def test_table_fields_perms():
         "DEFINE FIELD child ON TABLE %s TYPE object %s;" % (name, perms_sdl),
         "DEFINE FIELD child.address ON TABLE %s TYPE string %s;" % (name, perms_sdl),
         "DEFINE FIELD child.obj ON TABLE %s TYPE object;" % name,
-        "DEFINE FIELD child.obj.phone ON TABLE %s TYPE string %s;" % (name, perms_sdl),
+        "DEFINE FIELD child.obj.phone ON TABLE %s TYPE string ASSERT string::len($value) >= 8 %s;" % (name, perms_sdl),
         "DEFINE FIELD arr_child ON TABLE %s TYPE array %s;" % (name, perms_sdl),
         "DEFINE FIELD arr_child.* ON TABLE %s TYPE object;" % name,
         "DEFINE FIELD arr_child.*.address ON TABLE %s TYPE string %s;" % (name, perms_sdl),
         "DEFINE FIELD arr_child.*.obj ON TABLE %s TYPE object;" % name,
-        "DEFINE FIELD arr_child.*.obj.phone ON TABLE %s TYPE string %s;" % (name, perms_sdl),
+        "DEFINE FIELD arr_child.*.obj.phone ON TABLE %s TYPE string ASSERT string::len($value) >= 8 %s;" % (name, perms_sdl),
     ])
     assert sdl == truth
 
@@ -84,4 +85,86 @@ def test_table_fields_perms():
     try:
         GrandChildObject(phone="2")
     except BaseException as e:
-        assert True
\ No newline at end of file
+        assert True
+
+def test_hoisted_permissions():
+    """
+        Test the permission predicates used more than once are hoisted into shared functions
+    """
+    class Owned(BaseModel):
+        name: str = SurQLFieldConfig(permissions=perms)
+        secret: str = SurQLFieldConfig(permissions=SurQLPermissions(select=["WHERE $auth.admin = true"]))
+
+    permissions = SurQLPermissions(select=["WHERE published = true", "OR user = $auth.id"], update=["WHERE user = $auth.id"])
+    metadata = SurQLMetadata(hoistPermissions=True)
+    metadata.tables = [Parser.from_model("owned", Owned, SurQLTableConfig(permissions=permissions))]
+    function = permission_function("user = $auth.id")
+    call = function.call("$this")
+    assert function.SDL() == "DEFINE FUNCTION fn::%s($doc: object) {\n    RETURN $doc.user = $auth.id;\n};" % function.name
+    assert metadata.collect() == "\n\n".join([
+        function.SDL(),
+        "\n".join([
+            "DEFINE TABLE owned SCHEMAFULL %s;" % permissions.hoist({"user = $auth.id": call}).SDL(),
+            "DEFINE FIELD name ON TABLE owned TYPE string %s;" % SurQLPermissions(
+                select=["WHERE %s" % call],
+                create=["WHERE %s" % call],
+                update=["WHERE %s" % call],
+                delete=["WHERE %s" % call],
+            ).SDL(),
+            "DEFINE FIELD secret ON TABLE owned TYPE string PERMISSIONS\n    FOR SELECT\n        WHERE $auth.admin = true;",
+        ])
+    ])
+    assert "published = true" in metadata.collect()
+    assert "fn::" not in SurQLMetadata(tables=metadata.tables).collect()
+
+def test_subquery_permissions_not_hoisted():
+    """
+        Test the permission predicates with sub queries are kept inline
+    """
+    subquery = "WHERE user INSIDE (SELECT VALUE id FROM members WHERE team = $auth.team)"
+    shared = SurQLPermissions(select=[subquery], update=[subquery])
+
+    class Member(BaseModel):
+        name: str = SurQLFieldConfig(permissions=shared)
+
+    assert not is_hoistable("user INSIDE (SELECT VALUE id FROM members WHERE team = $auth.team)")
+    metadata = SurQLMetadata(hoistPermissions=True)
+    metadata.tables = [Parser.from_model("members_perms", Member, SurQLTableConfig(permissions=shared))]
+    assert metadata.permission_functions() == {}
+    assert metadata.collect() == SurQLMetadata(tables=metadata.tables).collect()
+    assert "fn::" not in metadata.collect()
+
+def test_param_permissions_not_hoisted():
+    """
+        Test the permission predicates using params not passed through to functions are kept inline
+    """
+    assert is_hoistable("user = $auth.id AND $session.ip != NONE")
+    for predicate in ["$value != NONE", "$before.user = $auth.id", "$after.user = $auth.id", "$input.name != NONE", "$event = 'CREATE'"]:
+        assert not is_hoistable(predicate)
+    shared = SurQLPermissions(select=["WHERE $value != NONE"], update=["WHERE $value != NONE"])
+
+    class Valued(BaseModel):
+        name: str = SurQLFieldConfig(permissions=shared)
+        age: int = SurQLFieldConfig(permissions=shared)
+
+    metadata = SurQLMetadata(hoistPermissions=True)
+    metadata.tables = [Parser.from_model("valued_perms", Valued)]
+    assert metadata.permission_functions() == {}
+    assert "fn::" not in metadata.collect()
+
+def test_graph_permissions_not_hoisted():
+    """
+        Test the permission predicates traversing the graph are kept inline
+    """
+    for predicate in ["<-owns<-user CONTAINS $auth.id", "->member->team CONTAINS $auth.team", "id<->friend CONTAINS $auth.id"]:
+        assert not is_hoistable(predicate)
+    assert is_hoistable("score > -1 AND score < 10")
+    shared = SurQLPermissions(select=["WHERE <-owns<-user CONTAINS $auth.id"], update=["WHERE <-owns<-user CONTAINS $auth.id"])
+
+    class Owned(BaseModel):
+        name: str = SurQLFieldConfig(permissions=shared)
+
+    metadata = SurQLMetadata(hoistPermissions=True)
+    metadata.tables = [Parser.from_model("graph_perms", Owned, SurQLTableConfig(permissions=shared))]
+    assert metadata.permission_functions() == {}
+    assert "$doc" not in metadata.collect()
@@ -0,0 +1,90 @@
+from typing import Optional
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLQuery, projection_fields
+
+Parser = SurQLParser()
+
+class Contact(BaseModel):
+    phone: str
+    email: str
+    fax: Optional[str] = None
+
+class Address(BaseModel):
+    city: str
+    country: str
+    contact: Contact
+
+class ProjectionAuthor(BaseModel):
+    name: str
+
+class ProjectionDocument(BaseModel):
+    title: str
+    body: str
+    pages: int
+    address: Address
+    tags: list[str]
+    author: ProjectionAuthor
+
+Parser.from_model("projection_authors", ProjectionAuthor)
+table = Parser.from_model("projection_documents", ProjectionDocument)
+
+class ContactSummary(BaseModel):
+    email: str
+
+class AddressSummary(BaseModel):
+    city: str
+    contact: ContactSummary
+
+class DocumentSummary(BaseModel):
+    title: str
+    address: AddressSummary
+    tags: list[str]
+    author: str
+
+class BadSummary(BaseModel):
+    title: str
+    summary: str
+
+class TestProjection:
+    def test_projection_fields(self):
+        """
+            test the projection fields paths generation
+        """
+        assert projection_fields(table, DocumentSummary) == ("title", "address.city", "address.contact.email", "tags", "author")
+
+    def test_projection_query(self):
+        """
+            test the projection SELECT query
+        """
+        text, params = SurQLQuery.project(ProjectionDocument, DocumentSummary).where("pages", ">", 2).build()
+        assert text == "SELECT title, address.city, address.contact.email, tags, author FROM projection_documents WHERE pages > $w0;"
+        assert params == {"w0": 2}
+
+    def test_projection_decode(self):
+        """
+            test that results are decoded into the projection model
+        """
+        query = SurQLQuery.project(ProjectionDocument, DocumentSummary)
+        rows = [{
+            "title": "a",
+            "address": {"city": "Paris", "contact": {"email": "a@b.c"}},
+            "tags": ["x"],
+            "author": "projection_authors:1"
+        }]
+        res = query.decode(rows)
+        assert len(res) == 1
+        assert isinstance(res[0], DocumentSummary)
+        assert res[0].address.contact.email == "a@b.c"
+
+    def test_invalid_projection(self):
+        """
+            test that a projection field missing from the collection is rejected
+        """
+        try:
+            SurQLQuery.project(ProjectionDocument, BadSummary)
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
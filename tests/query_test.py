@@ -0,0 +1,113 @@
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLQuery, QUERY_CACHE
+
+Parser = SurQLParser()
+
+class Status(Enum):
+    DRAFT = "draft"
+    PUBLISHED = "published"
+
+class Address(BaseModel):
+    city: str
+    country: str
+
+class QueryWriter(BaseModel):
+    name: str
+
+class QueryBook(BaseModel):
+    title: str
+    pages: Optional[int]
+    status: Status
+    tags: list[str]
+    address: Address
+    writer: QueryWriter
+
+Parser.from_model("query_writers", QueryWriter)
+Parser.from_model("query_books", QueryBook)
+
+class TestQueryBuilder:
+    def test_select(self):
+        """
+            test SELECT queries compilation
+        """
+        query = SurQLQuery.select(QueryBook, "title", "address.city").where("pages", ">", 10).where("status", "=", Status.PUBLISHED)
+        text, params = query.order_by("pages", descending=True).limit(5).start(10).build()
+        assert text == "SELECT title, address.city FROM query_books WHERE pages > $w0 AND status = $w1 ORDER BY pages DESC LIMIT $limit START $start;"
+        assert params == {"w0": 10, "w1": "published", "limit": 5, "start": 10}
+
+    def test_select_all(self):
+        """
+            test SELECT * queries compilation
+        """
+        text, params = SurQLQuery.select(QueryBook).where("tags.*", "CONTAINS", "scifi").build()
+        assert text == "SELECT * FROM query_books WHERE tags.* CONTAINS $w0;"
+        assert params == {"w0": "scifi"}
+
+    def test_update(self):
+        """
+            test UPDATE queries compilation
+        """
+        address = Address(city="Paris", country="France")
+        text, params = SurQLQuery.update(QueryBook).set("address", address).set("pages", 12).where("id", "=", "query_books:1").build()
+        assert text == "UPDATE query_books SET address = $s0, pages = $s1 WHERE id = $w0;"
+        assert params == {"s0": {"city": "Paris", "country": "France"}, "s1": 12, "w0": "query_books:1"}
+
+    def test_delete(self):
+        """
+            test DELETE queries compilation
+        """
+        text, params = SurQLQuery.delete(QueryBook).where("writer", "=", "query_writers:1").build()
+        assert text == "DELETE query_books WHERE writer = $w0;"
+        assert params == {"w0": "query_writers:1"}
+
+    def test_compiled_once_per_shape(self):
+        """
+            test that the query text is cached per query shape
+        """
+        first = SurQLQuery.select(QueryBook).where("title", "=", "a")
+        second = SurQLQuery.select(QueryBook).where("title", "=", "b")
+        assert first.shape() == second.shape()
+        assert first.compile() is second.compile()
+        assert QUERY_CACHE.has(first.shape())
+        assert first.params() != second.params()
+
+    def test_paths_resolved_once(self):
+        """
+            test that the fields paths are resolved once per table
+        """
+        table = QueryBook.__surql_table__
+        assert table.resolve("address.city") is table.resolve("address.city")
+        assert table.resolve("tags.*") is table.resolve("tags.*")
+
+    def test_invalid_paths(self):
+        """
+            test that unknown fields paths are rejected
+        """
+        for build in [
+            lambda: SurQLQuery.select(QueryBook, "unknown"),
+            lambda: SurQLQuery.select(QueryBook).where("address.street", "=", "a"),
+            lambda: SurQLQuery.select(QueryBook).where("title", "LIKE", "a"),
+            lambda: SurQLQuery.delete(QueryBook).order_by("title"),
+        ]:
+            try:
+                build()
+                assert False, "should raise an exception"
+            except AssertionError as e:
+                raise e
+            except Exception:
+                pass
+
+    def test_not_a_collection(self):
+        """
+            test that only collections can be queried
+        """
+        try:
+            SurQLQuery.select(Address)
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
@@ -0,0 +1,89 @@
+from typing import Any
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLChange, SurQLChangeAction, SurQLRecordCache
+from .conftest import FakeTransport
+
+Parser = SurQLParser()
+
+class CachedCurrency(BaseModel):
+    id: str
+    code: str
+
+Parser.from_model("cached_currencies", CachedCurrency)
+
+RECORDS = {
+    "cached_currencies:eur": {"id": "cached_currencies:eur", "code": "EUR"},
+    "cached_currencies:usd": {"id": "cached_currencies:usd", "code": "USD"},
+}
+
+def respond(query: str, params: dict[str, Any] | None) -> list[Any]:
+    if ("ids" in (params or {})):
+        return [RECORDS[_id] for _id in params["ids"] if _id in RECORDS]
+    return list(RECORDS.values())
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestRecordCache:
+    def test_read_through(self):
+        """
+            test records and queries are fetched once
+        """
+        transport = FakeTransport(respond)
+        cache = SurQLRecordCache(transport)
+        assert cache.get(CachedCurrency, "cached_currencies:eur").code == "EUR"
+        assert cache.get(CachedCurrency, "cached_currencies:eur").code == "EUR"
+        assert cache.get(CachedCurrency, "cached_currencies:gbp") is None
+        assert len(cache.query(CachedCurrency, "SELECT * FROM cached_currencies;")) == 2
+        assert len(cache.query(CachedCurrency, "SELECT *   FROM cached_currencies;")) == 2
+        assert cache.get(CachedCurrency, "cached_currencies:usd").code == "USD"
+        assert len(transport.queries) == 3
+
+    def test_expiration(self):
+        """
+            test ttl and size based eviction
+        """
+        transport = FakeTransport(respond)
+        clock = Clock()
+        cache = SurQLRecordCache(transport, ttl=10, max_size=1, clock=clock)
+        cache.get(CachedCurrency, "cached_currencies:eur")
+        cache.get(CachedCurrency, "cached_currencies:usd")
+        cache.get(CachedCurrency, "cached_currencies:usd")
+        assert len(transport.queries) == 2
+        cache.get(CachedCurrency, "cached_currencies:eur")
+        assert len(transport.queries) == 3
+        clock.now = 11
+        cache.get(CachedCurrency, "cached_currencies:eur")
+        assert len(transport.queries) == 4
+
+    def test_invalidation(self):
+        """
+            test table invalidation from changefeed entries and invalidation events
+        """
+        transport = FakeTransport(respond)
+        cache = SurQLRecordCache(transport)
+        cache.query(CachedCurrency, "SELECT * FROM cached_currencies;")
+        cache.apply(CachedCurrency, [])
+        cache.query(CachedCurrency, "SELECT * FROM cached_currencies;")
+        assert len(transport.queries) == 1
+        cache.apply(CachedCurrency, [SurQLChange(action=SurQLChangeAction.UPDATE, versionstamp=1, id="cached_currencies:eur")])
+        cache.query(CachedCurrency, "SELECT * FROM cached_currencies;")
+        assert len(transport.queries) == 2
+        cache.invalidate("cached_currencies")
+        cache.get(CachedCurrency, "cached_currencies:eur")
+        assert len(transport.queries) == 3
+
+    def test_invalidation_event(self):
+        """
+            test the invalidation event hook SDL generation
+        """
+        assert SurQLRecordCache.event("cached_currencies").SDL("cached_currencies") == (
+            "DEFINE EVENT cached_currencies_cache_invalidation ON TABLE cached_currencies "
+            "WHEN $event IN ['CREATE', 'UPDATE', 'DELETE'] THEN "
+            "(CREATE surql_cache_invalidations CONTENT { table: 'cached_currencies', event: $event, at: time::now() });"
+        )
@@ -0,0 +1,114 @@
+import re
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import serialize, insert, id_range
+from pydantic_surql.types import SurQLTableConfig, SurQLCompositeId, SurQLRecordId, SurQLUlidId, SurQLUuid7Id, ulid, uuid7
+
+Parser = SurQLParser()
+
+class Measure(BaseModel):
+    tenant: str
+    ts: datetime
+    value: float
+
+class UlidMeasure(BaseModel):
+    id: Optional[str] = None
+    value: float
+
+class UuidMeasure(BaseModel):
+    value: float
+
+Parser.from_model("measures", Measure, SurQLTableConfig(recordId=SurQLCompositeId(fields=["tenant", "ts"])))
+Parser.from_model("ulid_measures", UlidMeasure, SurQLTableConfig(recordId=SurQLUlidId()))
+Parser.from_model("uuid_measures", UuidMeasure, SurQLTableConfig(recordId=SurQLUuid7Id()))
+
+TS = datetime(2026, 10, 1)
+
+class TestRecordIds:
+    def test_composite_id(self):
+        """
+            test composite record ids generation
+        """
+        measure = Measure(tenant="acme", ts=TS, value=1.5)
+        assert serialize(measure) == {"tenant": "acme", "ts": TS, "value": 1.5, "id": ["acme", TS]}
+        text, params = insert(Measure, [measure])
+        assert text == "INSERT INTO measures $records;"
+        assert params["records"][0]["id"] == ["acme", TS]
+
+    def test_composite_range(self):
+        """
+            test composite record ids range queries
+        """
+        text, params = id_range(Measure, ["acme", TS], ["acme", datetime(2026, 11, 1)])
+        assert text == "SELECT * FROM measures:[$from0, $from1]..[$to0, $to1];"
+        assert params == {"from0": "acme", "from1": TS, "to0": "acme", "to1": datetime(2026, 11, 1)}
+        text, _ = id_range(Measure, ["acme"], ["acme", TS], inclusive=True)
+        assert text == "SELECT * FROM measures:[$from0]..=[$to0, $to1];"
+
+    def test_range_requires_composite(self):
+        """
+            test that ranges are only available on composite ids
+        """
+        try:
+            id_range(UlidMeasure, ["a"], ["b"])
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
+
+    def test_composite_unknown_field(self):
+        """
+            test that composite ids fields are validated
+        """
+        try:
+            Parser.from_model("bad_measures", Measure, SurQLTableConfig(recordId=SurQLCompositeId(fields=["tenant", "unknown"])))
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
+
+    def test_random_ids(self):
+        """
+            test ULID / UUIDv7 record ids generation
+        """
+        assert re.match(r"^[0-9A-HJKMNP-TV-Z]{26}$", serialize(UlidMeasure(value=1))["id"])
+        assert serialize(UlidMeasure(id="fixed", value=1))["id"] == "fixed"
+        _id = uuid.UUID(serialize(UuidMeasure(value=1))["id"])
+        assert _id.version == 7
+
+    def test_stable_random_ids(self):
+        """
+            test a generated random id is kept on the instance, so a retried insert doesn't duplicate the records
+        """
+        measure = UlidMeasure(value=1)
+        _id = serialize(measure)["id"]
+        assert measure.id == _id
+        assert serialize(measure)["id"] == _id
+        assert insert(UlidMeasure, [measure])[1]["records"][0]["id"] == _id
+
+    def test_time_ordered(self):
+        """
+            test ULID / UUIDv7 are ordered by generation time
+        """
+        first_ulid, first_uuid = ulid(), uuid7()
+        time.sleep(0.002)
+        assert first_ulid < ulid()
+        assert first_uuid < uuid7()
+
+    def test_strategies_config(self):
+        """
+            test the strategies are validated from their names, and the base strategy is abstract
+        """
+        assert isinstance(SurQLTableConfig(recordId={"strategy": "uuid7"}).recordId, SurQLUuid7Id)
+        assert SurQLTableConfig(recordId={"strategy": "composite", "fields": ["tenant"]}).recordId == SurQLCompositeId(fields=["tenant"])
+        try:
+            SurQLRecordId()
+            assert False, "should raise an exception"
+        except TypeError:
+            pass
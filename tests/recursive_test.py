@@ -0,0 +1,101 @@
+from typing import Optional
+from pydantic import BaseModel, create_model
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.types import SurQLRecursionPolicy
+
+class Category(BaseModel):
+    name: str
+    children: list["Category"] = []
+
+class Employee(BaseModel):
+    name: str
+    team: Optional["Team"] = None
+
+class Team(BaseModel):
+    lead: Employee
+
+Employee.model_rebuild()
+
+class Tree(BaseModel):
+    root: Category
+
+class Org(BaseModel):
+    team: Team
+
+class Reference(BaseModel):
+    category: Category
+
+class TestRecursiveModels:
+    def test_raise_policy(self):
+        """
+            test a recursive model raises a clear exception by default
+        """
+        try:
+            SurQLParser().from_model("trees", Tree)
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception as e:
+            assert "Category -> Category" in str(e)
+
+    def test_record_policy(self):
+        """
+            test recursive references converted to record links
+        """
+        table = SurQLParser(recursionPolicy=SurQLRecursionPolicy.RECORD).from_model("orgs", Org)
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE orgs SCHEMAFULL;",
+            "DEFINE FIELD team ON TABLE orgs TYPE object;",
+            "DEFINE FIELD team.lead ON TABLE orgs TYPE object;",
+            "DEFINE FIELD team.lead.name ON TABLE orgs TYPE string;",
+            "DEFINE FIELD team.lead.team ON TABLE orgs TYPE option<record()>;",
+        ])
+
+    def test_flexible_policy(self):
+        """
+            test recursive models expanded up to the recursion depth then cut off as FLEXIBLE objects
+        """
+        parser = SurQLParser(recursionPolicy=SurQLRecursionPolicy.FLEXIBLE, recursionDepth=2)
+        table = parser.from_model("trees", Tree)
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE trees SCHEMAFULL;",
+            "DEFINE FIELD root ON TABLE trees TYPE object;",
+            "DEFINE FIELD root.name ON TABLE trees TYPE string;",
+            "DEFINE FIELD root.children ON TABLE trees TYPE array DEFAULT [];",
+            "DEFINE FIELD root.children.* ON TABLE trees TYPE object;",
+            "DEFINE FIELD root.children.*.name ON TABLE trees TYPE string;",
+            "DEFINE FIELD root.children.*.children ON TABLE trees TYPE array DEFAULT [];",
+            "DEFINE FIELD root.children.*.children.* ON TABLE trees FLEXIBLE TYPE object;",
+        ])
+        # a recursive model definition doesn't depend on where it is used, it is memoized
+        reference = parser.from_model("references", Reference)
+        assert reference.fields[0].types[0] is table.fields[0].types[0]
+
+    def test_mutual_recursion(self):
+        """
+            test mutually recursive models
+        """
+        table = SurQLParser(recursionPolicy=SurQLRecursionPolicy.FLEXIBLE).from_model("orgs", Org)
+        assert table.SDL().split("\n")[-1] == "DEFINE FIELD team.lead.team ON TABLE orgs FLEXIBLE TYPE option<object>;"
+
+    def test_linear_parsing(self):
+        """
+            test shared nested models are parsed once
+        """
+        class CountingParser(SurQLParser):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.parsed: list[type] = []
+
+            def from_fields(self, model):
+                self.parsed.append(model)
+                return super().from_fields(model)
+
+        model = Category
+        for idx in range(60):
+            model = create_model(f"Level{idx}", left=(model, ...), right=(model, ...))
+        parser = CountingParser(recursionPolicy=SurQLRecursionPolicy.FLEXIBLE)
+        table = parser.from_model("levels", model)
+        # the 60 levels (the last one is the root model) and Category are parsed once each
+        assert len(parser.parsed) == 61
+        assert table.fields[0].types[0] is table.fields[1].types[0]
@@ -0,0 +1,66 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic_surql import surql_collection, surql_relation, Metadata
+from pydantic_surql.query import relate
+
+@surql_collection("relation_writers")
+class RelationWriter(BaseModel):
+    id: str
+    name: str
+
+@surql_collection("relation_books")
+class RelationBook(BaseModel):
+    id: str
+    title: str
+
+@surql_relation("wrote", in_=RelationWriter, out=[RelationBook, "relation_articles"], enforced=True)
+class Wrote(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+    id: str | None = None
+    in_: RelationWriter | str = Field(alias="in")
+    out_: RelationBook | str = Field(alias="out")
+    since: datetime
+
+class TestRelations:
+    def test_relation_sdl(self):
+        """
+            test relation tables SDL generation
+        """
+        table = [e for e in Metadata.tables if e.name == "wrote"][0]
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE wrote SCHEMAFULL TYPE RELATION IN relation_writers OUT relation_books|relation_articles ENFORCED;",
+            "DEFINE FIELD since ON TABLE wrote TYPE datetime;",
+        ])
+
+    def test_relate_chunks(self):
+        """
+            test batched RELATE statements generation
+        """
+        since = datetime(2026, 1, 1)
+        writer = RelationWriter(id="relation_writers:1", name="a")
+        edges = [Wrote(in_=writer, out_="relation_books:%d" % i, since=since) for i in range(5)]
+        queries = list(relate(Wrote, edges, chunk_size=2))
+        assert len(queries) == 3
+        text, params = queries[0]
+        assert text == "\n".join([
+            "RELATE $in0->wrote->$out0 CONTENT $c0;",
+            "RELATE $in1->wrote->$out1 CONTENT $c1;",
+        ])
+        assert params == {
+            "in0": "relation_writers:1", "out0": "relation_books:0", "c0": {"since": since},
+            "in1": "relation_writers:1", "out1": "relation_books:1", "c1": {"since": since},
+        }
+        assert queries[1][0] is text
+        assert queries[2][0] == "RELATE $in0->wrote->$out0 CONTENT $c0;"
+
+    def test_relate_requires_relation(self):
+        """
+            test that RELATE is only available on relation tables
+        """
+        try:
+            list(relate(RelationBook, []))
+            assert False, "should raise an exception"
+        except AssertionError as e:
+            raise e
+        except Exception:
+            pass
@@ -0,0 +1,72 @@
+from typing import Any, Optional
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLRecordResolver
+from .conftest import FakeTransport
+
+Parser = SurQLParser()
+
+class ResolverCountry(BaseModel):
+    id: str
+    name: str
+
+class ResolverWriter(BaseModel):
+    id: str
+    name: str
+    country: ResolverCountry | str
+
+class ResolverBook(BaseModel):
+    id: str
+    title: str
+    writer: ResolverWriter | str
+    co_writers: list[ResolverWriter | str] = []
+    reviewer: Optional[ResolverWriter | str] = None
+
+Parser.from_model("resolver_countries", ResolverCountry)
+Parser.from_model("resolver_writers", ResolverWriter)
+Parser.from_model("resolver_books", ResolverBook)
+
+RECORDS = {
+    "resolver_countries:fr": {"id": "resolver_countries:fr", "name": "France"},
+    "resolver_writers:1": {"id": "resolver_writers:1", "name": "a", "country": "resolver_countries:fr"},
+    "resolver_writers:2": {"id": "resolver_writers:2", "name": "b", "country": "resolver_countries:fr"},
+}
+
+def respond(query: str, params: dict[str, Any] | None) -> list[Any]:
+    return [RECORDS[_id] for _id in params["ids"]]
+
+class TestResolver:
+    def test_batched_resolution(self):
+        """
+            test that ids are deduplicated and fetched with one query per table
+        """
+        transport = FakeTransport(respond)
+        books = [
+            ResolverBook(id="resolver_books:1", title="x", writer="resolver_writers:1", co_writers=["resolver_writers:2"]),
+            {"id": "resolver_books:2", "title": "y", "writer": "resolver_writers:1", "reviewer": "resolver_writers:2"},
+        ]
+        res = SurQLRecordResolver(transport).resolve(ResolverBook, books)
+        assert transport.queries == [("SELECT * FROM $ids;", {"ids": ["resolver_writers:1", "resolver_writers:2"]})]
+        assert isinstance(res[0].writer, ResolverWriter)
+        assert res[0].writer is res[1].writer
+        assert res[0].co_writers[0] is res[1].reviewer
+        assert res[0].writer.country == "resolver_countries:fr"
+
+    def test_nested_resolution(self):
+        """
+            test that nested links are resolved up to the depth through the identity map
+        """
+        transport = FakeTransport(respond)
+        resolver = SurQLRecordResolver(transport)
+        books = [
+            {"id": "resolver_books:1", "title": "x", "writer": "resolver_writers:1"},
+            {"id": "resolver_books:2", "title": "y", "writer": "resolver_writers:2"},
+        ]
+        res = resolver.resolve(ResolverBook, books, depth=2)
+        assert len(transport.queries) == 2
+        assert isinstance(res[0].writer.country, ResolverCountry)
+        assert res[0].writer.country is res[1].writer.country
+
+        # already resolved records are not fetched again
+        resolver.resolve(ResolverBook, books, depth=2)
+        assert len(transport.queries) == 2
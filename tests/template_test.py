@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.types import SurQLField
+from pydantic_surql.types.field import OBJECT_TEMPLATES
+
+Parser = SurQLParser()
+
+class TemplateAddress(BaseModel):
+    city: str
+    zip: str
+
+class TemplateContact(BaseModel):
+    home: TemplateAddress
+    work: TemplateAddress
+
+class TemplateCompany(BaseModel):
+    address: TemplateAddress
+    contacts: list[TemplateContact]
+
+class TestTemplates:
+    def test_rebased_templates(self, monkeypatch):
+        """
+            test a shared object type is rendered once and rebased on every path and table
+        """
+        rendered = []
+        render = SurQLField._surqlFromTypes.__func__
+        def spy(cls, table_name, field_name, *args):
+            rendered.append(field_name)
+            return render(cls, table_name, field_name, *args)
+        table = Parser.from_model("template_companies", TemplateCompany)
+        other = Parser.from_model("template_contacts", TemplateContact)
+        address = table.fields[0].types[0]
+        monkeypatch.setattr(SurQLField, "_surqlFromTypes", classmethod(spy))
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE template_companies SCHEMAFULL;",
+            "DEFINE FIELD address ON TABLE template_companies TYPE object;",
+            "DEFINE FIELD address.city ON TABLE template_companies TYPE string;",
+            "DEFINE FIELD address.zip ON TABLE template_companies TYPE string;",
+            "DEFINE FIELD contacts ON TABLE template_companies TYPE array;",
+            "DEFINE FIELD contacts.* ON TABLE template_companies TYPE object;",
+            "DEFINE FIELD contacts.*.home ON TABLE template_companies TYPE object;",
+            "DEFINE FIELD contacts.*.home.city ON TABLE template_companies TYPE string;",
+            "DEFINE FIELD contacts.*.home.zip ON TABLE template_companies TYPE string;",
+            "DEFINE FIELD contacts.*.work ON TABLE template_companies TYPE object;",
+            "DEFINE FIELD contacts.*.work.city ON TABLE template_companies TYPE string;",
+            "DEFINE FIELD contacts.*.work.zip ON TABLE template_companies TYPE string;",
+        ])
+        assert other.SDL().split("\n")[-1] == "DEFINE FIELD work.zip ON TABLE template_contacts TYPE string;"
+        # the address sub fields are rendered once, in its template
+        assert len([e for e in rendered if e.endswith(".city")]) == 1
+        assert OBJECT_TEMPLATES[address][0] == "DEFINE FIELD __surql_template_path__.city ON TABLE __surql_template_table__ TYPE string;"
@@ -0,0 +1,95 @@
+import pytest
+from typing import Optional
+from pydantic import BaseModel, Field
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.types import (
+    SurQLTableConfig,
+    SurQLVector,
+    SurQLVectorIndex,
+    SurQLVectorAlgorithm,
+    SurQLVectorDistance,
+    SurQLVectorType,
+    encode_vectors
+)
+
+Parser = SurQLParser()
+
+class Document(BaseModel):
+    embedding: SurQLVector(4)
+    title_embedding: Optional[list[float]] = Field(default=None, min_length=3, max_length=3)
+    scores: list[float] = Field(min_length=1, max_length=3)
+
+class TestVectors:
+    def test_vector_fields(self):
+        """
+            test fixed length list[float] fields SDL generation
+        """
+        index = SurQLVectorIndex(name="embedding_idx", fields=["embedding"], dimension=4)
+        table = Parser.from_model("documents", Document, SurQLTableConfig(indexes=[index]))
+        assert table.SDL() == "\n".join([
+            "DEFINE TABLE documents SCHEMAFULL;",
+            "DEFINE FIELD embedding ON TABLE documents TYPE array<float, 4>;",
+            "DEFINE FIELD title_embedding ON TABLE documents TYPE option<array<float, 3>>;",
+            "DEFINE FIELD scores ON TABLE documents TYPE array<number, 3> ASSERT array::len($value) >= 1;",
+            "DEFINE FIELD scores.* ON TABLE documents TYPE number;",
+            "DEFINE INDEX embedding_idx ON TABLE documents FIELDS embedding HNSW DIMENSION 4 DIST EUCLIDEAN;",
+        ])
+
+    def test_hnsw_index(self):
+        """
+            test HNSW index SDL generation
+        """
+        index = SurQLVectorIndex(name="idx", fields=["embedding"], dimension=4, distance=SurQLVectorDistance.COSINE, vectorType=SurQLVectorType.F32, efc=150, m=12)
+        assert index.SDL("documents") == "DEFINE INDEX idx ON TABLE documents FIELDS embedding HNSW DIMENSION 4 DIST COSINE TYPE F32 EFC 150 M 12;"
+
+    def test_mtree_index(self):
+        """
+            test MTREE index SDL generation
+        """
+        index = SurQLVectorIndex(name="idx", fields=["embedding"], dimension=4, algorithm=SurQLVectorAlgorithm.MTREE, capacity=40)
+        assert index.SDL("documents") == "DEFINE INDEX idx ON TABLE documents FIELDS embedding MTREE DIMENSION 4 DIST EUCLIDEAN CAPACITY 40;"
+
+    def test_invalid_index(self):
+        """
+            test vector index parameters validation
+        """
+        for kwargs in [
+            dict(fields=["a", "b"], dimension=4),
+            dict(fields=["a"], dimension=4, algorithm=SurQLVectorAlgorithm.MTREE, m=12),
+            dict(fields=["a"], dimension=4, capacity=40),
+            dict(fields=["a"], dimension=0),
+        ]:
+            try:
+                SurQLVectorIndex(name="idx", **kwargs)
+                assert False, "should raise an exception"
+            except AssertionError as e:
+                raise e
+            except Exception:
+                pass
+
+    def test_index_dimension(self):
+        """
+            test the vector index dimension is checked against its field
+        """
+        for index in [
+            SurQLVectorIndex(name="idx", fields=["embedding"], dimension=8),
+            SurQLVectorIndex(name="idx", fields=["scores"], dimension=3),
+        ]:
+            try:
+                Parser.from_model("bad_documents", Document, SurQLTableConfig(indexes=[index]))
+                assert False, "should raise an exception"
+            except AssertionError as e:
+                raise e
+            except Exception as e:
+                assert "vector index idx" in str(e)
+        index = SurQLVectorIndex(name="idx", fields=["title_embedding"], dimension=3)
+        Parser.from_model("optional_documents", Document, SurQLTableConfig(indexes=[index]))
+
+    def test_numpy_vectors(self):
+        """
+            test numpy arrays validation and bulk encoding
+        """
+        numpy = pytest.importorskip("numpy")
+        batch = numpy.arange(8, dtype=numpy.float32).reshape(2, 4)
+        assert Document(embedding=batch[0], scores=[1]).embedding == [0.0, 1.0, 2.0, 3.0]
+        assert encode_vectors(batch) == [[0.0, 1.0, 2.0, 3.0], [4.0, 5.0, 6.0, 7.0]]
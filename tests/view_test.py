@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+from pydantic_surql.parser import SurQLParser
+from pydantic_surql.query import SurQLViewBuilder
+
+Parser = SurQLParser()
+
+class ViewCustomer(BaseModel):
+    name: str
+    country: Optional[str] = None
+
+class ViewOrder(BaseModel):
+    status: str
+    total: float
+    created_at: datetime
+    customer: ViewCustomer
+
+Parser.from_model("view_orders", ViewOrder)
+
+class TestViews:
+    def test_view_sdl(self):
+        """
+            test typed view SDL generation
+        """
+        view = (
+            SurQLViewBuilder(ViewOrder)
+                .group("customer.country")
+                .bucket("created_at", "1d", "day")
+                .count("orders")
+                .sum("total", "revenue")
+                .mean("total", "average")
+                .where("status", "=", "paid")
+                .where("total", ">", 0)
+        )
+        assert view.build().SDL() == " ".join([
+            "AS SELECT customer.country AS customer_country,time::floor(created_at, 1d) AS day,count() AS orders,"
+            "math::sum(total) AS revenue,math::mean(total) AS average",
+            'FROM view_orders WHERE status = "paid" AND total > 0 GROUP BY customer_country,day',
+        ])
+        table = Parser.from_model("view_order_stats", view.model("ViewOrderStats"))
+        assert table.name == "view_order_stats"
+
+    def test_read_model(self):
+        """
+            test the generated read model of a view
+        """
+        model = SurQLViewBuilder(ViewOrder).group("status").bucket("created_at", "1h", "hour").count().model("ViewStats")
+        row = model(id="view_stats:1", status="paid", hour=datetime(2026, 1, 1), count=3)
+        assert row.count == 3 and row.status == "paid"
+        assert set(model.model_fields) == {"id", "status", "hour", "count"}
+
+    def test_invalid_views(self):
+        """
+            test the fields references validation
+        """
+        for build in [
+            lambda view: view.group("unknown"),
+            lambda view: view.sum("status", "s"),
+            lambda view: view.bucket("total", "1d", "day"),
+            lambda view: view.bucket("created_at", "one day", "day"),
+            lambda view: view.where("total", "LIKE", 1),
+            lambda view: view.count().count(),
+        ]:
+            try:
+                build(SurQLViewBuilder(ViewOrder))
+                assert False, "should raise an exception"
+            except AssertionError as e:
+                raise e
+            except Exception:
+                pass
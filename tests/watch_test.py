@@ -0,0 +1,88 @@
+import os
+import sys
+from pydantic_surql import Metadata, Parser
+from pydantic_surql.watch import SurQLWatcher
+
+GEO = '''
+from pydantic import BaseModel
+
+class WatchGeo(BaseModel):
+    lat: float
+'''
+
+PLACES = '''
+from pydantic import BaseModel
+from pydantic_surql import surql_collection
+from watch_geo import WatchGeo
+
+class WatchAddress(BaseModel):
+    city: str
+    geo: WatchGeo
+
+@surql_collection("watch_places")
+class WatchPlace(BaseModel):
+    name: str
+    address: WatchAddress
+'''
+
+REVIEWS = '''
+from pydantic import BaseModel
+from pydantic_surql import surql_collection
+from watch_places import WatchPlace
+
+@surql_collection("watch_reviews")
+class WatchReview(BaseModel):
+    place: WatchPlace
+'''
+
+OTHERS = '''
+from pydantic import BaseModel
+from pydantic_surql import surql_collection
+
+@surql_collection("watch_others")
+class WatchOther(BaseModel):
+    name: str
+'''
+
+def touch(path, content):
+    """
+        rewrite a file with a new modification time
+    """
+    path.write_text(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 10))
+
+class TestWatch:
+    def test_watch(self, tmp_path, monkeypatch):
+        """
+            test only the changed module and its dependents are reloaded, and only the changed statements are emitted
+        """
+        monkeypatch.syspath_prepend(str(tmp_path))
+        for name, content in [("watch_geo", GEO), ("watch_places", PLACES), ("watch_reviews", REVIEWS), ("watch_others", OTHERS)]:
+            (tmp_path / f"{name}.py").write_text(content)
+        try:
+            watcher = SurQLWatcher(["watch_reviews", "watch_others"])
+            assert watcher.tables["watch_places"] == "watch_places"
+            assert set(watcher.classes) >= {"watch_geo", "watch_places", "watch_reviews", "watch_others"}
+            assert watcher.affected(["watch_geo"]) == ["watch_geo", "watch_places", "watch_reviews"]
+            assert watcher.poll() == []
+            review, other, address = [sys.modules[e] for e in ["watch_reviews", "watch_others", "watch_places"]]
+            review, other, address = review.WatchReview, other.WatchOther, address.WatchAddress
+            assert Parser.cache.has(address)
+
+            touch(tmp_path / "watch_geo.py", GEO + "    lng: float\n")
+            statements = watcher.poll()
+            places = [e for e in Metadata.tables if e.name == "watch_places"][0]
+            assert statements == [places.SDL()]
+            assert "DEFINE FIELD address.geo.lng ON TABLE watch_places TYPE number;" in places.SDL()
+            assert not Parser.cache.has(address)
+            assert sys.modules["watch_reviews"].WatchReview is not review
+            assert sys.modules["watch_others"].WatchOther is other
+            assert len([e for e in Metadata.tables if e.name.startswith("watch_")]) == 3
+
+            touch(tmp_path / "watch_others.py", "")
+            assert watcher.poll() == ["REMOVE TABLE watch_others;"]
+        finally:
+            Metadata.unregister(tables=["watch_places", "watch_reviews", "watch_others"])
+            for name in ["watch_geo", "watch_places", "watch_reviews", "watch_others"]:
+                sys.modules.pop(name, None)